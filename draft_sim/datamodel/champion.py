@@ -1,9 +1,15 @@
 
 # this is just a container for data, allows for ease of access and manipulation for use in integration with ui
 class Champion:
+    __slots__ = (
+        "name", "image_path", "champion_id", "champ_class", "attack_score", "magic_score",
+        "durability_score", "total_games", "total_wins", "stats",
+    )
+
     def __init__(self, name, image_path = None):
         self.name = name
         self.image_path = image_path
+        self.champion_id = None #interned id, bit position in a ChampionSet
         #self.role = "" #role (e.g., "top", "mid", "adc", "support")
         self.champ_class = "" #class (e.g., "fighter", "mage", "assassin", "tank")
         #self.ad_percentage = 0.0
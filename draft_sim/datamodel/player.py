@@ -1,17 +1,27 @@
 #create player data model, holds info for champs played (this will contain a champion object)
 #acts as data that can be interfaced with, allowing for displaying player information
 from typing import Dict, List, Optional, TYPE_CHECKING
+import numpy as np
 from .champion import Champion
 if TYPE_CHECKING:
     from .team import Team
 
+#players share a PerformanceStore with the rest of their manager; a player made on its own gets a
+#small private store, so it never leaves records behind in shared state
 class Player:
-    def __init__(self, name: str):
+    __slots__ = (
+        "name", "team", "role", "champs_played", "store", "player_id",
+        "total_games", "total_wins", "total_kills", "total_deaths", "total_assists",
+    )
+
+    def __init__(self, name: str, store: Optional["PerformanceStore"] = None):
         self.name = name
         self.team: Team = None
         self.role = None
 
         self.champs_played: dict[str, ChampionPerformance] = {}
+        self.store = store if store is not None else PerformanceStore(capacity=8)
+        self.player_id = self.store.add_player(name)
      
         self.total_games: int = 0
         self.total_wins: int = 0
@@ -21,13 +31,7 @@ class Player:
     
     def add_champion_perfomance(self, champion: Champion, games: int, wins:int, kills:int=0, deaths:int=0, assists:int=0, creepscore:int=0):
         if champion.name in self.champs_played:
-            perf = self.champs_played[champion.name]
-            perf.games += games
-            perf.wins += wins
-            perf.kills += kills
-            perf.deaths += deaths
-            perf.assists += assists
-            perf.creepscore += creepscore
+            self.champs_played[champion.name].add(games, wins, kills, deaths, assists, creepscore)
         else:
             self.champs_played[champion.name] = ChampionPerformance(
                 champion=champion,
@@ -36,7 +40,9 @@ class Player:
                 kills=kills,
                 deaths=deaths,
                 assists=assists,
-                creepscore=creepscore
+                creepscore=creepscore,
+                store=self.store,
+                player_id=self.player_id,
             )
         self.total_games += games
         self.total_wins += wins
@@ -124,16 +130,121 @@ class Player:
         }
     
 
-#stores data for player performance on specific champions         
+#struct-of-arrays storage for every ChampionPerformance of a manager
+#
+#values is (fields, records): one contiguous int32 row per stat, so whole-column queries are plain
+#numpy slices. each record also keeps its player id and champion id (ChampionTable id, -1 when the
+#champion was never interned). this is a sparse record list rather than arrays indexed by
+#player id x champion id: most players only ever touch a handful of champions, so a dense array would
+#be almost all zeros. matrix() builds the dense players x champions array of one stat on demand
+class PerformanceStore:
+    FIELDS = ("games", "wins", "kills", "deaths", "assists", "creepscore")
+
+    def __init__(self, capacity: int = 1024):
+        self.size = 0
+        # int32 holds a career's worth of creep score on one champion with plenty of room
+        self.values = np.zeros((len(self.FIELDS), max(1, capacity)), dtype=np.int32)
+        self.player_ids = np.zeros(self.values.shape[1], dtype=np.int32)
+        self.champion_ids = np.zeros(self.values.shape[1], dtype=np.int32)
+        self.player_names: List[str] = []
+
+    def add_player(self, name: str) -> int:
+        self.player_names.append(name)
+        return len(self.player_names) - 1
+
+    #index of a new record; the arrays double when full, so never hold on to them across appends
+    def append(self, player_id: int, champion_id: Optional[int], values) -> int:
+        row = self.size
+        if row == self.values.shape[1]:
+            capacity = row * 2
+            self.values = np.concatenate([self.values, np.zeros_like(self.values)], axis=1)
+            self.player_ids = np.resize(self.player_ids, capacity)
+            self.champion_ids = np.resize(self.champion_ids, capacity)
+        self.values[:, row] = values
+        self.player_ids[row] = player_id
+        self.champion_ids[row] = -1 if champion_id is None else champion_id
+        self.size = row + 1
+        return row
+
+    #appends many records at once; values is (fields, n). returns the index of the first new record
+    def extend(self, player_ids: np.ndarray, champion_ids: np.ndarray, values: np.ndarray) -> int:
+        start, n = self.size, values.shape[1]
+        capacity = self.values.shape[1]
+        if start + n > capacity:
+            # sized to fit exactly, bulk loads don't need the headroom append keeps
+            capacity = start + n
+            grown = np.zeros((len(self.FIELDS), capacity), dtype=self.values.dtype)
+            grown[:, :start] = self.values[:, :start]
+            self.values = grown
+            self.player_ids = np.resize(self.player_ids, capacity)
+            self.champion_ids = np.resize(self.champion_ids, capacity)
+        self.values[:, start:start + n] = values
+        self.player_ids[start:start + n] = player_ids
+        self.champion_ids[start:start + n] = champion_ids
+        self.size = start + n
+        return start
+
+    #one stat for every record, in record order (a view, valid until the next append)
+    def column(self, field: str) -> np.ndarray:
+        return self.values[self.FIELDS.index(field), :self.size]
+
+    #dense (players, champions) array of one stat; records without a player or an interned champion
+    #are left out
+    def matrix(self, field: str, n_champions: Optional[int] = None) -> np.ndarray:
+        known = (self.champion_ids[:self.size] >= 0) & (self.player_ids[:self.size] >= 0)
+        champions = self.champion_ids[:self.size][known]
+        if n_champions is None:
+            n_champions = int(champions.max()) + 1 if len(champions) else 0
+        out = np.zeros((len(self.player_names), n_champions), dtype=np.int64)
+        np.add.at(out, (self.player_ids[:self.size][known], champions), self.column(field)[known])
+        return out
+
+
+#read/write attribute for one PerformanceStore field of a ChampionPerformance
+def _stat(field: int) -> property:
+    def get(self) -> int:
+        return int(self.store.values[field, self.row])
+
+    def set(self, value: int) -> None:
+        self.store.values[field, self.row] = value
+
+    return property(get, set)
+
+
+#stores data for player performance on specific champions
+#a thin view of one PerformanceStore record; the stat attributes read and write the store's arrays
 class ChampionPerformance:
-    def __init__(self, champion: Champion, games: int, wins:int, kills:int=0, deaths:int=0, assists:int=0, creepscore:int=0):
+    __slots__ = ("champion", "store", "row")
+
+    def __init__(self, champion: Champion, games: int, wins:int, kills:int=0, deaths:int=0, assists:int=0, creepscore:int=0,
+                 store: Optional[PerformanceStore] = None, player_id: int = -1):
         self.champion: Champion = champion
-        self.games: int = games
-        self.wins: int = wins
-        self.kills: int = kills
-        self.deaths: int = deaths
-        self.assists: int = assists
-        self.creepscore: int = creepscore
+        self.store = store if store is not None else PerformanceStore(capacity=1)
+        self.row = self.store.append(player_id, champion.champion_id,
+                                     (games, wins, kills, deaths, assists, creepscore))
+
+    #view of a record that is already in the store
+    @classmethod
+    def view(cls, champion: Champion, store: PerformanceStore, row: int) -> "ChampionPerformance":
+        perf = cls.__new__(cls)
+        perf.champion = champion
+        perf.store = store
+        perf.row = row
+        return perf
+
+    def add(self, games: int, wins: int, kills: int = 0, deaths: int = 0, assists: int = 0, creepscore: int = 0) -> None:
+        self.store.values[:, self.row] += (games, wins, kills, deaths, assists, creepscore)
+
+    #(games, wins, kills, deaths, assists, creepscore) in one read
+    def totals(self) -> List[int]:
+        return self.store.values[:, self.row].tolist()
+
+    games = _stat(0)
+    wins = _stat(1)
+    kills = _stat(2)
+    deaths = _stat(3)
+    assists = _stat(4)
+    creepscore = _stat(5)
     
     @property
     def winrate(self) -> float:
@@ -182,4 +293,39 @@ class ChampionPerformance:
             'average_kills': self.average_kills,
             'average_deaths': self.average_deaths,
             'average_assists': self.average_assists
-        }
\ No newline at end of file
+        }
+
+
+#bulk counterpart of Player.add_champion_perfomance for loaders: record i adds values[:, i] (fields in
+#PerformanceStore.FIELDS order) on champions[champion_idx[i]] to players[player_idx[i]], each (player,
+#champion) at most once per call. records for a champion the player already has are added to it, the rest
+#are written to the store in one go
+def add_records(players: List[Player], champions: List[Champion], player_idx: np.ndarray,
+                champion_idx: np.ndarray, values: np.ndarray, store: PerformanceStore) -> None:
+    values = np.asarray(values, dtype=np.int64)
+    fresh = np.ones(len(player_idx), dtype=bool)
+    for i, (p, c) in enumerate(zip(player_idx.tolist(), champion_idx.tolist())):
+        perf = players[p].champs_played.get(champions[c].name)
+        if perf is not None:
+            perf.add(*values[:, i].tolist())
+            fresh[i] = False
+
+    new = np.nonzero(fresh)[0]
+    champion_ids = np.array([-1 if champions[c].champion_id is None else champions[c].champion_id
+                             for c in champion_idx[new].tolist()], dtype=np.int64)
+    player_ids = np.array([players[p].player_id for p in player_idx[new].tolist()], dtype=np.int64)
+    start = store.extend(player_ids, champion_ids, values[:, new])
+    for row, (p, c) in enumerate(zip(player_idx[new].tolist(), champion_idx[new].tolist()), start=start):
+        champion = champions[c]
+        players[p].champs_played[champion.name] = ChampionPerformance.view(champion, store, row)
+
+    # games, wins, kills, deaths, assists summed per player
+    sums = [np.bincount(player_idx, weights=values[f], minlength=len(players)).astype(np.int64).tolist()
+            for f in range(5)]
+    for p in np.unique(player_idx).tolist():
+        player = players[p]
+        player.total_games += sums[0][p]
+        player.total_wins += sums[1][p]
+        player.total_kills += sums[2][p]
+        player.total_deaths += sums[3][p]
+        player.total_assists += sums[4][p]
@@ -5,6 +5,12 @@ if TYPE_CHECKING:
 
 #serves as a container for team data, allows for ease of access and manipulation for use in integration with ui
 class Team:
+    __slots__ = (
+        "name", "logo_path", "players", "total_entries", "total_win_entries",
+        "total_bside_entries", "total_rside_entries", "total_bside_win_entries", "total_rside_win_entries",
+        "first_bloods", "total_kills", "total_deaths", "total_assists", "champion_stats",
+    )
+
     def __init__(self, name):
         self.name = name
         self.logo_path = None
@@ -53,8 +59,19 @@ class Team:
     def total_wins(self) -> int:
         return int(self.total_win_entries/5)
         
+    #adds the player to the roster and their champion records to champion_stats
     def add_player(self, player):
         self.players.append(player)
+        self.merge_player(player)
+
+    #adds one player's champion records to champion_stats without touching the roster
+    def merge_player(self, player) -> None:
+        # p.champs_played: dict[str, ChampionPerformance]
+        for champ_name, pperf in player.champs_played.items():
+            perf = self.champion_stats.get(champ_name)
+            if perf is None:
+                perf = self.champion_stats[champ_name] = TeamChampionPerformance(champ_name)
+            perf.merge(pperf)
 
     def to_dict(self): #dictionary converter for the data
         return {
@@ -83,30 +100,14 @@ class Team:
         if champion_name not in self.champion_stats:
             self.champion_stats[champion_name] = TeamChampionPerformance(champion_name)
 
-        perf = self.champion_stats[champion_name]
-        perf.games += int(games)
-        perf.wins += int(wins)
-        perf.kills += int(kills)
-        perf.deaths += int(deaths)
-        perf.assists += int(assists)
-        perf.creepscore += int(creepscore)
+        self.champion_stats[champion_name].add(games, wins, kills, deaths, assists, creepscore)
 
     #rebuild team stats from players on team
     def recompute_from_players(self) -> None:
         self.champion_stats.clear()
 
         for p in self.players:
-            # p.champs_played: dict[str, ChampionPerformance]
-            for champ_name, pperf in p.champs_played.items():
-                self.add_champion_performance(
-                    champion_name=champ_name,
-                    games=pperf.games,
-                    wins=pperf.wins,
-                    kills=pperf.kills,
-                    deaths=pperf.deaths,
-                    assists=pperf.assists,
-                    creepscore=pperf.creepscore,
-                )
+            self.merge_player(p)
     
     def get_team_winrate_on_champion(self, champion_name: str) -> float:
         perf = self.champion_stats.get(champion_name)
@@ -143,6 +144,8 @@ class Team:
 
 # Aggregated performance for a team on a specific champion
 class TeamChampionPerformance:
+    __slots__ = ("champion_name", "games", "wins", "kills", "deaths", "assists", "creepscore")
+
     def __init__(self, champion_name: str):
         self.champion_name: str = champion_name
         self.games: int = 0
@@ -152,6 +155,23 @@ class TeamChampionPerformance:
         self.assists: int = 0
         self.creepscore: int = 0
 
+    def add(self, games: int, wins: int, kills: int = 0, deaths: int = 0,
+            assists: int = 0, creepscore: int = 0) -> None:
+        self.games += int(games)
+        self.wins += int(wins)
+        self.kills += int(kills)
+        self.deaths += int(deaths)
+        self.assists += int(assists)
+        self.creepscore += int(creepscore)
+
+    #(games, wins, kills, deaths, assists, creepscore), same order as ChampionPerformance.totals
+    def totals(self) -> List[int]:
+        return [self.games, self.wins, self.kills, self.deaths, self.assists, self.creepscore]
+
+    #adds another record on the same champion (a player's ChampionPerformance or a team's)
+    def merge(self, other) -> None:
+        self.add(*other.totals())
+
     @property
     def winrate(self) -> float:
         if self.games == 0:
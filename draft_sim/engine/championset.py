@@ -0,0 +1,119 @@
+import json
+import re
+from typing import Dict, Iterable, Iterator, List, Optional
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]")
+
+
+#lookup key shared by riot ids, display names and image names ("Dr. Mundo", "DrMundo" -> "drmundo")
+def normalize_name(name: str) -> str:
+    return _NON_ALNUM.sub("", name.lower())
+
+
+#interned champion ids: every champion gets a small dense int usable as a bit position
+class ChampionTable:
+    def __init__(self):
+        self.names: List[str] = []
+        self.ids: Dict[str, int] = {}
+
+    #ids follow the order of the "data" keys in a ddragon champion.json
+    @classmethod
+    def from_json(cls, json_path: str) -> "ChampionTable":
+        table = cls()
+        try:
+            with open(json_path, mode='r', encoding='utf-8') as file:
+                data = json.load(file).get("data", {})
+        except (OSError, ValueError) as e:
+            print(f"Error loading champion table from {json_path}: {e}")
+            return table
+
+        for riot_id, info in data.items():
+            champ_id = table.intern(info.get("name", riot_id))
+            table.ids.setdefault(normalize_name(riot_id), champ_id)
+        return table
+
+    #returns the id for a name, adding champions that are not in the table yet
+    def intern(self, name: str) -> int:
+        key = normalize_name(name)
+        champ_id = self.ids.get(key)
+        if champ_id is None:
+            champ_id = len(self.names)
+            self.ids[key] = champ_id
+            self.names.append(name)
+        return champ_id
+
+    def id_of(self, name: str) -> Optional[int]:
+        return self.ids.get(normalize_name(name))
+
+    def name_of(self, champ_id: int) -> str:
+        return self.names[champ_id]
+
+    def to_set(self, names: Iterable[str]) -> "ChampionSet":
+        bits = 0
+        ids = self.ids
+        for name in names:
+            champ_id = ids.get(normalize_name(name))
+            if champ_id is not None:
+                bits |= 1 << champ_id
+        return ChampionSet(bits)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+
+#immutable set of champion ids stored as the bits of a python int
+class ChampionSet:
+    __slots__ = ("bits",)
+
+    def __init__(self, bits: int = 0):
+        self.bits = bits
+
+    @classmethod
+    def from_ids(cls, ids: Iterable[int]) -> "ChampionSet":
+        bits = 0
+        for champ_id in ids:
+            bits |= 1 << champ_id
+        return cls(bits)
+
+    def __contains__(self, champ_id) -> bool:
+        return champ_id is not None and bool(self.bits >> champ_id & 1)
+
+    def __iter__(self) -> Iterator[int]:
+        bits = self.bits
+        while bits:
+            low = bits & -bits
+            yield low.bit_length() - 1
+            bits ^= low
+
+    def __len__(self) -> int:
+        return self.bits.bit_count()
+
+    def __bool__(self) -> bool:
+        return self.bits != 0
+
+    def __or__(self, other: "ChampionSet") -> "ChampionSet":
+        return ChampionSet(self.bits | other.bits)
+
+    def __and__(self, other: "ChampionSet") -> "ChampionSet":
+        return ChampionSet(self.bits & other.bits)
+
+    def __sub__(self, other: "ChampionSet") -> "ChampionSet":
+        return ChampionSet(self.bits & ~other.bits)
+
+    def __xor__(self, other: "ChampionSet") -> "ChampionSet":
+        return ChampionSet(self.bits ^ other.bits)
+
+    def __eq__(self, other) -> bool:
+        return isinstance(other, ChampionSet) and self.bits == other.bits
+
+    def __hash__(self) -> int:
+        return hash(self.bits)
+
+    def __repr__(self) -> str:
+        return f"ChampionSet({list(self)})"
+
+    def with_id(self, champ_id: int) -> "ChampionSet":
+        return ChampionSet(self.bits | 1 << champ_id)
+
+    def without_id(self, champ_id: int) -> "ChampionSet":
+        return ChampionSet(self.bits & ~(1 << champ_id))
@@ -0,0 +1,224 @@
+from typing import Dict, Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from .championset import ChampionSet, ChampionTable
+
+BLUE = 0
+RED = 1
+BAN = 0
+PICK = 1
+
+DRAFT_COMPLETE = "draft_complete"
+
+# pro draft order, one entry per turn
+TURN_SEQUENCE = (
+    "blue_ban", "red_ban", "blue_ban", "red_ban", "blue_ban",
+    "red_ban", "blue_pick", "red_pick", "red_pick", "blue_pick",
+    "blue_pick", "red_pick", "red_ban", "blue_ban",
+    "red_ban", "blue_ban", "red_pick", "blue_pick",
+    "blue_pick", "red_pick",
+)
+TOTAL_TURNS = len(TURN_SEQUENCE)
+
+#precompiled phase table: (side, action, list index) per turn, list index = 2*side + action
+PHASES: Tuple[Tuple[int, int, int], ...] = tuple(
+    (RED if turn.startswith("red") else BLUE,
+     PICK if turn.endswith("pick") else BAN,
+     2 * (RED if turn.startswith("red") else BLUE) + (PICK if turn.endswith("pick") else BAN))
+    for turn in TURN_SEQUENCE
+)
+
+
+#immutable copy of a draft, cheap to store in search trees and hash tables
+class DraftSnapshot(NamedTuple):
+    turn: int
+    available: int
+    blue_bans: Tuple[int, ...]
+    blue_picks: Tuple[int, ...]
+    red_bans: Tuple[int, ...]
+    red_picks: Tuple[int, ...]
+
+
+#mutable draft state; lists are indexed by 2*side + action (blue bans, blue picks, red bans, red picks)
+class DraftState:
+    __slots__ = ("turn", "available", "lists", "history")
+
+    def __init__(self, available: int = 0):
+        self.turn = 0
+        self.available = available
+        self.lists: Tuple[List[int], List[int], List[int], List[int]] = ([], [], [], [])
+        self.history: List[int] = []
+
+    def snapshot(self) -> DraftSnapshot:
+        blue_bans, blue_picks, red_bans, red_picks = self.lists
+        return DraftSnapshot(self.turn, self.available,
+                             tuple(blue_bans), tuple(blue_picks), tuple(red_bans), tuple(red_picks))
+
+    @classmethod
+    def from_snapshot(cls, snap: DraftSnapshot) -> "DraftState":
+        state = cls(snap.available)
+        state.turn = snap.turn
+        state.lists = (list(snap.blue_bans), list(snap.blue_picks), list(snap.red_bans), list(snap.red_picks))
+        # history is rebuilt in turn order so undo keeps working after a restore
+        cursors = [0, 0, 0, 0]
+        for turn in range(snap.turn):
+            slot = PHASES[turn][2]
+            state.history.append(state.lists[slot][cursors[slot]])
+            cursors[slot] += 1
+        return state
+
+    def copy(self) -> "DraftState":
+        state = DraftState(self.available)
+        state.turn = self.turn
+        state.lists = tuple(list(lst) for lst in self.lists)
+        state.history = list(self.history)
+        return state
+
+
+#headless draft: champion ids, availability bitmask and turn order, no Qt involved
+class DraftEngine:
+    def __init__(self, champion_names: Iterable[str] = (), table: Optional[ChampionTable] = None):
+        # ids come from the shared table so bitsets line up with the rest of the app
+        self.table = table if table is not None else ChampionTable()
+        self.names: Dict[int, str] = {}
+        self.full_mask = 0
+        self.state = DraftState()
+        self.set_champions(champion_names)
+
+    #replaces the champion pool and resets the draft; names are kept as given for display
+    def set_champions(self, champion_names: Iterable[str]) -> None:
+        self.names = {}
+        self.full_mask = 0
+        for name in champion_names:
+            champ_id = self.table.intern(name)
+            if champ_id in self.names:
+                continue
+            self.names[champ_id] = name
+            self.full_mask |= 1 << champ_id
+        self.reset()
+
+    def reset(self) -> None:
+        self.state = DraftState(self.full_mask)
+
+    #independent engine over the same champion pool, for searches that apply/undo freely
+    def copy(self) -> "DraftEngine":
+        engine = DraftEngine.__new__(DraftEngine)
+        engine.table = self.table
+        engine.names = self.names
+        engine.full_mask = self.full_mask
+        engine.state = self.state.copy()
+        return engine
+
+    def id_of(self, champion_name: str) -> Optional[int]:
+        return self.table.id_of(champion_name)
+
+    def name_of(self, champ_id: int) -> str:
+        return self.names[champ_id]
+
+    # -----------------------------
+    # turn info
+    @property
+    def turn_counter(self) -> int:
+        return self.state.turn
+
+    @property
+    def is_complete(self) -> bool:
+        return self.state.turn >= TOTAL_TURNS
+
+    @property
+    def current_turn(self) -> str:
+        turn = self.state.turn
+        return TURN_SEQUENCE[turn] if turn < TOTAL_TURNS else DRAFT_COMPLETE
+
+    @property
+    def next_turn(self) -> str:
+        turn = self.state.turn + 1
+        return TURN_SEQUENCE[turn] if turn < TOTAL_TURNS else DRAFT_COMPLETE
+
+    #(side, action) for the side to move, None once the draft is complete
+    def phase(self) -> Optional[Tuple[int, int]]:
+        turn = self.state.turn
+        if turn >= TOTAL_TURNS:
+            return None
+        side, action, _ = PHASES[turn]
+        return side, action
+
+    # -----------------------------
+    # availability
+    def is_available(self, champ_id: int) -> bool:
+        return bool(self.state.available >> champ_id & 1)
+
+    def is_available_name(self, champion_name: str) -> bool:
+        champ_id = self.table.id_of(champion_name)
+        return champ_id is not None and bool(self.state.available >> champ_id & 1)
+
+    def available_ids(self) -> Iterator[int]:
+        mask = self.state.available
+        while mask:
+            low = mask & -mask
+            yield low.bit_length() - 1
+            mask ^= low
+
+    def available_count(self) -> int:
+        return self.state.available.bit_count()
+
+    def available_set(self) -> ChampionSet:
+        return ChampionSet(self.state.available)
+
+    #every banned or picked champion
+    def taken_set(self) -> ChampionSet:
+        return ChampionSet(self.full_mask & ~self.state.available)
+
+    # -----------------------------
+    # draft lists, as ids or display names
+    def bans(self, side: int) -> List[int]:
+        return self.state.lists[2 * side + BAN]
+
+    def picks(self, side: int) -> List[int]:
+        return self.state.lists[2 * side + PICK]
+
+    def names_for(self, ids: Iterable[int]) -> List[str]:
+        names = self.names
+        return [names[i] for i in ids]
+
+    def draft_lists(self) -> Tuple[List[str], List[str], List[str], List[str]]:
+        # (blue_bans, red_bans, blue_picks, red_picks), the order MainWindow and the encoder use
+        blue_bans, blue_picks, red_bans, red_picks = self.state.lists
+        names_for = self.names_for
+        return names_for(blue_bans), names_for(red_bans), names_for(blue_picks), names_for(red_picks)
+
+    # -----------------------------
+    # mutation
+    def apply(self, champ_id: int) -> None:
+        state = self.state
+        if state.turn >= TOTAL_TURNS:
+            raise ValueError("Draft is already complete")
+        bit = 1 << champ_id
+        if not state.available & bit:
+            raise ValueError(f"Champion id {champ_id} is not available")
+        state.available ^= bit
+        state.lists[PHASES[state.turn][2]].append(champ_id)
+        state.history.append(champ_id)
+        state.turn += 1
+
+    def apply_name(self, champion_name: str) -> int:
+        champ_id = self.table.id_of(champion_name)
+        if champ_id is None:
+            raise ValueError(f"Unknown champion '{champion_name}'")
+        self.apply(champ_id)
+        return champ_id
+
+    #reverts the last apply, returns the champion id or None at the start of the draft
+    def undo(self) -> Optional[int]:
+        state = self.state
+        if not state.history:
+            return None
+        state.turn -= 1
+        champ_id = state.history.pop()
+        state.lists[PHASES[state.turn][2]].pop()
+        state.available |= 1 << champ_id
+        return champ_id
+
+    def snapshot(self) -> DraftSnapshot:
+        return self.state.snapshot()
+
+    def restore(self, snap: DraftSnapshot) -> None:
+        self.state = DraftState.from_snapshot(snap)
@@ -1,37 +1,43 @@
 import csv
 import json
-from typing import Dict,List,Optional,Set
+from typing import Dict,Iterable,List,Optional,Set
 from ..datamodel.player import Player, ChampionPerformance
 from ..datamodel.champion import Champion
 from ..datamodel.team import Team
+from ..engine.championset import ChampionSet, ChampionTable
 
 #create the registry
 class ChampionManager:
-    def __init__(self):
+    def __init__(self, table: Optional[ChampionTable] = None):
         self.champions: Dict[str, Champion] = {}
+        self.table = table if table is not None else ChampionTable()
 
     def load_from_csv(self, csv_path: str):
         with open(csv_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            for row in reader:
-                try:
-                    champion_name = row['Champ'].strip()
-                    if champion_name not in self.champions:
-                        self.champions[champion_name] = Champion(name=champion_name)
-                        print(f"Loaded new champion: {champion_name}")
-                        
-                    if champion_name in self.champions:
-                        champion = self.champions[champion_name]
-                        champion.total_games += 1
-                        champion.total_wins += 1 if row['Won'].strip().lower() == 'true' else 0
-                        
+            self.add_rows(csv.DictReader(file))
 
-                except KeyError as e:
-                    print(f"Error: missing column - {e}")
-                except ValueError as e:
-                    print(f"Error: invalid data - {e}")
-                except Exception as e:
-                    print(f"Error processing row - {e}")
+    #aggregates already parsed player csv rows, lets MainManager share one parse between managers
+    def add_rows(self, rows: Iterable[Dict[str, str]]):
+        for row in rows:
+            try:
+                champion_name = row['Champ'].strip()
+                if champion_name not in self.champions:
+                    self.champions[champion_name] = Champion(name=champion_name)
+                    self.champions[champion_name].champion_id = self.table.intern(champion_name)
+                    print(f"Loaded new champion: {champion_name}")
+                    
+                if champion_name in self.champions:
+                    champion = self.champions[champion_name]
+                    champion.total_games += 1
+                    champion.total_wins += 1 if row['Won'].strip().lower() == 'true' else 0
+                    
+
+            except KeyError as e:
+                print(f"Error: missing column - {e}")
+            except ValueError as e:
+                print(f"Error: invalid data - {e}")
+            except Exception as e:
+                print(f"Error processing row - {e}")
 
     def get_registry(self) -> Dict[str, Champion]:
         return self.champions
@@ -47,18 +53,26 @@ class ChampionManager:
         else:
             print(f"Champion '{champion_name}' not found.")
 
-    #return the top most picked champions, default to 1
-    def get_most_picked_champ(self, limit: int = 1) -> List[tuple]:
+    #every loaded champion as a bitset
+    def champion_set(self) -> ChampionSet:
+        return ChampionSet.from_ids(champ.champion_id for champ in self.champions.values())
+
+    #return the top most picked champions, default to 1; exclude skips e.g. banned/picked champions
+    def get_most_picked_champ(self, limit: int = 1, exclude: Optional[ChampionSet] = None) -> List[tuple]:
         champions = []
         for champ in self.champions.values():
+            if exclude and champ.champion_id in exclude:
+                continue
             champions.append((champ.name, champ.total_games))
         
         champions.sort(key=lambda x: x[1], reverse=True)
         return champions[:limit]
     
-    def get_highest_winrate_champ(self, limit: int = 1) -> List[tuple]:
+    def get_highest_winrate_champ(self, limit: int = 1, exclude: Optional[ChampionSet] = None) -> List[tuple]:
         champions = []
         for champ in self.champions.values():
+            if exclude and champ.champion_id in exclude:
+                continue
             champions.append((champ.name, champ.overall_winrate))
         
         champions.sort(key=lambda x: x[1], reverse=True)
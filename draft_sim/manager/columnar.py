@@ -0,0 +1,243 @@
+import csv
+import os
+import time
+from typing import Callable, Dict, List, Optional, Tuple
+import numpy as np
+import pandas as pd
+from ..datamodel.champion import Champion
+from ..datamodel.player import Player, add_records
+from ..datamodel.team import Team
+from .championmanager import ChampionManager
+from .playermanager import PlayerManager, safe_int
+from .teammanager import TeamManager
+
+#columnar alternative to the managers' add_rows loops, same registries as a result
+#
+#every column of the player csv is read as a pandas categorical, so each distinct string is converted
+#once (strip, int, 'true' check) and rows only carry integer codes. groups are numbered by first
+#appearance, which keeps registry insertion order and champion interning order identical to the
+#row-by-row loaders; the sums are np.bincount calls over those group numbers.
+
+
+def _strict_int(val: str) -> int:
+    # TeamManager uses int() on the raw cell and lets bad data raise
+    return int(val)
+
+
+def _is_true(val: str) -> int:
+    return 1 if val.strip().lower() == 'true' else 0
+
+
+#(group number per row in first-appearance order, group keys) after applying fn to every distinct cell
+def _groups(column: pd.Series, fn: Callable[[str], str] = str.strip) -> Tuple[np.ndarray, List[str]]:
+    codes = column.cat.codes.to_numpy()
+    keys = [fn(c) for c in column.cat.categories]
+    # fn can merge categories (" Ashe" and "Ashe"), so number the distinct keys first
+    key_ids, unique_keys = pd.factorize(np.array(keys, dtype=object))
+    groups, first = pd.factorize(key_ids[codes])
+    return groups.astype(np.int64), [unique_keys[i] for i in first]
+
+
+#per-row integers from a per-distinct-cell converter
+def _numbers(column: pd.Series, fn: Callable[[str], int]) -> np.ndarray:
+    lookup = np.array([fn(c) for c in column.cat.categories], dtype=np.int64)
+    return lookup[column.cat.codes.to_numpy()]
+
+
+def _sums(groups: np.ndarray, n: int, values: Optional[np.ndarray] = None) -> np.ndarray:
+    return np.bincount(groups, weights=values, minlength=n).astype(np.int64)
+
+
+def read_columns(csv_path: str) -> pd.DataFrame:
+    return pd.read_csv(csv_path, dtype="category", keep_default_na=False, na_filter=False)
+
+
+def add_team_columns(team_manager: TeamManager, df: pd.DataFrame) -> None:
+    groups, names = _groups(df['Teams'], fn=str)
+    n = len(names)
+    win = _numbers(df['Won'], _is_true)
+    red = _numbers(df['Side'], lambda s: 1 if s == "red" else 0)
+    entries = _sums(groups, n)
+    wins = _sums(groups, n, win)
+    red_entries = _sums(groups, n, red)
+    red_wins = _sums(groups, n, win * red)
+    kills = _sums(groups, n, _numbers(df['Kills'], _strict_int))
+    deaths = _sums(groups, n, _numbers(df['Deaths'], _strict_int))
+    assists = _sums(groups, n, _numbers(df['Assists'], _strict_int))
+
+    teams = team_manager.teams
+    for i, name in enumerate(names):
+        team = teams.get(name)
+        if team is None:
+            team = teams[name] = Team(name=name)
+        team.total_entries += int(entries[i])
+        team.total_kills += int(kills[i])
+        team.total_deaths += int(deaths[i])
+        team.total_assists += int(assists[i])
+        team.total_win_entries += int(wins[i])
+        team.total_rside_entries += int(red_entries[i])
+        team.total_rside_win_entries += int(red_wins[i])
+        team.total_bside_entries += int(entries[i] - red_entries[i])
+        team.total_bside_win_entries += int(wins[i] - red_wins[i])
+
+
+def add_champion_columns(champion_manager: ChampionManager, df: pd.DataFrame) -> None:
+    groups, names = _groups(df['Champ'])
+    n = len(names)
+    games = _sums(groups, n)
+    wins = _sums(groups, n, _numbers(df['Won'], _is_true))
+
+    champions = champion_manager.champions
+    for i, name in enumerate(names):
+        champion = champions.get(name)
+        if champion is None:
+            champion = champions[name] = Champion(name=name)
+            champion.champion_id = champion_manager.table.intern(name)
+            print(f"Loaded new champion: {name}")
+        champion.total_games += int(games[i])
+        champion.total_wins += int(wins[i])
+
+
+#players, their per-champion records and the player -> team map; champions must already be registered
+def add_player_columns(player_manager: PlayerManager, df: pd.DataFrame,
+                       champion_registry: Dict[str, Champion]) -> None:
+    players_g, player_names = _groups(df['Player'])
+    champs_g, champ_names = _groups(df['Champ'])
+    teams_g, team_names = _groups(df['Teams'])
+
+    # rows whose champion isn't registered are skipped, as in PlayerManager.add_rows
+    known = np.array([name in champion_registry for name in champ_names], dtype=bool)
+    for name in champ_names:
+        if name not in champion_registry:
+            print(f"Champion not found: {name} in registry")
+    keep = known[champs_g]
+
+    win = _numbers(df['Won'], _is_true)
+    stats = [_numbers(df[col], safe_int) if col in df else np.zeros(len(df), dtype=np.int64)
+             for col in ("Kills", "Deaths", "Assists", "CreepScore")]
+
+    # player -> last non-empty team, keys in the order players first showed a team
+    has_team = np.array([bool(t) for t in team_names], dtype=bool)[teams_g]
+    rows = np.nonzero(has_team)[0]
+    row_players, row_teams = players_g[rows], teams_g[rows]
+    # both unique() calls return the same sorted player numbers
+    with_team, first = np.unique(row_players, return_index=True)
+    _, last_reversed = np.unique(row_players[::-1], return_index=True)
+    last = len(rows) - 1 - last_reversed
+    team_map = player_manager._player_team_map
+    for k in np.argsort(first, kind="stable"):
+        team_map[player_names[with_team[k]]] = team_names[row_teams[last[k]]]
+
+    # players are created even when all their rows are skipped
+    players = player_manager.players
+    for name in player_names:
+        if name not in players:
+            players[name] = Player(name, player_manager.performance)
+
+    n_champs = len(champ_names)
+    pair_g, pairs = pd.factorize(players_g[keep] * n_champs + champs_g[keep])
+    n = len(pairs)
+    games = _sums(pair_g, n)
+    wins = _sums(pair_g, n, win[keep])
+    kills, deaths, assists, creepscore = (_sums(pair_g, n, s[keep]) for s in stats)
+
+    player_list = [players[name] for name in player_names]
+    # unregistered champions have no kept rows, so their None entries are never looked at
+    champion_list = [champion_registry.get(name) for name in champ_names]
+    add_records(player_list, champion_list, pairs // n_champs, pairs % n_champs,
+                np.vstack([games, wins, kills, deaths, assists, creepscore]), player_manager.performance)
+    player_manager._match_counter += int(keep.sum())
+
+
+#columnar counterpart of MainManager.load_data for one player csv; returns (rows, [(phase, seconds)])
+def load_registries(csv_path: str, team_manager: TeamManager, champion_manager: ChampionManager,
+                    player_manager: PlayerManager, finish: bool = True) -> Tuple[int, List[Tuple[str, float]]]:
+    timings = []
+    start = time.perf_counter()
+
+    def phase(name):
+        nonlocal start
+        now = time.perf_counter()
+        timings.append((name, now - start))
+        start = now
+
+    df = read_columns(csv_path)
+    phase("read")
+    add_team_columns(team_manager, df)
+    phase("teams")
+    add_champion_columns(champion_manager, df)
+    phase("champions")
+    add_player_columns(player_manager, df, champion_manager.get_registry())
+    phase("players")
+    if finish:
+        player_manager.finish_loading(team_manager.get_registry())
+        phase("rosters")
+    return len(df), timings
+
+
+# -----------------------------
+# Benchmark against the row loaders
+# -----------------------------
+#the real file repeated scale times, players and teams renamed per copy so the registries grow too
+def write_scaled_csv(csv_path: str, out_path: str, scale: int) -> str:
+    with open(csv_path, mode='r', encoding='utf-8', newline='') as file:
+        reader = csv.reader(file)
+        header = next(reader)
+        rows = list(reader)
+    player_col, team_col = header.index("Player"), header.index("Teams")
+    with open(out_path, mode='w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(header)
+        for copy in range(scale):
+            for row in rows:
+                row = list(row)
+                row[player_col] = f"{row[player_col]}#{copy}"
+                row[team_col] = f"{row[team_col]}#{copy}"
+                writer.writerow(row)
+    return out_path
+
+
+#aggregation only (no roster pass, it is the same code for both engines); returns seconds per engine
+def benchmark(csv_path: str, scale: int = 1) -> Dict[str, float]:
+    import contextlib
+    import io
+    import tempfile
+
+    path = csv_path
+    tmp = None
+    if scale > 1:
+        fd, tmp = tempfile.mkstemp(suffix=".csv")
+        os.close(fd)
+        path = write_scaled_csv(csv_path, tmp, scale)
+    results = {}
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            teams, champions, players = TeamManager(), ChampionManager(), PlayerManager()
+            start = time.perf_counter()
+            teams.load_from_csv(path)
+            champions.load_from_csv(path)
+            with open(path, mode='r', encoding='utf-8') as file:
+                players.add_rows(csv.DictReader(file), champions.get_registry())
+            results["rows_s"] = time.perf_counter() - start
+
+            teams, champions, players = TeamManager(), ChampionManager(), PlayerManager()
+            _, timings = load_registries(path, teams, champions, players, finish=False)
+            results["columnar_s"] = sum(t for _, t in timings)
+            results.update({f"columnar_{name}_s": t for name, t in timings})
+        results["rows"] = sum(p.total_games for p in players.players.values())
+    finally:
+        if tmp:
+            os.remove(tmp)
+    return {k: round(v, 3) if isinstance(v, float) else v for k, v in results.items()}
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare the row-by-row loaders with the columnar engine")
+    parser.add_argument("csv", nargs="?", default="csvdata/lolplayerdata.csv")
+    parser.add_argument("--scale", type=int, nargs="+", default=[1, 100])
+    args = parser.parse_args()
+
+    for scale in args.scale:
+        print(f"x{scale}", benchmark(args.csv, scale))
@@ -1,5 +1,6 @@
 import csv
 import json
+import time
 from typing import Dict,List,Optional,Set
 from ..datamodel.player import Player, ChampionPerformance
 from ..datamodel.champion import Champion
@@ -7,17 +8,88 @@ from ..datamodel.team import Team
 from .playermanager import PlayerManager
 from .teammanager import TeamManager
 from .championmanager import ChampionManager
+from . import columnar
+from . import snapshot as snapshots
+from ..engine.championset import ChampionTable
 
 class MainManager:
-    def __init__(self):
+    def __init__(self, table: Optional[ChampionTable] = None):
         self.player_manager = PlayerManager()
         self.team_manager = TeamManager()
-        self.champion_manager = ChampionManager()
+        self.champion_manager = ChampionManager(table)
 
-    def load_data(self, player_csv: str, team_csv: str, champion_csv: str):
-        self.team_manager.load_from_csv(team_csv)
-        self.champion_manager.load_from_csv(champion_csv)
-        self.player_manager.load_from_csv(player_csv, self.champion_manager.get_registry(),self.team_manager.get_registry())
+    #the app passes the same player csv for all three; it is then parsed once and the rows are handed
+    #to each manager in turn instead of every manager reading the file itself.
+    #engine="columnar" aggregates with numpy instead (see columnar.py), engine="rows" uses the managers'
+    #add_rows loops; both build the same registries.
+    #with snapshot=True the aggregated registries are kept in a binary snapshot in the user's cache
+    #directory and read back on the next launch while the csv is unchanged (see snapshot.py)
+    def load_data(self, player_csv: str, team_csv: str, champion_csv: str, engine: str = "columnar",
+                  snapshot: bool = True):
+        if not (player_csv == team_csv == champion_csv):
+            self.team_manager.load_from_csv(team_csv)
+            self.champion_manager.load_from_csv(champion_csv)
+            self.player_manager.load_from_csv(player_csv, self.champion_manager.get_registry(),self.team_manager.get_registry())
+            return
+
+        start = time.perf_counter()
+        snapshot_path = None
+        restored = False
+        rows = 0
+        timings = []
+        if snapshot:
+            snapshot_path = snapshots.default_path(player_csv)
+            restored = snapshots.load_snapshot(snapshot_path, player_csv, self.team_manager,
+                                               self.champion_manager, self.player_manager)
+            if restored:
+                rows = self.player_manager._match_counter
+            timings.append(("snapshot", time.perf_counter() - start))
+
+        if not restored:
+            if engine == "columnar":
+                rows, parsed = columnar.load_registries(player_csv, self.team_manager, self.champion_manager,
+                                                        self.player_manager, finish=False)
+            else:
+                rows, parsed = self._load_rows(player_csv)
+            timings += parsed
+            if snapshot:
+                start = time.perf_counter()
+                try:
+                    snapshots.save_snapshot(snapshot_path, player_csv, self.team_manager, self.champion_manager,
+                                            self.player_manager)
+                except OSError as e:
+                    print(f"Error writing snapshot {snapshot_path}: {e}")
+                timings.append(("save", time.perf_counter() - start))
+
+        start = time.perf_counter()
+        self.player_manager.finish_loading(self.team_manager.get_registry())
+        timings.append(("rosters", time.perf_counter() - start))
+
+        total = sum(t for _, t in timings)
+        print(f"Loaded {rows} rows in {total * 1000:.0f} ms ("
+              + ", ".join(f"{name} {t * 1000:.0f} ms" for name, t in timings) + ")")
+
+    #aggregates the csv with the managers' add_rows loops, without finish_loading
+    def _load_rows(self, player_csv: str):
+        timings = []
+        start = time.perf_counter()
+
+        def phase(name):
+            nonlocal start
+            now = time.perf_counter()
+            timings.append((name, now - start))
+            start = now
+
+        with open(player_csv, mode='r', encoding='utf-8') as file:
+            rows = list(csv.DictReader(file))
+        phase("read")
+        self.team_manager.add_rows(rows)
+        phase("teams")
+        self.champion_manager.add_rows(rows)
+        phase("champions")
+        self.player_manager.add_rows(rows, self.champion_manager.get_registry())
+        phase("players")
+        return len(rows), timings
 
     def get_player_data(self, player_name: str) -> Optional[Player]:
         return self.player_manager.get_player(player_name)
@@ -1,7 +1,7 @@
 import csv
 import json
-from typing import Dict,List,Optional,Set
-from ..datamodel.player import Player, ChampionPerformance
+from typing import Dict,Iterable,List,Optional,Set
+from ..datamodel.player import Player, ChampionPerformance, PerformanceStore
 from ..datamodel.champion import Champion
 from ..datamodel.team import Team
 
@@ -11,111 +11,126 @@ from ..datamodel.team import Team
 #need to implement haroon's requirements for his scouting report, update values that need to be parsed and add them to either the player, team or champion data models
 
 
+def safe_int(val, default=0):
+    try:
+        return int(float(val)) if val else default
+    except:
+        return default
+
+def safe_float(val, default=0.0):
+    try:
+        return float(val) if val else default
+    except:
+        return default
+
+
 class PlayerManager:
     def __init__(self):
         self.players: Dict[str, Player] = {}
         self.players_by_team: Dict[str, List[Player]] = {}
         self.team_recent_rosters: Dict[str, List[str]] = {}
+        # champion records of every player, see PerformanceStore
+        self.performance = PerformanceStore()
+        # loading state between add_rows and finish_loading
+        self._player_team_map: Dict[str, str] = {}
+        self._match_counter = 0
     
     def load_from_csv(self,csv_path: str, champion_registry: Dict[str, Champion], team_registry: Dict[str, Team] = None):
         
         with open(csv_path, mode='r', encoding='utf-8') as file:
-            reader = csv.DictReader(file)
-            
-            player_team_map = {}
-            latest_match_date = {}
-            match_counter = 0
-            
-            for row in reader:
-                try:
-                    player_name = row['Player'].strip()
-                    champion_played = row['Champ'].strip()
-                    team_name = row['Teams'].strip()
-                    current_date = row['Date'].strip()
-                    
-                    won = row["Won"].strip()
-                    
-                    def safe_int(val, default=0):
-                        try:
-                            return int(float(val)) if val else default
-                        except:
-                            return default
-                    
-                    def safe_float(val, default=0.0):
-                        try:
-                            return float(val) if val else default
-                        except:
-                            return default
-                        
+            self.add_rows(csv.DictReader(file), champion_registry)
+            self.finish_loading(team_registry)
 
-                    creepscore = safe_int(row.get("CreepScore"))
-                    kills = safe_int(row.get("Kills"))
-                    deaths = safe_int(row.get("Deaths"))
-                    assists = safe_int(row.get("Assists"))
+    #aggregates already parsed player csv rows; call finish_loading once every row has been added
+    def add_rows(self, rows: Iterable[Dict[str, str]], champion_registry: Dict[str, Champion]):
+        for row in rows:
+            try:
+                player_name = row['Player'].strip()
+                champion_played = row['Champ'].strip()
+                team_name = row['Teams'].strip()
+                current_date = row['Date'].strip()
+                
+                won = row["Won"].strip()
+                
+                creepscore = safe_int(row.get("CreepScore"))
+                kills = safe_int(row.get("Kills"))
+                deaths = safe_int(row.get("Deaths"))
+                assists = safe_int(row.get("Assists"))
 
-                    if team_name:
-                        player_team_map[player_name] = team_name
-                    
-                    if player_name not in self.players:
-                        player = Player(player_name)
-                        self.players[player_name] = player
-                        
-                    player = self.players[player_name]
-                    
-                    champion = None
-                    if champion_played in champion_registry:
-                        champion = champion_registry[champion_played]
-                    else:
-                        print(f"Champion not found: {champion_played} in registry")
-                        continue
+                if team_name:
+                    self._player_team_map[player_name] = team_name
+                
+                if player_name not in self.players:
+                    player = Player(player_name, self.performance)
+                    self.players[player_name] = player
                     
-                    #add the data to the champion performance record of the player
-                    #more stats can be added if required, parse and then update accordingly here
-                    if champion_played not in player.champs_played:
-                        player.champs_played[champion_played] = ChampionPerformance(
-                            champion=champion,
-                            games=0,
-                            wins=0,
-                            kills=0,
-                            deaths=0,
-                            assists=0,
-                            creepscore=0
-                        )
-                       
-                    player.add_champion_perfomance(
+                player = self.players[player_name]
+                
+                champion = None
+                if champion_played in champion_registry:
+                    champion = champion_registry[champion_played]
+                else:
+                    print(f"Champion not found: {champion_played} in registry")
+                    continue
+                
+                #add the data to the champion performance record of the player
+                #more stats can be added if required, parse and then update accordingly here
+                if champion_played not in player.champs_played:
+                    player.champs_played[champion_played] = ChampionPerformance(
                         champion=champion,
-                        games=1,
-                        wins=1 if won.lower() == 'true' else 0,
-                        kills=kills,
-                        deaths=deaths,
-                        assists=assists,
-                        creepscore=creepscore
+                        games=0,
+                        wins=0,
+                        kills=0,
+                        deaths=0,
+                        assists=0,
+                        creepscore=0,
+                        store=player.store,
+                        player_id=player.player_id,
                     )
+                   
+                player.add_champion_perfomance(
+                    champion=champion,
+                    games=1,
+                    wins=1 if won.lower() == 'true' else 0,
+                    kills=kills,
+                    deaths=deaths,
+                    assists=assists,
+                    creepscore=creepscore
+                )
 
-                    match_counter += 1
-                    
-                    
-                except KeyError as e:
-                    print(f"Error: missing column - {e}")
-                except ValueError as e:
-                    print(f"Error: invalid data - {e}")
-                except Exception as e:
-                    print(f"Error processing row - {e}")
-                    import traceback
-                    traceback.print_exc()
+                self._match_counter += 1
+                
+                
+            except KeyError as e:
+                print(f"Error: missing column - {e}")
+            except ValueError as e:
+                print(f"Error: invalid data - {e}")
+            except Exception as e:
+                print(f"Error processing row - {e}")
+                import traceback
+                traceback.print_exc()
 
-            print("Attempted assignment of players to teams")
-            self._assign_players_to_teams(player_team_map, team_registry)
+    #links players to their (last seen) team and builds the lookup indexes
+    def finish_loading(self, team_registry: Optional[Dict[str, Team]] = None):
+        print("Attempted assignment of players to teams")
+        self._assign_players_to_teams(self._player_team_map, team_registry)
 
-            self._build_indexes()
-            
-            print(f"Processed {match_counter} matches")
+        self._build_indexes()
+        
+        print(f"Processed {self._match_counter} matches")
+        self._player_team_map = {}
+        self._match_counter = 0
 
     def _assign_players_to_teams(self, player_team_map: Dict[str, str], team_registry: Optional[Dict[str, Team]]):
         if not team_registry:
             print("Failed to assign players to team, ensure team registry is valid")
             return
         
+        # champion_stats only describe the roster, as after recompute_from_players; add_player then
+        # merges each player's records in as they join instead of rebuilding every team per player
+        for team in team_registry.values():
+            team.champion_stats.clear()
+
         for player_name, team_name in player_team_map.items():
             if player_name in self.players and team_name in team_registry:
                 player = self.players[player_name]
@@ -124,8 +139,6 @@ class PlayerManager:
                 player.team = team
                 
                 team.add_player(self.players[player_name])
-            for team in team_registry.values():
-                team.recompute_from_players()
                 
     def _build_indexes(self):
         self.players_by_team.clear()
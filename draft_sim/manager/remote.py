@@ -0,0 +1,66 @@
+from typing import Dict, Optional
+from ..datamodel.champion import Champion
+from ..datamodel.team import Team, TeamChampionPerformance
+from ..engine.championset import ChampionTable
+from .championmanager import ChampionManager
+from .playermanager import PlayerManager
+from .teammanager import TeamManager
+
+
+#team registry filled from a prediction server: every team name is listed up front, a team's totals and
+#champion stats are fetched from /teams/<name> the first time get_team asks for it
+class RemoteTeamManager(TeamManager):
+    def __init__(self, client):
+        super().__init__()
+        self.client = client
+        self._fetched: Dict[str, bool] = {}
+
+    def load(self) -> None:
+        for name in self.client.teams():
+            self.teams[name] = Team(name=name)
+
+    def get_team(self, team_name: str) -> Optional[Team]:
+        team = self.teams.get(team_name)
+        if team is None or self._fetched.get(team_name):
+            return team
+        try:
+            data = self.client.team_stats(team_name, limit=0)
+        except Exception as e:
+            print(f"Error fetching team {team_name} from the server: {e}")
+            return team
+        # the server sends games, the registry counts player entries (five per game)
+        team.total_entries = int(data["total_games"]) * 5
+        team.total_win_entries = int(data["total_wins"]) * 5
+        for row in data["top_picks"]:
+            perf = team.champion_stats[row["champion"]] = TeamChampionPerformance(row["champion"])
+            perf.games = int(row["games"])
+            perf.wins = int(row["wins"])
+        self._fetched[team_name] = True
+        return team
+
+
+#stands in for MainManager when the app runs against a prediction server (YALVON_SERVER): team and
+#champion registries come from the server instead of parsing the player csv. players stay empty, the app
+#only reads team and champion stats
+class RemoteManager:
+    def __init__(self, client, table: Optional[ChampionTable] = None):
+        self.client = client
+        self.player_manager = PlayerManager()
+        self.team_manager = RemoteTeamManager(client)
+        self.champion_manager = ChampionManager(table)
+
+    def load_data(self) -> None:
+        champions = self.champion_manager.champions
+        for row in self.client.champions():
+            champion = champions[row["champion"]] = Champion(name=row["champion"])
+            champion.champion_id = self.champion_manager.table.intern(champion.name)
+            champion.total_games = int(row["games"])
+            champion.total_wins = int(row["wins"])
+        self.team_manager.load()
+        print(f"Loaded {len(champions)} champions and {len(self.team_manager.teams)} teams from the server")
+
+    def get_player_data(self, player_name: str):
+        return self.player_manager.get_player(player_name)
+
+    def get_team_data(self, team_name: str) -> Optional[Team]:
+        return self.team_manager.get_team(team_name)
@@ -0,0 +1,186 @@
+import hashlib
+import os
+from typing import Dict, Optional
+import numpy as np
+from ..datamodel.champion import Champion
+from ..datamodel.player import Player, add_records
+from ..datamodel.team import Team
+
+#binary copy of the aggregated registries, so a launch with an unchanged csv skips parsing it
+#
+#the snapshot holds what the loaders produce before finish_loading (team, champion and player/champion
+#totals, the player -> team map) as plain numpy arrays in one uncompressed .npz, loaded with
+#allow_pickle=False. rosters, team champion stats and the indexes are rebuilt by finish_loading as
+#usual. it is only used when the schema version, the csv's size and its content (sha256) match, and
+#the champion ids it recorded are still what the ChampionTable hands out; otherwise the csv is parsed.
+#an unchanged mtime skips the hash. snapshots live in a per-user cache directory rather than next to
+#the csv: the one-file build unpacks the csv into a fresh temp directory (with a fresh mtime) every launch.
+
+#bump whenever the arrays written by save_snapshot change
+SCHEMA_VERSION = 1
+
+TEAM_FIELDS = (
+    "total_entries", "total_win_entries", "total_bside_entries", "total_rside_entries",
+    "total_bside_win_entries", "total_rside_win_entries", "first_bloods",
+    "total_kills", "total_deaths", "total_assists",
+)
+CHAMPION_FIELDS = ("total_games", "total_wins")
+RECORD_FIELDS = ("games", "wins", "kills", "deaths", "assists", "creepscore")
+
+
+#YALVON_CACHE_DIR if set, else %LOCALAPPDATA%\Yalvon\cache on windows and $XDG_CACHE_HOME/yalvon elsewhere
+def cache_dir() -> str:
+    override = os.environ.get("YALVON_CACHE_DIR")
+    if override:
+        return override
+    if os.name == "nt":
+        base = os.environ.get("LOCALAPPDATA") or os.path.join(os.path.expanduser("~"), "AppData", "Local")
+        return os.path.join(base, "Yalvon", "cache")
+    base = os.environ.get("XDG_CACHE_HOME") or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "yalvon")
+
+
+def default_path(csv_path: str) -> str:
+    name = os.path.splitext(os.path.basename(csv_path))[0]
+    return os.path.join(cache_dir(), f"{name}.snapshot.npz")
+
+
+def source_hash(csv_path: str) -> str:
+    digest = hashlib.sha256()
+    with open(csv_path, mode='rb') as file:
+        for block in iter(lambda: file.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+#(size, mtime_ns, sha256 hex) of the source csv
+def source_key(csv_path: str) -> tuple:
+    st = os.stat(csv_path)
+    return (st.st_size, st.st_mtime_ns, source_hash(csv_path))
+
+
+def _strings(values) -> np.ndarray:
+    values = list(values)
+    return np.array(values, dtype=str) if values else np.zeros(0, dtype="U1")
+
+
+#writes the managers' state after add_rows / before finish_loading; returns the snapshot path
+def save_snapshot(path: str, csv_path: str, team_manager, champion_manager, player_manager,
+                  key: Optional[tuple] = None) -> str:
+    size, mtime_ns, digest = key if key is not None else source_key(csv_path)
+    teams = list(team_manager.teams.values())
+    champions = list(champion_manager.champions.values())
+    players = list(player_manager.players.values())
+    champion_index = {name: i for i, name in enumerate(champion_manager.champions)}
+    player_index = {name: i for i, name in enumerate(player_manager.players)}
+
+    record_player, record_champion, records = [], [], []
+    for i, player in enumerate(players):
+        for name, perf in player.champs_played.items():
+            record_player.append(i)
+            record_champion.append(champion_index[name])
+            records.append(perf.totals())
+    team_map = player_manager._player_team_map
+
+    arrays = {
+        "schema_version": np.int64(SCHEMA_VERSION),
+        "source_size": np.int64(size),
+        "source_mtime_ns": np.int64(mtime_ns),
+        "source_sha256": np.array(digest),
+        "team_names": _strings(t.name for t in teams),
+        "team_stats": np.array([[getattr(t, f) for f in TEAM_FIELDS] for t in teams],
+                               dtype=np.int64).reshape(len(teams), len(TEAM_FIELDS)),
+        "champion_names": _strings(c.name for c in champions),
+        "champion_ids": np.array([c.champion_id for c in champions], dtype=np.int64),
+        "champion_stats": np.array([[getattr(c, f) for f in CHAMPION_FIELDS] for c in champions],
+                                   dtype=np.int64).reshape(len(champions), len(CHAMPION_FIELDS)),
+        "player_names": _strings(p.name for p in players),
+        "record_player": np.array(record_player, dtype=np.int64),
+        "record_champion": np.array(record_champion, dtype=np.int64),
+        "records": np.array(records, dtype=np.int64).reshape(len(records), len(RECORD_FIELDS)),
+        "map_players": np.array([player_index[p] for p in team_map], dtype=np.int64),
+        "map_teams": _strings(team_map.values()),
+        "match_count": np.int64(player_manager._match_counter),
+    }
+    # written next to the target and swapped in, a crash mid-write never leaves a half snapshot
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    tmp = f"{path}.tmp"
+    with open(tmp, mode='wb') as file:
+        np.savez(file, **arrays)
+    os.replace(tmp, path)
+    return path
+
+
+def _discard(path: str) -> None:
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+#raw arrays of a snapshot that matches the csv, or None. an unreadable snapshot (truncated, bad crc,
+#missing arrays) is deleted so the next save replaces it
+def _read_snapshot(path: str, csv_path: str) -> Optional[Dict[str, np.ndarray]]:
+    if not os.path.exists(path):
+        return None
+    try:
+        with np.load(path, allow_pickle=False) as data:
+            if int(data["schema_version"]) != SCHEMA_VERSION:
+                print(f"Snapshot {path} has schema {int(data['schema_version'])}, rebuilding")
+                return None
+            st = os.stat(csv_path)
+            same_file = (int(data["source_size"]) == st.st_size
+                         and (int(data["source_mtime_ns"]) == st.st_mtime_ns
+                              or str(data["source_sha256"]) == source_hash(csv_path)))
+            if not same_file:
+                print(f"Snapshot {path} is out of date, rebuilding")
+                return None
+            return {k: data[k] for k in data.files}
+    except Exception as e:
+        print(f"Error reading snapshot {path}, rebuilding: {e}")
+        _discard(path)
+        return None
+
+
+#fills empty managers from a matching snapshot, ready for finish_loading; False leaves them untouched
+def load_snapshot(path: str, csv_path: str, team_manager, champion_manager, player_manager) -> bool:
+    data = _read_snapshot(path, csv_path)
+    if data is None:
+        return False
+
+    # champion ids come from the shared ChampionTable, which may have been built from another
+    # champion.json; check before touching anything
+    table = champion_manager.table
+    champion_names = data["champion_names"].tolist()
+    for name, champ_id in zip(champion_names, data["champion_ids"].tolist()):
+        known = table.id_of(name)
+        if known is not None and known != champ_id:
+            print(f"Snapshot {path} was built with a different champion table, rebuilding")
+            return False
+
+    teams = team_manager.teams
+    for name, stats in zip(data["team_names"].tolist(), data["team_stats"].tolist()):
+        team = teams[name] = Team(name=name)
+        for field, value in zip(TEAM_FIELDS, stats):
+            setattr(team, field, value)
+
+    champions = []
+    for name, stats in zip(champion_names, data["champion_stats"].tolist()):
+        champion = champion_manager.champions[name] = Champion(name=name)
+        champion.champion_id = table.intern(name)
+        print(f"Loaded new champion: {name}")
+        champion.total_games, champion.total_wins = stats
+        champions.append(champion)
+
+    players = []
+    for name in data["player_names"].tolist():
+        player = player_manager.players[name] = Player(name, player_manager.performance)
+        players.append(player)
+    add_records(players, champions, data["record_player"], data["record_champion"],
+                data["records"].T, player_manager.performance)
+
+    team_map = player_manager._player_team_map
+    for i, team_name in zip(data["map_players"].tolist(), data["map_teams"].tolist()):
+        team_map[players[i].name] = team_name
+    player_manager._match_counter += int(data["match_count"])
+    return True
@@ -0,0 +1,201 @@
+import csv
+import json
+import random
+import time
+from typing import Dict, List, Optional, Sequence
+import numpy as np
+from ..engine.championset import ChampionTable
+from ..engine.draftengine import TOTAL_TURNS, DraftEngine
+from ..search.evaluator import DraftEvaluator
+from .cache import PredictionCache
+from .encoder import DraftEncoder
+from .oblivious import load_model
+
+REPORT_VERSION = 1
+
+# csv columns in the order the champions were taken, lined up with TURN_SEQUENCE
+TURN_COLUMNS = (
+    [f"Ban{i}" for i in range(1, 7)]
+    + [f"Pick{i}" for i in range(1, 7)]
+    + [f"Ban{i}" for i in range(7, 11)]
+    + [f"Pick{i}" for i in range(7, 11)]
+)
+
+
+def _percentiles(values: Sequence[float]) -> Dict[str, float]:
+    if not values:
+        return {"count": 0}
+    arr = np.asarray(values, dtype=np.float64)
+    return {
+        "count": int(arr.size),
+        "mean": round(float(arr.mean()), 4),
+        "p50": round(float(np.percentile(arr, 50)), 4),
+        "p90": round(float(np.percentile(arr, 90)), 4),
+        "p99": round(float(np.percentile(arr, 99)), 4),
+        "max": round(float(arr.max()), 4),
+    }
+
+
+#brier score, log loss and equal-width reliability bins of predicted probability vs outcome
+def calibration(probs: Sequence[float], outcomes: Sequence[int], bins: int = 10) -> Dict[str, object]:
+    p = np.clip(np.asarray(probs, dtype=np.float64), 1e-12, 1 - 1e-12)
+    y = np.asarray(outcomes, dtype=np.float64)
+    if not p.size:
+        return {"count": 0}
+    idx = np.minimum((p * bins).astype(int), bins - 1)
+    table = []
+    for b in range(bins):
+        mask = idx == b
+        count = int(mask.sum())
+        table.append({
+            "lo": round(b / bins, 4),
+            "hi": round((b + 1) / bins, 4),
+            "count": count,
+            "mean_pred": round(float(p[mask].mean()), 4) if count else None,
+            "win_rate": round(float(y[mask].mean()), 4) if count else None,
+        })
+    return {
+        "count": int(p.size),
+        "brier": round(float(np.mean((p - y) ** 2)), 6),
+        "log_loss": round(float(-np.mean(y * np.log(p) + (1 - y) * np.log(1 - p))), 6),
+        "accuracy": round(float(np.mean((p >= 0.5) == (y == 1))), 6),
+        "bins": table,
+    }
+
+
+def _load_drafts(csv_path: str) -> List[dict]:
+    with open(csv_path, mode='r', encoding='utf-8', newline='') as file:
+        return list(csv.DictReader(file))
+
+
+#replays every draft turn by turn through DraftEvaluator.deltas (the champion grid's delta path),
+#timing each turn, then scores the finished drafts against the Won column
+#
+#the red side is treated as "Teams" like MainWindow does; rows recorded from the blue side are flipped.
+#with limit set, a seeded random sample of drafts is replayed so runs stay comparable.
+def run_backtest(draft_csv: str, cbm_path: str, npz_path: Optional[str] = None,
+                 champion_json: Optional[str] = None, limit: Optional[int] = None, seed: int = 0,
+                 use_cache: bool = False, bins: int = 10) -> Dict[str, object]:
+    model, loaded_path = load_model(cbm_path, npz_path)
+    encoder = DraftEncoder(model.feature_names_)
+    table = ChampionTable.from_json(champion_json) if champion_json else ChampionTable()
+
+    def predict_uncached(ids: np.ndarray) -> np.ndarray:
+        return model.predict_proba(encoder.to_model_input(ids))
+
+    cache = PredictionCache() if use_cache else None
+    predict = (lambda ids: cache.predict(ids, predict_uncached)) if cache else predict_uncached
+
+    drafts = _load_drafts(draft_csv)
+    if limit is not None and limit < len(drafts):
+        drafts = random.Random(seed).sample(drafts, limit)
+
+    # the pool is every champion named in the file, plus the table's champions when one is given;
+    # csv spellings come first so the model sees names the way it was trained on them
+    names = []
+    for row in drafts:
+        names.extend(row.get(c, "").strip() for c in TURN_COLUMNS)
+    names.extend(table.names)
+    engine = DraftEngine([n for n in names if n], table=table)
+
+    turn_ms: List[float] = []
+    per_turn_ms: List[List[float]] = [[] for _ in range(TOTAL_TURNS)]
+    predictions = 0
+    skipped = 0
+    final_probs, outcomes = [], []
+    replay_start = time.perf_counter()
+
+    for row in drafts:
+        red_is_teams = row.get("Side", "red").strip().lower() == "red"
+        red_team = row.get("Teams", "") if red_is_teams else row.get("Opponent", "")
+        blue_team = row.get("Opponent", "") if red_is_teams else row.get("Teams", "")
+        won = row.get("Won", "").strip().lower() == "true"
+        evaluator = DraftEvaluator(encoder, predict, red_team, blue_team)
+
+        engine.reset()
+        ok = True
+        for turn, col in enumerate(TURN_COLUMNS):
+            start = time.perf_counter()
+            deltas = evaluator.deltas(engine)
+            elapsed = (time.perf_counter() - start) * 1000.0
+            turn_ms.append(elapsed)
+            per_turn_ms[turn].append(elapsed)
+            predictions += len(deltas) + 1
+
+            champ = row.get(col, "").strip()
+            champ_id = engine.id_of(champ) if champ else None
+            if champ_id is None or not engine.is_available(champ_id):
+                ok = False
+                break
+            engine.apply(champ_id)
+        if not ok:
+            skipped += 1
+            continue
+
+        final_probs.append(evaluator.win_prob(engine, 1))
+        outcomes.append(1 if won == red_is_teams else 0)
+
+    replay_seconds = time.perf_counter() - replay_start
+
+    # the model on the csv rows as recorded (its training layout), for comparison with the replay
+    raw = encoder.encode_records([[row.get(c) or "" for c in encoder.columns] for row in drafts])
+    raw_proba = np.asarray(predict_uncached(raw))[:, 1] if len(raw) else np.empty(0)
+    raw_outcomes = [1 if row.get("Won", "").strip().lower() == "true" else 0 for row in drafts]
+
+    report = {
+        "version": REPORT_VERSION,
+        "config": {
+            "draft_csv": draft_csv,
+            "model": loaded_path,
+            "limit": limit,
+            "seed": seed,
+            "use_cache": use_cache,
+            "bins": bins,
+        },
+        "drafts": len(drafts),
+        "replayed": len(final_probs),
+        "skipped": skipped,
+        "turns": len(turn_ms),
+        "latency_ms": _percentiles(turn_ms),
+        "latency_ms_by_turn": [_percentiles(t) for t in per_turn_ms],
+        "predictions": predictions,
+        "predictions_per_sec": round(predictions / replay_seconds, 1) if replay_seconds > 0 else 0.0,
+        "replay_seconds": round(replay_seconds, 3),
+        "calibration": {
+            "replay": calibration(final_probs, outcomes, bins),
+            "csv_rows": calibration(raw_proba.tolist(), raw_outcomes, bins),
+        },
+    }
+    if cache is not None:
+        report["cache"] = cache.stats()
+    return report
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Replay historical drafts through the delta path and report speed and calibration")
+    parser.add_argument("--drafts", default="csvdata/draftdatalol.csv")
+    parser.add_argument("--cbm", default="cbmodels/CatModel.cbm")
+    parser.add_argument("--npz", default="cbmodels/CatModel.npz")
+    parser.add_argument("--champions", default="csvdata/champion.json")
+    parser.add_argument("--limit", type=int, default=None, help="replay a seeded sample of this many drafts")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--cache", action="store_true", help="route predictions through PredictionCache")
+    parser.add_argument("--bins", type=int, default=10)
+    parser.add_argument("--out", default="backtest_report.json")
+    args = parser.parse_args()
+
+    result = run_backtest(args.drafts, args.cbm, args.npz, args.champions, limit=args.limit,
+                          seed=args.seed, use_cache=args.cache, bins=args.bins)
+    with open(args.out, "w", encoding="utf-8") as f:
+        json.dump(result, f, indent=2, sort_keys=True)
+
+    lat = result["latency_ms"]
+    replay = result["calibration"]["replay"]
+    print(f"Replayed {result['replayed']}/{result['drafts']} drafts ({result['skipped']} skipped), "
+          f"{result['turns']} turns")
+    print(f"Turn latency ms: p50 {lat.get('p50')}  p90 {lat.get('p90')}  p99 {lat.get('p99')}  max {lat.get('max')}")
+    print(f"{result['predictions_per_sec']} predictions/s, Brier {replay.get('brier')}, "
+          f"csv-row Brier {result['calibration']['csv_rows'].get('brier')}")
+    print(f"Report written to {args.out}")
@@ -0,0 +1,102 @@
+import os
+import threading
+from collections import OrderedDict
+from typing import Callable, Dict, Optional
+import numpy as np
+
+
+#memoizes model output per draft state
+#the key is the encoded row (teams + 10 ban slots + 10 pick slots as interned ids). that row is already
+#canonical: any two draft lists that put the same champions in the same slots map to the same key.
+#slot order is NOT sorted away, the model reads Ban1..Ban10/Pick1..Pick10 positionally
+#safe to share with background threads: dict access is locked, model calls run outside the lock
+class PredictionCache:
+    def __init__(self, maxsize: int = 50_000, model_path: Optional[str] = None):
+        self.maxsize = maxsize
+        self.model_path = model_path
+        self.hits = 0
+        self.misses = 0
+        self._data: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.RLock()
+        self._signature = self._model_signature()
+
+    def _model_signature(self):
+        if not self.model_path:
+            return None
+        try:
+            st = os.stat(self.model_path)
+            return (st.st_size, st.st_mtime_ns)
+        except OSError:
+            return None
+
+    #clears everything if the model file was replaced since the last check
+    def model_changed(self) -> bool:
+        sig = self._model_signature()
+        if sig == self._signature:
+            return False
+        self._signature = sig
+        self.clear()
+        return True
+
+    @staticmethod
+    def key(ids_row: np.ndarray) -> bytes:
+        return np.ascontiguousarray(ids_row, dtype=np.int32).tobytes()
+
+    def get(self, key: bytes) -> Optional[np.ndarray]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is None:
+                self.misses += 1
+                return None
+            self._data.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: bytes, value: np.ndarray) -> None:
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > self.maxsize:
+                self._data.popitem(last=False)
+
+    def __contains__(self, key: bytes) -> bool:
+        return key in self._data
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    #returns predict_fn output for every row, only sending uncached (and de-duplicated) rows to the model
+    def predict(self, ids: np.ndarray, predict_fn: Callable[[np.ndarray], Optional[np.ndarray]]) -> Optional[np.ndarray]:
+        ids = np.atleast_2d(ids)
+        keys = [self.key(row) for row in ids]
+        results = [self.get(k) for k in keys]
+
+        pending: Dict[bytes, int] = {}
+        for i, (k, r) in enumerate(zip(keys, results)):
+            if r is None and k not in pending:
+                pending[k] = i
+
+        if pending:
+            proba = predict_fn(ids[list(pending.values())])
+            if proba is None:
+                return None
+            for k, row in zip(pending.keys(), np.asarray(proba)):
+                self.put(k, row)
+            fresh = dict(zip(pending.keys(), np.asarray(proba)))
+            results = [r if r is not None else fresh[k] for k, r in zip(keys, results)]
+
+        return np.vstack(results)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+
+    def stats(self) -> dict:
+        total = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "size": len(self._data),
+            "maxsize": self.maxsize,
+            "hit_rate": (self.hits / total) if total else 0.0,
+        }
@@ -0,0 +1,107 @@
+import http.client
+import json
+import socket
+import threading
+from typing import Dict, List, Optional, Sequence
+from urllib.parse import quote, urlencode, urlsplit
+import numpy as np
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, path: str, timeout: float):
+        super().__init__("localhost", timeout=timeout)
+        self.unix_path = path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.unix_path)
+
+
+#talks to a running draft_sim.predict.server; address is "http://127.0.0.1:8765" or "unix:/path/to.sock"
+#
+#predict_proba/feature_names_ match the CatBoost model interface, so an instance can stand in for the
+#model in the app: rows are sent as strings and batched with other clients' requests on the server.
+#shap_values, teams, champions and team_stats let the app take its explanations and registries from the
+#server too (see RemoteManager).
+#each thread keeps its own keep-alive connection, so the app's background threads can share one client
+class PredictionClient:
+    def __init__(self, address: str, timeout: float = 10.0):
+        self.address = address
+        self.timeout = timeout
+        self._local = threading.local()
+        self.feature_names_: List[str] = self.info()["feature_names"]
+
+    def _connect(self) -> http.client.HTTPConnection:
+        if self.address.startswith("unix:"):
+            return _UnixHTTPConnection(self.address[len("unix:"):], self.timeout)
+        url = urlsplit(self.address)
+        return http.client.HTTPConnection(url.hostname or "127.0.0.1", url.port or 8765, timeout=self.timeout)
+
+    def request(self, method: str, path: str, payload: Optional[dict] = None) -> dict:
+        body = json.dumps(payload).encode("utf-8") if payload is not None else None
+        headers = {"Content-Type": "application/json"} if body is not None else {}
+        # one retry on a fresh connection, the server may have dropped an idle keep-alive socket
+        for attempt in range(2):
+            conn = getattr(self._local, "conn", None)
+            if conn is None:
+                conn = self._local.conn = self._connect()
+            try:
+                conn.request(method, path, body=body, headers=headers)
+                response = conn.getresponse()
+                data = json.loads(response.read() or b"{}")
+                break
+            except (http.client.HTTPException, ConnectionError, socket.timeout):
+                self.close()
+                if attempt:
+                    raise
+        if response.status != 200:
+            raise RuntimeError(f"{method} {path} failed ({response.status}): {data.get('error')}")
+        return data
+
+    #closes this thread's connection
+    def close(self) -> None:
+        conn = getattr(self._local, "conn", None)
+        if conn is not None:
+            conn.close()
+            self._local.conn = None
+
+    def info(self) -> dict:
+        return self.request("GET", "/info")
+
+    @staticmethod
+    def _rows(X) -> List[List[str]]:
+        return [["" if v is None else str(v) for v in row] for row in np.atleast_2d(np.asarray(X, dtype=object))]
+
+    #X is the object matrix DraftEncoder.to_model_input builds
+    def predict_proba(self, X) -> np.ndarray:
+        return np.asarray(self.request("POST", "/predict", {"rows": self._rows(X)})["proba"], dtype=np.float64)
+
+    #SHAP matrix for the same input as predict_proba, None when the server can't explain
+    def shap_values(self, X) -> Optional[np.ndarray]:
+        shap = self.request("POST", "/explain", {"rows": self._rows(X)})["shap"]
+        return None if shap is None else np.asarray(shap, dtype=np.float64)
+
+    def win_prob(self, team: str, opponent: str, moves: Sequence[str]) -> Dict[str, float]:
+        return self.request("POST", "/winprob", {"team": team, "opponent": opponent, "moves": list(moves)})
+
+    def deltas(self, team: str, opponent: str, moves: Sequence[str],
+               champions: Optional[Sequence[str]] = None) -> Dict[str, float]:
+        payload = {"team": team, "opponent": opponent, "moves": list(moves)}
+        if champions is not None:
+            payload["champions"] = list(champions)
+        return self.request("POST", "/deltas", payload)["deltas"]
+
+    def teams(self) -> List[str]:
+        return self.request("GET", "/teams")["teams"]
+
+    #[{"champion", "games", "wins"}, ...] over every team
+    def champions(self) -> List[dict]:
+        return self.request("GET", "/champions")["champions"]
+
+    #limit=0 lists every champion the team has played
+    def team_stats(self, team: str, limit: int = 10, min_games: int = 1, exclude: Sequence[str] = ()) -> dict:
+        query = {"limit": limit, "min_games": min_games}
+        if exclude:
+            query["exclude"] = ",".join(exclude)
+        return self.request("GET", f"/teams/{quote(team, safe='')}?{urlencode(query)}")
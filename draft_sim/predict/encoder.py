@@ -0,0 +1,162 @@
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+# filler used by the app for empty ban/pick slots, matches what the model was trained around
+FILLER = "a"
+SLOTS = 10
+
+
+#turns draft states into model rows without going through pandas
+#every string (team, champion) is interned once into an integer id; rows are int32 id vectors
+#that get mapped to the model's input layout with a single fancy-index
+class DraftEncoder:
+    def __init__(self, feature_names: Sequence[str], cat_features: Optional[Iterable[str]] = None):
+        self.columns: List[str] = list(feature_names)
+        self.col_index: Dict[str, int] = {c: i for i, c in enumerate(self.columns)}
+
+        cat_set = set(cat_features) if cat_features is not None else set(self.columns)
+        self.cat_idx: List[int] = [i for i, c in enumerate(self.columns) if c in cat_set]
+        self.num_idx: List[int] = [i for i, c in enumerate(self.columns) if c not in cat_set]
+
+        self.team_col: int = self.col_index.get("Teams", -1)
+        self.opponent_col: int = self.col_index.get("Opponent", -1)
+        self.ban_cols: List[int] = [self.col_index.get(f"Ban{i + 1}", -1) for i in range(SLOTS)]
+        self.pick_cols: List[int] = [self.col_index.get(f"Pick{i + 1}", -1) for i in range(SLOTS)]
+
+        self.vocab: List[str] = []
+        self.ids: Dict[str, int] = {}
+        self._values = np.empty(0, dtype=object)
+        self._intern_lock = threading.Lock()
+        self.filler_id = self.intern(FILLER)
+
+        # every categorical column starts as filler, numeric columns are zeroed on output
+        self.template = np.full(len(self.columns), self.filler_id, dtype=np.int32)
+
+    def intern(self, value: str) -> int:
+        value = "" if value is None else str(value)
+        idx = self.ids.get(value)
+        if idx is None:
+            # new strings are rare; the lock keeps two threads from giving one string two ids
+            with self._intern_lock:
+                idx = self.ids.get(value)
+                if idx is None:
+                    idx = len(self.vocab)
+                    self.vocab.append(value)
+                    self.ids[value] = idx
+                    self._values = None  # rebuilt lazily
+        return idx
+
+    #id of a value already in the vocab, filler for anything else; never grows the vocab
+    def lookup(self, value: str) -> int:
+        return self.ids.get("" if value is None else str(value), self.filler_id)
+
+    def intern_many(self, values: Iterable[str]) -> List[int]:
+        return [self.intern(v) for v in values]
+
+    @property
+    def values(self) -> np.ndarray:
+        # read once into a local, a background thread may intern (and reset _values) meanwhile
+        values = self._values
+        if values is None or len(values) != len(self.vocab):
+            values = np.array(self.vocab, dtype=object)
+            self._values = values
+        return values
+
+    #Ban1..10 / Pick1..10 are filled positionally: all of blue's (in the order DraftEngine.draft_lists gives them)
+    #then red's, truncated/padded to 10 slots
+    def _slot_ids(self, blue: Sequence[str], red: Sequence[str]) -> List[int]:
+        ids = [self.intern(x) for x in list(blue) + list(red)][:SLOTS]
+        ids += [self.filler_id] * (SLOTS - len(ids))
+        return ids
+
+    def encode(self, team: str, opponent: str, blue_bans: Sequence[str], red_bans: Sequence[str],
+               blue_picks: Sequence[str], red_picks: Sequence[str], out: Optional[np.ndarray] = None) -> np.ndarray:
+        row = out if out is not None else self.template.copy()
+        if out is not None:
+            row[:] = self.template
+        if self.team_col >= 0:
+            row[self.team_col] = self.intern(team)
+        if self.opponent_col >= 0:
+            row[self.opponent_col] = self.intern(opponent)
+        for col, idx in zip(self.ban_cols, self._slot_ids(blue_bans, red_bans)):
+            if col >= 0:
+                row[col] = idx
+        for col, idx in zip(self.pick_cols, self._slot_ids(blue_picks, red_picks)):
+            if col >= 0:
+                row[col] = idx
+        return row
+
+    def encode_many(self, drafts: Iterable[tuple]) -> np.ndarray:
+        # drafts: (team, opponent, blue_bans, red_bans, blue_picks, red_picks) tuples
+        drafts = list(drafts)
+        out = np.empty((len(drafts), len(self.columns)), dtype=np.int32)
+        for i, d in enumerate(drafts):
+            self.encode(*d, out=out[i])
+        return out
+
+    #rows whose cells are already in model column order (e.g. read straight from draftdatalol.csv)
+    #blank or missing cells become filler, same as an empty ban/pick slot in the app; with intern=False
+    #unknown cells do too, for input that must not grow the vocab
+    def encode_records(self, records: Iterable[Sequence[str]], intern: bool = True) -> np.ndarray:
+        records = list(records)
+        out = np.empty((len(records), len(self.columns)), dtype=np.int32)
+        intern = self.intern if intern else self.lookup
+        filler = self.filler_id
+        for i, record in enumerate(records):
+            out[i] = [intern(v.strip()) if v and v.strip() else filler for v in record]
+        return out
+
+    #one row per candidate, each with the candidate appended for the side to move
+    #appending to a side's list inserts at a fixed slot, so all rows share everything but one column
+    def encode_candidates(self, team: str, opponent: str, blue_bans: Sequence[str], red_bans: Sequence[str],
+                          blue_picks: Sequence[str], red_picks: Sequence[str],
+                          candidates: Sequence[str], side: str, action: str) -> np.ndarray:
+        blue_bans, red_bans = list(blue_bans), list(red_bans)
+        blue_picks, red_picks = list(blue_picks), list(red_picks)
+
+        if action == "pick":
+            blue_list, red_list, cols = blue_picks, red_picks, self.pick_cols
+        else:
+            blue_list, red_list, cols = blue_bans, red_bans, self.ban_cols
+        slot = len(blue_list) if side == "blue" else len(blue_list) + len(red_list)
+
+        # build the shared row with a placeholder in the candidate's slot
+        (blue_list if side == "blue" else red_list).append(FILLER)
+        base = self.encode(team, opponent, blue_bans, red_bans, blue_picks, red_picks)
+
+        rows = np.tile(base, (len(candidates), 1))
+        if slot < SLOTS and cols[slot] >= 0:
+            rows[:, cols[slot]] = self.intern_many(candidates)
+        return rows
+
+    #one row per (first, second) pair, both appended in that order for the side to move
+    #(a double pick: first lands in the next slot, second in the one after it)
+    def encode_pairs(self, team: str, opponent: str, blue_bans: Sequence[str], red_bans: Sequence[str],
+                     blue_picks: Sequence[str], red_picks: Sequence[str],
+                     first: Sequence[str], second: Sequence[str], side: str, action: str) -> np.ndarray:
+        blue_bans, red_bans = list(blue_bans), list(red_bans)
+        blue_picks, red_picks = list(blue_picks), list(red_picks)
+
+        if action == "pick":
+            blue_list, red_list, cols = blue_picks, red_picks, self.pick_cols
+        else:
+            blue_list, red_list, cols = blue_bans, red_bans, self.ban_cols
+        slot = len(blue_list) if side == "blue" else len(blue_list) + len(red_list)
+
+        (blue_list if side == "blue" else red_list).extend([FILLER, FILLER])
+        base = self.encode(team, opponent, blue_bans, red_bans, blue_picks, red_picks)
+
+        rows = np.tile(base, (len(first), 1))
+        for offset, names in ((0, first), (1, second)):
+            if slot + offset < SLOTS and cols[slot + offset] >= 0:
+                rows[:, cols[slot + offset]] = self.intern_many(names)
+        return rows
+
+    #object matrix in model column order, what CatBoost's predict_proba accepts directly
+    def to_model_input(self, ids: np.ndarray) -> np.ndarray:
+        ids = np.atleast_2d(ids)
+        data = self.values[ids]
+        if self.num_idx:
+            data[:, self.num_idx] = 0
+        return data
@@ -0,0 +1,119 @@
+import threading
+from collections import OrderedDict
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from .cache import PredictionCache
+from .encoder import DraftEncoder
+
+
+#per-column SHAP values for draft rows, from catboost's ShapValues on the .cbm model
+#
+#get_feature_importance has a fixed cost of ~50 ms per call regardless of how few rows it gets, so
+#explain() scores every uncached row of a request in one call. results are cached by encoded row
+#(same key as PredictionCache). values are log-odds toward proba[:, 1] (red / Teams); the last column
+#of each row is the expected value, so a row sums to the model's raw prediction.
+#catboost is imported on first use; without it (or without the .cbm) available is False and
+#explain() returns None, the rest of the app does not depend on it.
+#with a PredictionClient the values come from the server's /explain instead and nothing is loaded here
+class ShapExplainer:
+    def __init__(self, cbm_path: str, encoder: DraftEncoder, maxsize: int = 4096, client=None):
+        self.cbm_path = cbm_path
+        self.encoder = encoder
+        self.maxsize = maxsize
+        self.client = client
+        self.calls = 0
+        self._model = None
+        self._failed = False
+        self._data: "OrderedDict[bytes, np.ndarray]" = OrderedDict()
+        self._lock = threading.RLock()
+
+    def _load(self):
+        if self.client is not None:
+            return None if self._failed else self.client
+        if self._model is None and not self._failed:
+            try:
+                from catboost import CatBoostClassifier
+
+                model = CatBoostClassifier()
+                model.load_model(self.cbm_path)
+                if list(model.feature_names_) != list(self.encoder.columns):
+                    raise ValueError("model columns do not match the encoder")
+                self._model = model
+            except Exception as e:
+                self._failed = True
+                print(f"Explanations unavailable: {e}")
+        return self._model
+
+    @property
+    def available(self) -> bool:
+        return self._load() is not None
+
+    #True once loading failed, explain() will only return None; does not trigger a load
+    @property
+    def disabled(self) -> bool:
+        return self._failed
+
+    #(rows, columns + 1) shap matrix for an id matrix, or None when catboost can't be used
+    def explain(self, ids: np.ndarray) -> Optional[np.ndarray]:
+        model = self._load()
+        if model is None:
+            return None
+
+        ids = np.atleast_2d(ids)
+        keys = [PredictionCache.key(row) for row in ids]
+        with self._lock:
+            results = [self._data.get(k) for k in keys]
+        pending: Dict[bytes, int] = {}
+        for i, (k, r) in enumerate(zip(keys, results)):
+            if r is None and k not in pending:
+                pending[k] = i
+
+        if pending:
+            X = self.encoder.to_model_input(ids[list(pending.values())])
+            if self.client is not None:
+                values = self.client.shap_values(X)
+                if values is None:
+                    self._failed = True
+                    print("Explanations unavailable: the prediction server can't compute them")
+                    return None
+            else:
+                from catboost import Pool
+
+                pool = Pool(X, cat_features=self.encoder.cat_idx)
+                values = np.asarray(model.get_feature_importance(pool, type="ShapValues"))
+            self.calls += 1
+            fresh = dict(zip(pending.keys(), values))
+            with self._lock:
+                for k, v in fresh.items():
+                    self._data[k] = v
+                    self._data.move_to_end(k)
+                while len(self._data) > self.maxsize:
+                    self._data.popitem(last=False)
+            results = [r if r is not None else fresh[k] for k, r in zip(keys, results)]
+        return np.vstack(results)
+
+    def cached(self, ids_row: np.ndarray) -> Optional[np.ndarray]:
+        with self._lock:
+            return self._data.get(PredictionCache.key(ids_row))
+
+    def clear(self) -> None:
+        with self._lock:
+            self._data.clear()
+        self._model = None
+        self._failed = False
+
+    #(column, value, shap) for one row, largest effect first; empty (filler) slots are summed into one
+    #("Empty slots", "", shap) entry and effects under min_abs are left out
+    def contributions(self, ids_row: np.ndarray, shap_row: np.ndarray,
+                      min_abs: float = 1e-3) -> List[Tuple[str, str, float]]:
+        vocab = self.encoder.vocab
+        out = []
+        empty = 0.0
+        for col, (code, value) in enumerate(zip(ids_row, shap_row[:-1])):
+            if code == self.encoder.filler_id:
+                empty += float(value)
+            elif abs(value) >= min_abs:
+                out.append((self.encoder.columns[col], vocab[code], float(value)))
+        if abs(empty) >= min_abs:
+            out.append(("Empty slots", "", empty))
+        return sorted(out, key=lambda c: abs(c[2]), reverse=True)
@@ -0,0 +1,640 @@
+import csv
+import json
+import os
+import tempfile
+import time
+from typing import Dict, Iterable, List, Optional, Sequence
+import numpy as np
+
+#pure numpy evaluator for the bundled CatBoost model
+#export_model() is run once (needs catboost) and turns the .cbm into flat arrays in a .npz file,
+#ObliviousModel only needs numpy to load and score it, so the app can skip importing catboost
+
+SCHEMA_VERSION = 1
+_M64 = 0xFFFFFFFFFFFFFFFF
+_EMPTY_HASH = _M64  # empty bucket marker in CatBoost's exported hash maps
+_HASH_MULT = np.uint64(0x4906ba494954cb65)
+
+_CTR_BORDERS = 0
+_CTR_COUNTER = 1
+_CTR_BUCKETS = 2
+_CTR_TYPES = {"Borders": _CTR_BORDERS, "Counter": _CTR_COUNTER, "FeatureFreq": _CTR_COUNTER, "Buckets": _CTR_BUCKETS}
+
+
+# -----------------------------
+# CatBoost categorical hashing (CityHash64 v1.0, low 32 bits)
+# -----------------------------
+_K0 = 0xc3a5c85c97cb3127
+_K1 = 0xb492b66fbe98f273
+_K2 = 0x9ae16a3b2f90404f
+_K3 = 0xc949d7c7509e6557
+
+
+def _f64(s: bytes, i: int) -> int:
+    return int.from_bytes(s[i:i + 8], "little")
+
+
+def _f32(s: bytes, i: int) -> int:
+    return int.from_bytes(s[i:i + 4], "little")
+
+
+def _rot(v: int, sh: int) -> int:
+    return v if sh == 0 else ((v >> sh) | (v << (64 - sh))) & _M64
+
+
+def _shift_mix(v: int) -> int:
+    return v ^ (v >> 47)
+
+
+def _hash_len16(u: int, v: int) -> int:
+    mul = 0x9ddfea08eb382d69
+    a = ((u ^ v) * mul) & _M64
+    a ^= a >> 47
+    b = ((v ^ a) * mul) & _M64
+    b ^= b >> 47
+    return (b * mul) & _M64
+
+
+def _hash_len0to16(s: bytes, n: int) -> int:
+    if n > 8:
+        a = _f64(s, 0)
+        b = _f64(s, n - 8)
+        return _hash_len16(a, _rot((b + n) & _M64, n)) ^ b
+    if n >= 4:
+        a = _f32(s, 0)
+        return _hash_len16((n + (a << 3)) & _M64, _f32(s, n - 4))
+    if n > 0:
+        y = s[0] + (s[n >> 1] << 8)
+        z = n + (s[n - 1] << 2)
+        return (_shift_mix(((y * _K2) ^ (z * _K3)) & _M64) * _K2) & _M64
+    return _K2
+
+
+def _hash_len17to32(s: bytes, n: int) -> int:
+    a = (_f64(s, 0) * _K1) & _M64
+    b = _f64(s, 8)
+    c = (_f64(s, n - 8) * _K2) & _M64
+    d = (_f64(s, n - 16) * _K0) & _M64
+    return _hash_len16((_rot((a - b) & _M64, 43) + _rot(c, 30) + d) & _M64,
+                       (a + _rot(b ^ _K3, 20) - c + n) & _M64)
+
+
+def _hash_len33to64(s: bytes, n: int) -> int:
+    z = _f64(s, 24)
+    a = (_f64(s, 0) + (n + _f64(s, n - 16)) * _K0) & _M64
+    b = _rot((a + z) & _M64, 52)
+    c = _rot(a, 37)
+    a = (a + _f64(s, 8)) & _M64
+    c = (c + _rot(a, 7)) & _M64
+    a = (a + _f64(s, 16)) & _M64
+    vf = (a + z) & _M64
+    vs = (b + _rot(a, 31) + c) & _M64
+    a = (_f64(s, 16) + _f64(s, n - 32)) & _M64
+    z = _f64(s, n - 8)
+    b = _rot((a + z) & _M64, 52)
+    c = _rot(a, 37)
+    a = (a + _f64(s, n - 24)) & _M64
+    c = (c + _rot(a, 7)) & _M64
+    a = (a + _f64(s, n - 16)) & _M64
+    wf = (a + z) & _M64
+    ws = (b + _rot(a, 31) + c) & _M64
+    r = _shift_mix(((vf + ws) * _K2 + (wf + vs) * _K0) & _M64)
+    return (_shift_mix((r * _K0 + vs) & _M64) * _K2) & _M64
+
+
+def _weak_hash_len32(s: bytes, i: int, a: int, b: int):
+    w, x, y, z = _f64(s, i), _f64(s, i + 8), _f64(s, i + 16), _f64(s, i + 24)
+    a = (a + w) & _M64
+    b = _rot((b + a + z) & _M64, 21)
+    c = a
+    a = (a + x + y) & _M64
+    b = (b + _rot(a, 44)) & _M64
+    return (a + z) & _M64, (b + c) & _M64
+
+
+def city_hash64(s: bytes) -> int:
+    n = len(s)
+    if n <= 16:
+        return _hash_len0to16(s, n)
+    if n <= 32:
+        return _hash_len17to32(s, n)
+    if n <= 64:
+        return _hash_len33to64(s, n)
+
+    x = _f64(s, n - 40)
+    y = (_f64(s, n - 16) + _f64(s, n - 56)) & _M64
+    z = _hash_len16((_f64(s, n - 48) + n) & _M64, _f64(s, n - 24))
+    v = _weak_hash_len32(s, n - 64, n, z)
+    w = _weak_hash_len32(s, n - 32, (y + _K1) & _M64, x)
+    x = (x * _K1 + _f64(s, 0)) & _M64
+
+    pos = 0
+    remaining = (n - 1) & ~63
+    while True:
+        x = (_rot((x + y + v[0] + _f64(s, pos + 8)) & _M64, 37) * _K1) & _M64
+        y = (_rot((y + v[1] + _f64(s, pos + 48)) & _M64, 42) * _K1) & _M64
+        x ^= w[1]
+        y = (y + v[0] + _f64(s, pos + 40)) & _M64
+        z = (_rot((z + w[0]) & _M64, 33) * _K1) & _M64
+        v = _weak_hash_len32(s, pos, (v[1] * _K1) & _M64, (x + w[0]) & _M64)
+        w = _weak_hash_len32(s, pos + 32, (z + w[1]) & _M64, (y + _f64(s, pos + 16)) & _M64)
+        z, x = x, z
+        pos += 64
+        remaining -= 64
+        if remaining == 0:
+            break
+    return _hash_len16((_hash_len16(v[0], w[0]) + _shift_mix(y) * _K1 + z) & _M64,
+                       (_hash_len16(v[1], w[1]) + x) & _M64)
+
+
+#same value CatBoost assigns to a categorical string before any CTR/one-hot lookup
+def cat_hash(value) -> int:
+    return city_hash64(str(value).encode("utf-8")) & 0xFFFFFFFF
+
+
+# -----------------------------
+# Export (.cbm -> .npz), needs catboost
+# -----------------------------
+def _model_json(cbm_path: str) -> dict:
+    from catboost import CatBoost
+
+    model = CatBoost()
+    model.load_model(cbm_path)
+    fd, tmp = tempfile.mkstemp(suffix=".json")
+    os.close(fd)
+    try:
+        model.save_model(tmp, format="json")
+        with open(tmp, "r", encoding="utf-8") as f:
+            return json.load(f)
+    finally:
+        os.remove(tmp)
+
+
+def export_model(cbm_path: str, out_path: str) -> str:
+    data = _model_json(cbm_path)
+    if "oblivious_trees" not in data:
+        raise ValueError("Only symmetric (oblivious) tree models can be exported")
+
+    info = data.get("features_info", {})
+    float_info = info.get("float_features", [])
+    cat_info = info.get("categorical_features", [])
+    ctr_info = info.get("ctrs", [])
+
+    n_cols = len(float_info) + len(cat_info)
+    feature_names = [""] * n_cols
+    for f in float_info + cat_info:
+        feature_names[f["flat_feature_index"]] = f.get("feature_id") or f.get("feature_name") or ""
+
+    float_cols = [f["flat_feature_index"] for f in float_info]
+    cat_cols = [c["flat_feature_index"] for c in sorted(cat_info, key=lambda c: c["feature_index"])]
+
+    # CTR projections, shared by every model ctr with the same identifier
+    proj_index: Dict[str, int] = {}
+    proj_cats: List[List[int]] = []
+    proj_type: List[int] = []
+    for ctr in ctr_info:
+        key = ctr["identifier"]
+        if key in proj_index:
+            continue
+        cats = []
+        for el in ctr["elements"]:
+            if el.get("combination_element") != "cat_feature_value":
+                raise ValueError(f"Unsupported CTR element: {el}")
+            cats.append(el["cat_feature_index"])
+        if ctr["ctr_type"] not in _CTR_TYPES:
+            raise ValueError(f"Unsupported CTR type: {ctr['ctr_type']}")
+        proj_index[key] = len(proj_cats)
+        proj_cats.append(cats)
+        proj_type.append(_CTR_TYPES[ctr["ctr_type"]])
+
+    # per projection learned counts, sorted by hash so lookups are a searchsorted
+    table_hashes, table_counts, table_offsets, denominators = [], [], [0], []
+    ctr_data = data.get("ctr_data", {})
+    for key in proj_index:
+        entry = ctr_data[key]
+        stride = int(entry["hash_stride"])
+        if stride > 3:
+            raise ValueError("Only binary classification CTR tables are supported")
+        flat = entry["hash_map"]
+        rows = []
+        for i in range(0, len(flat), stride):
+            h = int(flat[i])
+            if h == _EMPTY_HASH:
+                continue
+            counts = [float(c) for c in flat[i + 1:i + stride]] + [0.0] * (3 - stride)
+            rows.append((h, counts))
+        rows.sort(key=lambda r: r[0])
+        table_hashes.extend(r[0] for r in rows)
+        table_counts.extend(r[1] for r in rows)
+        table_offsets.append(len(table_hashes))
+        denominators.append(float(entry.get("counter_denominator", 0)))
+
+    # derived feature columns: [model ctrs..., one-hot indicators..., float features..., constant]
+    ctr_proj, ctr_target, ctr_prior_num, ctr_prior_denom, ctr_shift, ctr_scale = [], [], [], [], [], []
+    ctr_border_offsets = []
+    n_borders = sum(len(f.get("borders", [])) for f in float_info)
+    for ctr in ctr_info:
+        ctr_proj.append(proj_index[ctr["identifier"]])
+        ctr_target.append(ctr.get("target_border_idx", 0))
+        ctr_prior_num.append(ctr["prior_numerator"])
+        ctr_prior_denom.append(ctr["prior_denomerator"])
+        ctr_shift.append(ctr["shift"])
+        ctr_scale.append(ctr["scale"])
+        ctr_border_offsets.append(len(ctr.get("borders", [])))
+
+    onehot_keys: Dict[tuple, int] = {}
+    onehot_cat, onehot_value = [], []
+    trees = data["oblivious_trees"]
+    for tree in trees:
+        for s in tree["splits"]:
+            if s["split_type"] == "OneHotFeature":
+                k = (s["cat_feature_index"], int(s["value"]) & 0xFFFFFFFF)
+                if k not in onehot_keys:
+                    onehot_keys[k] = len(onehot_cat)
+                    onehot_cat.append(k[0])
+                    onehot_value.append(k[1])
+
+    n_ctr = len(ctr_info)
+    n_onehot = len(onehot_cat)
+    float_base = n_ctr + n_onehot
+    const_col = float_base + len(float_cols)
+
+    # split_index counts every border of every binary feature: floats, then one-hot values, then ctrs
+    one_hot_values = sum(len(c.get("values", [])) for c in cat_info)
+    ctr_split_start = n_borders + one_hot_values
+    ctr_starts = np.cumsum([0] + ctr_border_offsets)
+
+    depth = max((len(t["splits"]) for t in trees), default=0)
+    n_trees = len(trees)
+    split_feature = np.full((n_trees, depth), const_col, dtype=np.int32)
+    split_border = np.full((n_trees, depth), np.inf, dtype=np.float32)
+    leaf_values = np.zeros((n_trees, 1 << depth), dtype=np.float64)
+
+    for t, tree in enumerate(trees):
+        if len(tree["leaf_values"]) != 1 << len(tree["splits"]):
+            raise ValueError("Only single-dimension models are supported")
+        leaf_values[t, :len(tree["leaf_values"])] = tree["leaf_values"]
+        for d, s in enumerate(tree["splits"]):
+            kind = s["split_type"]
+            if kind == "OnlineCtr":
+                ctr_i = int(np.searchsorted(ctr_starts, s["split_index"] - ctr_split_start, side="right") - 1)
+                split_feature[t, d] = ctr_i
+                split_border[t, d] = s["border"]
+            elif kind == "OneHotFeature":
+                split_feature[t, d] = n_ctr + onehot_keys[(s["cat_feature_index"], int(s["value"]) & 0xFFFFFFFF)]
+                split_border[t, d] = 0.5
+            elif kind == "FloatFeature":
+                split_feature[t, d] = float_base + s["float_feature_index"]
+                split_border[t, d] = s["border"]
+            else:
+                raise ValueError(f"Unsupported split type: {kind}")
+
+    scale, bias = data.get("scale_and_bias", [1.0, [0.0]])
+    bias = bias[0] if isinstance(bias, list) else bias
+
+    np.savez(
+        out_path,
+        schema_version=np.int32(SCHEMA_VERSION),
+        feature_names=np.array(feature_names),
+        float_cols=np.array(float_cols, dtype=np.int32),
+        cat_cols=np.array(cat_cols, dtype=np.int32),
+        proj_offsets=np.cumsum([0] + [len(c) for c in proj_cats]).astype(np.int32),
+        proj_cats=np.array([c for cats in proj_cats for c in cats], dtype=np.int32),
+        proj_type=np.array(proj_type, dtype=np.int8),
+        proj_denominator=np.array(denominators, dtype=np.float32),
+        table_offsets=np.array(table_offsets, dtype=np.int64),
+        table_hashes=np.array(table_hashes, dtype=np.uint64),
+        table_counts=np.array(table_counts, dtype=np.float32).reshape(-1, 2),
+        ctr_proj=np.array(ctr_proj, dtype=np.int32),
+        ctr_target=np.array(ctr_target, dtype=np.int32),
+        ctr_prior_num=np.array(ctr_prior_num, dtype=np.float32),
+        ctr_prior_denom=np.array(ctr_prior_denom, dtype=np.float32),
+        ctr_shift=np.array(ctr_shift, dtype=np.float32),
+        ctr_scale=np.array(ctr_scale, dtype=np.float32),
+        onehot_cat=np.array(onehot_cat, dtype=np.int32),
+        onehot_value=np.array(onehot_value, dtype=np.uint32),
+        split_feature=split_feature,
+        split_border=split_border,
+        leaf_values=leaf_values,
+        scale=np.float64(scale),
+        bias=np.float64(bias),
+    )
+    return out_path if out_path.endswith(".npz") else out_path + ".npz"
+
+
+# -----------------------------
+# Evaluator
+# -----------------------------
+class ObliviousModel:
+    # arrays built from the exported ones at load time, see arrays()/from_arrays()
+    DERIVED = ("tree_index", "proj_matrix", "salts", "keys", "key_proj", "key_hash", "key_counts",
+               "proj_is_counter", "ctr_good_flat")
+
+    def __init__(self, arrays: dict):
+        self._set_arrays(arrays)
+        self.tree_index = np.arange(self.leaf_values.shape[0])
+
+        # projections as a padded (n_proj, max_len) matrix so hashes combine one position at a time
+        n_proj = len(self.proj_type)
+        lengths = np.diff(self.proj_offsets)
+        self.proj_matrix = np.full((n_proj, int(lengths.max()) if n_proj else 0), -1, dtype=np.int32)
+        for p in range(n_proj):
+            self.proj_matrix[p, :lengths[p]] = self.proj_cats[self.proj_offsets[p]:self.proj_offsets[p + 1]]
+
+        # all tables are searched with one searchsorted: every key is salted with its projection id so
+        # equal hashes from different projections land apart; matches are then checked against the raw
+        # (projection, hash) pair, so the salt can never produce a wrong hit
+        sizes = np.diff(self.table_offsets)
+        entry_proj = np.repeat(np.arange(n_proj, dtype=np.int32), sizes)
+        salt_mult = 0x9E3779B97F4A7C15
+        while True:
+            salts = (np.arange(1, n_proj + 1, dtype=np.uint64) * np.uint64(salt_mult)) if n_proj else np.zeros(0, dtype=np.uint64)
+            salted = self.table_hashes ^ salts[entry_proj]
+            order = np.argsort(salted, kind="stable")
+            salted = salted[order]
+            if len(salted) < 2 or np.all(salted[1:] != salted[:-1]):
+                break
+            salt_mult = (salt_mult * 6364136223846793005 + 1) & _M64
+        self.salts = salts
+        self.keys = salted
+        self.key_proj = entry_proj[order]
+        self.key_hash = self.table_hashes[order]
+        self.key_counts = np.ascontiguousarray(self.table_counts[order].T)
+        self.proj_is_counter = self.proj_type == _CTR_COUNTER
+
+        # which count column is the numerator of each ctr, as a flat (projection, column) index
+        ctr_kind = self.proj_type[self.ctr_proj]
+        good_col = np.where(ctr_kind == _CTR_BUCKETS, self.ctr_target, 1)
+        good_col[ctr_kind == _CTR_COUNTER] = 0
+        self.ctr_good_flat = (self.ctr_proj * 2 + good_col).astype(np.int64)
+
+    def _set_arrays(self, arrays: dict) -> None:
+        if int(arrays["schema_version"]) != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported model schema {int(arrays['schema_version'])}")
+        self._exported = [k for k in arrays if k not in self.DERIVED]
+        for k, v in arrays.items():
+            setattr(self, k, v)
+        # same attribute CatBoostClassifier exposes, MainWindow reads it for the column order
+        self.feature_names_ = [str(x) for x in self.feature_names]
+        self._hash_cache: Dict[str, int] = {}
+        self._column_plans: Dict[int, tuple] = {}
+        self.n_ctr = len(self.ctr_proj)
+        self.n_onehot = len(self.onehot_cat)
+
+    #every array the evaluator reads, exported and derived
+    def arrays(self) -> Dict[str, np.ndarray]:
+        return {k: np.asarray(getattr(self, k)) for k in list(self._exported) + list(self.DERIVED)}
+
+    #rebuilds a model from arrays() output without redoing the setup; the arrays are used as given,
+    #so views into shared memory stay zero-copy
+    @classmethod
+    def from_arrays(cls, arrays: Dict[str, np.ndarray]) -> "ObliviousModel":
+        missing = [k for k in cls.DERIVED if k not in arrays]
+        if missing:
+            raise ValueError(f"Missing derived model arrays {missing}")
+        model = cls.__new__(cls)
+        model._set_arrays(arrays)
+        return model
+
+    @classmethod
+    def load(cls, path: str) -> "ObliviousModel":
+        with np.load(path, allow_pickle=False) as data:
+            return cls({k: data[k] for k in data.files})
+
+    def hash_values(self, values: Iterable) -> np.ndarray:
+        cache = self._hash_cache
+        out = []
+        for v in values:
+            key = str(v)
+            h = cache.get(key)
+            if h is None:
+                h = cache[key] = cat_hash(key)
+            out.append(h)
+        return np.array(out, dtype=np.uint32)
+
+    #everything below works feature-major: arrays are (features, rows) so each gather is contiguous
+
+    #combined projection hash per row, same mixing CatBoost uses for CTR keys; projs picks a subset of
+    #projections (all of them by default), rows of the result follow its order
+    def _projection_hashes(self, hashes_t: np.ndarray, projs: Optional[np.ndarray] = None) -> np.ndarray:
+        matrix = self.proj_matrix if projs is None else self.proj_matrix[projs]
+        # CatBoost widens the 32-bit hashes as signed ints before mixing
+        wide = hashes_t.view(np.int32).astype(np.int64).view(np.uint64)
+        h = np.zeros((matrix.shape[0], hashes_t.shape[1]), dtype=np.uint64)
+        for k in range(matrix.shape[1]):
+            cats = matrix[:, k]
+            valid = cats >= 0
+            mixed = _HASH_MULT * (h[valid] + _HASH_MULT * wide[cats[valid]])
+            h[valid] = mixed
+        return h
+
+    #numerator columns and totals per projection, looked up in the salted global table
+    def _projection_counts(self, h: np.ndarray, projs: Optional[np.ndarray] = None):
+        n_proj, n = h.shape
+        if not len(self.keys):
+            return np.zeros((n_proj * 2, n), dtype=np.float32), np.zeros((n_proj, n), dtype=np.float32)
+        projs = np.arange(n_proj) if projs is None else projs
+        query = h ^ self.salts[projs][:, None]
+        pos = np.searchsorted(self.keys, query)
+        pos[pos == len(self.keys)] = 0
+        found = (self.keys[pos] == query) & (self.key_hash[pos] == h) & (self.key_proj[pos] == projs[:, None])
+
+        good = np.where(found[None], self.key_counts[:, pos], np.float32(0))  # (2, n_proj, n)
+        total = np.where(self.proj_is_counter[projs][:, None],
+                         np.where(found, self.proj_denominator[projs][:, None], np.float32(0)),
+                         good[0] + good[1])
+        return good.transpose(1, 0, 2).reshape(n_proj * 2, n), total
+
+    def _ctr_values(self, hashes_t: np.ndarray) -> np.ndarray:
+        good, total = self._projection_counts(self._projection_hashes(hashes_t))
+        ctr = (good[self.ctr_good_flat] + self.ctr_prior_num[:, None]) / (total[self.ctr_proj] + self.ctr_prior_denom[:, None])
+        return (ctr + self.ctr_shift[:, None]) * self.ctr_scale[:, None]
+
+    #(features, rows) value of every derived feature a split can compare, last row is the constant 0
+    def _feature_values(self, hs: np.ndarray, floats: Optional[np.ndarray] = None) -> np.ndarray:
+        n_float = len(self.float_cols)
+        values = np.zeros((self.n_ctr + self.n_onehot + n_float + 1, hs.shape[1]), dtype=np.float32)
+        if self.n_ctr:
+            values[:self.n_ctr] = self._ctr_values(hs)
+        if self.n_onehot:
+            values[self.n_ctr:self.n_ctr + self.n_onehot] = hs[self.onehot_cat] == self.onehot_value[:, None]
+        if n_float and floats is not None:
+            values[self.n_ctr + self.n_onehot:-1] = np.asarray(floats, dtype=np.float32).T
+        return values
+
+    def _hashes_and_floats(self, X):
+        X = np.asarray(X, dtype=object)
+        if X.ndim == 1:
+            X = X[None, :]
+        hashes = self.hash_values(X[:, self.cat_cols].ravel()).reshape(X.shape[0], len(self.cat_cols))
+        floats = X[:, self.float_cols].astype(np.float32) if len(self.float_cols) else None
+        return hashes, floats
+
+    #(rows, trees, depth) bool: the side of every split each row of X goes to; bit d of a leaf index
+    def split_bits(self, X) -> np.ndarray:
+        hashes, floats = self._hashes_and_floats(X)
+        values = self._feature_values(np.ascontiguousarray(hashes.T), floats)
+        return (values[self.split_feature] > self.split_border[:, :, None]).transpose(2, 0, 1)
+
+    #categorical feature indices each derived feature reads (ctrs: their projection, one-hots: one column)
+    def feature_cats(self) -> List[frozenset]:
+        cats = []
+        for f in range(self.n_ctr):
+            p = self.ctr_proj[f]
+            cats.append(frozenset(int(c) for c in self.proj_cats[self.proj_offsets[p]:self.proj_offsets[p + 1]]))
+        cats.extend(frozenset([int(c)]) for c in self.onehot_cat)
+        cats.extend(frozenset() for _ in range(len(self.float_cols) + 1))
+        return cats
+
+    #what reads categorical feature cat: its projections, the ctrs over them (with the ctr's numerator
+    #and total as rows of those projections' counts), its one-hots and the trees splitting on any of them
+    def _column_plan(self, cat: int) -> tuple:
+        plan = self._column_plans.get(cat)
+        if plan is not None:
+            return plan
+        projs = np.array([p for p in range(len(self.proj_type))
+                          if cat in self.proj_cats[self.proj_offsets[p]:self.proj_offsets[p + 1]]], dtype=np.int64)
+        local = {int(p): i for i, p in enumerate(projs)}
+        ctrs = np.array([f for f in range(self.n_ctr) if int(self.ctr_proj[f]) in local], dtype=np.int64)
+        ctr_total = np.array([local[int(self.ctr_proj[f])] for f in ctrs], dtype=np.int64)
+        # same numerator column as ctr_good_flat, relative to the subset
+        ctr_good = ctr_total * 2 + (self.ctr_good_flat[ctrs] - self.ctr_proj[ctrs] * 2)
+        onehots = np.nonzero(self.onehot_cat == cat)[0]
+        features = np.concatenate([ctrs, self.n_ctr + onehots])
+        trees = np.nonzero(np.isin(self.split_feature, features).any(axis=1))[0]
+        fixed = np.setdiff1d(np.arange(self.split_feature.shape[0]), trees)
+        plan = (projs, ctrs, ctr_good, ctr_total, onehots, trees, fixed)
+        self._column_plans[cat] = plan
+        return plan
+
+    #raw predictions for copies of X_row (one model input row) with categorical feature cat set to each of
+    #values; only the projections, ctrs and trees that read cat are worked out per value, the rest once
+    #for the row, so scoring every champion for one slot costs a fraction of predict_raw on full rows.
+    #the leaves are summed in a different order, results match predict_raw to rounding
+    def predict_raw_column(self, X_row, cat: int, values: Sequence) -> np.ndarray:
+        projs, ctrs, ctr_good, ctr_total, onehots, trees, fixed = self._column_plan(cat)
+        hashes, floats = self._hashes_and_floats(X_row)
+        hs = np.ascontiguousarray(hashes.T)
+        row_values = self._feature_values(hs, floats)
+        depth = self.split_feature.shape[1]
+
+        # trees that never read cat land in the same leaf for every value
+        fixed_leaf = np.zeros(len(fixed), dtype=np.intp)
+        for d in range(depth):
+            fixed_leaf |= (row_values[self.split_feature[fixed, d], 0] > self.split_border[fixed, d]).astype(np.intp) << d
+        fixed_sum = self.leaf_values[fixed, fixed_leaf].sum()
+
+        m = len(values)
+        hs_m = np.repeat(hs, m, axis=1)
+        hs_m[cat] = self.hash_values(values)
+        feature_values = np.repeat(row_values, m, axis=1)
+        if len(projs):
+            good, total = self._projection_counts(self._projection_hashes(hs_m, projs), projs)
+            ctr = (good[ctr_good] + self.ctr_prior_num[ctrs, None]) / (total[ctr_total] + self.ctr_prior_denom[ctrs, None])
+            feature_values[ctrs] = (ctr + self.ctr_shift[ctrs, None]) * self.ctr_scale[ctrs, None]
+        if len(onehots):
+            feature_values[self.n_ctr + onehots] = hs_m[cat][None, :] == self.onehot_value[onehots, None]
+
+        leaf = np.zeros((len(trees), m), dtype=np.intp)
+        for d in range(depth):
+            leaf |= (feature_values[self.split_feature[trees, d]] > self.split_border[trees, d, None]).astype(np.intp) << d
+        raw = fixed_sum + self.leaf_values[trees[:, None], leaf].sum(axis=0)
+        return raw * self.scale + self.bias
+
+    #hashes: (n, n_cat) uint32 in categorical feature order, floats: (n, n_float)
+    def predict_raw_hashed(self, hashes: np.ndarray, floats: Optional[np.ndarray] = None, chunk: int = 4096) -> np.ndarray:
+        hashes = np.atleast_2d(hashes).astype(np.uint32, copy=False)
+        n = hashes.shape[0]
+        out = np.empty(n, dtype=np.float64)
+        n_trees, depth = self.split_feature.shape
+
+        for start in range(0, n, chunk):
+            hs = np.ascontiguousarray(hashes[start:start + chunk].T)
+            m = hs.shape[1]
+            values = self._feature_values(hs, floats[start:start + chunk] if floats is not None else None)
+
+            leaf = np.zeros((n_trees, m), dtype=np.intp)
+            for d in range(depth):
+                leaf |= (values[self.split_feature[:, d]] > self.split_border[:, d, None]).astype(np.intp) << d
+            out[start:start + chunk] = self.leaf_values[self.tree_index[:, None], leaf].sum(axis=0)
+
+        return out * self.scale + self.bias
+
+    def predict_raw(self, X) -> np.ndarray:
+        hashes, floats = self._hashes_and_floats(X)
+        return self.predict_raw_hashed(hashes, floats)
+
+    #mirrors CatBoostClassifier.predict_proba: columns are [P(class 0), P(class 1)]
+    def predict_proba(self, X) -> np.ndarray:
+        p = 1.0 / (1.0 + np.exp(-self.predict_raw(X)))
+        return np.column_stack([1.0 - p, p])
+
+
+# -----------------------------
+# Benchmark against catboost on the draft CSV
+# -----------------------------
+#exported .npz when it exists (no catboost needed), otherwise the .cbm through catboost
+#returns (model, path actually loaded) so callers can watch the right file for changes
+def load_model(cbm_path: str, npz_path: Optional[str] = None):
+    if npz_path and os.path.exists(npz_path):
+        return ObliviousModel.load(npz_path), npz_path
+    from catboost import CatBoostClassifier
+    cb_model = CatBoostClassifier()
+    cb_model.load_model(cbm_path)
+    return cb_model, cbm_path
+
+
+def _csv_rows(csv_path: str, columns: Sequence[str]) -> np.ndarray:
+    rows = []
+    with open(csv_path, mode="r", encoding="utf-8") as file:
+        for row in csv.DictReader(file):
+            values = [(row.get(c) or "").strip() for c in columns]
+            if all(values):
+                rows.append(values)
+    return np.array(rows, dtype=object)
+
+
+def benchmark(cbm_path: str, npz_path: str, csv_path: str, repeats: int = 3) -> dict:
+    from catboost import CatBoostClassifier
+
+    cb = CatBoostClassifier()
+    cb.load_model(cbm_path)
+    ob = ObliviousModel.load(npz_path)
+    X = _csv_rows(csv_path, ob.feature_names_)
+
+    def best_of(fn):
+        best = float("inf")
+        for _ in range(repeats):
+            t = time.perf_counter()
+            out = fn()
+            best = min(best, time.perf_counter() - t)
+        return best, out
+
+    cb_time, cb_proba = best_of(lambda: cb.predict_proba(X))
+    ob_time, ob_proba = best_of(lambda: ob.predict_proba(X))
+    return {
+        "rows": len(X),
+        "max_abs_diff": float(np.abs(cb_proba - ob_proba).max()) if len(X) else 0.0,
+        "catboost_ms": cb_time * 1000.0,
+        "numpy_ms": ob_time * 1000.0,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Export/benchmark the numpy CatBoost evaluator")
+    sub = parser.add_subparsers(dest="cmd", required=True)
+    p_export = sub.add_parser("export")
+    p_export.add_argument("cbm")
+    p_export.add_argument("npz")
+    p_bench = sub.add_parser("bench")
+    p_bench.add_argument("cbm")
+    p_bench.add_argument("npz")
+    p_bench.add_argument("csv")
+    args = parser.parse_args()
+
+    if args.cmd == "export":
+        print(f"Exported {export_model(args.cbm, args.npz)}")
+    else:
+        print(json.dumps(benchmark(args.cbm, args.npz, args.csv), indent=2))
@@ -0,0 +1,158 @@
+import csv
+import itertools
+import os
+import sys
+import time
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, Iterator, List, Optional, Sequence, Tuple
+import numpy as np
+from .encoder import DraftEncoder
+from .oblivious import ObliviousModel, load_model
+from .shared import SharedModel
+
+# columns appended to every output row; "Teams" is the side the model's positive class refers to
+TEAM_PROB_COL = "TeamsWinProb"
+OPPONENT_PROB_COL = "OpponentWinProb"
+
+
+#scores chunks of draftdatalol.csv-style rows with one model call each
+class ChunkScorer:
+    def __init__(self, cbm_path: str, npz_path: Optional[str] = None):
+        self.model, self.model_path = load_model(cbm_path, npz_path)
+        self.encoder = DraftEncoder(self.model.feature_names_)
+        self.shared: Optional[SharedModel] = None
+
+    #scorer over a model another process published with SharedModel.publish, nothing is loaded
+    @classmethod
+    def from_shared(cls, handle) -> "ChunkScorer":
+        scorer = cls.__new__(cls)
+        scorer.shared = SharedModel.attach(handle)
+        scorer.model, scorer.encoder = scorer.shared.model, scorer.shared.encoder
+        scorer.model_path = f"shared:{handle[0]}"
+        return scorer
+
+    @property
+    def columns(self) -> List[str]:
+        return self.encoder.columns
+
+    def score(self, records: Sequence[Sequence[str]]) -> np.ndarray:
+        ids = self.encoder.encode_records(records)
+        return np.asarray(self.model.predict_proba(self.encoder.to_model_input(ids)))
+
+
+# one scorer per pool process, built by _init_worker
+_WORKER: Dict[str, ChunkScorer] = {}
+
+
+def _init_worker(cbm_path: str, npz_path: Optional[str]) -> None:
+    _WORKER["scorer"] = ChunkScorer(cbm_path, npz_path)
+
+
+def _init_shared_worker(handle) -> None:
+    _WORKER["scorer"] = ChunkScorer.from_shared(handle)
+
+
+def _score_chunk(records: Sequence[Sequence[str]]) -> np.ndarray:
+    return _WORKER["scorer"].score(records)
+
+
+def _chunks(reader: csv.DictReader, columns: Sequence[str], chunk_size: int) -> Iterator[Tuple[List[dict], List[List[str]]]]:
+    while True:
+        rows = list(itertools.islice(reader, chunk_size))
+        if not rows:
+            return
+        yield rows, [[row.get(c) or "" for c in columns] for row in rows]
+
+
+#streams in_path to out_path chunk by chunk; with workers > 0 chunks are scored in a process pool,
+#at most 2 * workers chunks are in flight so memory stays bounded by chunk_size, not file size.
+#with the exported .npz model the workers attach to one shared-memory copy instead of loading their own
+def score_csv(in_path: str, out_path: str, cbm_path: str, npz_path: Optional[str] = None,
+              chunk_size: int = 4096, workers: int = 0, progress_every: int = 10) -> Dict[str, float]:
+    start = time.perf_counter()
+    scorer = ChunkScorer(cbm_path, npz_path)
+    columns = scorer.columns
+    pool = None
+    shared = None
+    if workers > 0:
+        if isinstance(scorer.model, ObliviousModel):
+            shared = SharedModel.publish(scorer.model, scorer.encoder)
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_shared_worker, initargs=(shared.handle,))
+        else:
+            pool = ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(cbm_path, npz_path))
+
+    total = 0
+    chunks = 0
+    try:
+        with open(in_path, mode='r', encoding='utf-8', newline='') as infile, \
+                open(out_path, mode='w', encoding='utf-8', newline='') as outfile:
+            reader = csv.DictReader(infile)
+            missing = [c for c in columns if c not in (reader.fieldnames or [])]
+            if missing:
+                print(f"Warning: input is missing model columns {missing}, they are scored as empty slots")
+            writer = csv.DictWriter(outfile, fieldnames=list(reader.fieldnames or []) + [TEAM_PROB_COL, OPPONENT_PROB_COL],
+                                    extrasaction='ignore')
+            writer.writeheader()
+
+            def write(rows: List[dict], proba: np.ndarray) -> None:
+                nonlocal total, chunks
+                for row, p in zip(rows, proba):
+                    row[TEAM_PROB_COL] = f"{p[1]:.6f}"
+                    row[OPPONENT_PROB_COL] = f"{p[0]:.6f}"
+                writer.writerows(rows)
+                total += len(rows)
+                chunks += 1
+                if progress_every and chunks % progress_every == 0:
+                    elapsed = time.perf_counter() - start
+                    print(f"{total} rows scored, {total / elapsed:.0f} rows/s")
+
+            if pool is None:
+                for rows, records in _chunks(reader, columns, chunk_size):
+                    write(rows, scorer.score(records))
+            else:
+                # futures complete out of order but are written in submission order
+                pending = deque()
+                for rows, records in _chunks(reader, columns, chunk_size):
+                    pending.append((rows, pool.submit(_score_chunk, records)))
+                    if len(pending) >= 2 * workers:
+                        done_rows, future = pending.popleft()
+                        write(done_rows, future.result())
+                while pending:
+                    done_rows, future = pending.popleft()
+                    write(done_rows, future.result())
+    finally:
+        if pool is not None:
+            pool.shutdown(wait=True, cancel_futures=True)
+        if shared is not None:
+            shared.unlink()
+
+    elapsed = time.perf_counter() - start
+    return {
+        "rows": total,
+        "chunks": chunks,
+        "seconds": elapsed,
+        "rows_per_sec": total / elapsed if elapsed > 0 else 0.0,
+        "model": scorer.model_path,
+    }
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Score drafts in the draftdatalol.csv column layout")
+    parser.add_argument("input", help="csv with Teams, Opponent, Ban1-10 and Pick1-10 columns")
+    parser.add_argument("output", help="input columns plus TeamsWinProb and OpponentWinProb")
+    parser.add_argument("--cbm", default="cbmodels/CatModel.cbm")
+    parser.add_argument("--npz", default="cbmodels/CatModel.npz")
+    parser.add_argument("--chunk-size", type=int, default=4096)
+    parser.add_argument("--workers", type=int, default=0, help="scoring processes, 0 scores in this process")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.input):
+        print(f"Input file '{args.input}' does not exist")
+        sys.exit(1)
+    result = score_csv(args.input, args.output, args.cbm, args.npz,
+                       chunk_size=args.chunk_size, workers=args.workers)
+    print(f"Scored {result['rows']} rows in {result['chunks']} chunks with {result['model']}: "
+          f"{result['seconds']:.2f}s, {result['rows_per_sec']:.0f} rows/s")
@@ -0,0 +1,402 @@
+import asyncio
+import ipaddress
+import json
+import math
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, unquote, urlsplit
+import numpy as np
+from ..engine.championset import ChampionTable
+from ..engine.draftengine import DraftEngine
+from ..manager.mainmanager import MainManager
+from ..search.evaluator import DraftEvaluator
+from .cache import PredictionCache
+from .encoder import FILLER, DraftEncoder
+from .explain import ShapExplainer
+from .oblivious import load_model
+
+MAX_BODY = 8 * 1024 * 1024
+REASONS = {200: "OK", 400: "Bad Request", 404: "Not Found", 405: "Method Not Allowed",
+           413: "Payload Too Large", 500: "Internal Server Error"}
+# the app's placeholder team names, known up front so they score the same as in a local model
+DEFAULT_TEAMS = ("Red Team", "Blue Team", "Red Team Players", "Blue Team Players")
+
+
+class RequestError(Exception):
+    def __init__(self, status: int, message: str):
+        super().__init__(message)
+        self.status = status
+
+
+#coalesces concurrent predict requests into single model calls
+#a request waits at most max_wait_ms for company; model calls run one at a time on their own thread,
+#so everything that arrives while the model is busy goes out together in the next call
+class MicroBatcher:
+    def __init__(self, predict_fn: Callable[[np.ndarray], Optional[np.ndarray]],
+                 max_rows: int = 4096, max_wait_ms: float = 2.0):
+        self.predict_fn = predict_fn
+        self.max_rows = max_rows
+        self.max_wait = max_wait_ms / 1000.0
+        self.requests = 0
+        self.rows = 0
+        self.calls = 0
+        self._pending: List[Tuple[np.ndarray, asyncio.Future]] = []
+        self._pending_rows = 0
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._model_thread = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model")
+
+    async def predict(self, ids: np.ndarray) -> np.ndarray:
+        loop = asyncio.get_running_loop()
+        ids = np.atleast_2d(ids)
+        future = loop.create_future()
+        self._pending.append((ids, future))
+        self._pending_rows += len(ids)
+        self.requests += 1
+        if self._pending_rows >= self.max_rows:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.max_wait, self._flush)
+        return await future
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        batch, self._pending, self._pending_rows = self._pending, [], 0
+        if batch:
+            asyncio.get_running_loop().create_task(self._run(batch))
+
+    async def _run(self, batch: List[Tuple[np.ndarray, asyncio.Future]]) -> None:
+        ids = np.vstack([b[0] for b in batch])
+        self.rows += len(ids)
+        self.calls += 1
+        try:
+            proba = await asyncio.get_running_loop().run_in_executor(self._model_thread, self.predict_fn, ids)
+            if proba is None:
+                raise RuntimeError("model prediction failed")
+            proba = np.asarray(proba)
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+        start = 0
+        for rows, future in batch:
+            if not future.done():
+                future.set_result(proba[start:start + len(rows)])
+            start += len(rows)
+
+    def stats(self) -> Dict[str, float]:
+        return {
+            "requests": self.requests,
+            "rows": self.rows,
+            "calls": self.calls,
+            "requests_per_call": round(self.requests / self.calls, 2) if self.calls else 0.0,
+        }
+
+    def close(self) -> None:
+        self._model_thread.shutdown(wait=False)
+
+
+def _finite(value: float) -> Optional[float]:
+    return None if value is None or math.isinf(value) or math.isnan(value) else round(float(value), 4)
+
+
+#hosts one warm model and one copy of the MainManager registries for every local client
+#
+#endpoints (JSON in and out), "team" is the red side and "opponent" the blue side, as in the app:
+#  GET  /health, GET /info
+#  POST /predict   {"rows": [[cell, ...], ...]}  cells in model column order -> {"proba": [[blue, red], ...]}
+#  POST /explain   {"rows": [...]} as for /predict -> {"shap": [[...], ...]}, null without catboost or the .cbm
+#  POST /winprob   {"team", "opponent", "moves": [...]} or the four draft lists -> {"blue", "red"}
+#  POST /deltas    {"team", "opponent", "moves": [...], "champions": [...]?} -> {"turn", "deltas": {name: delta}}
+#  GET  /teams, GET /teams/<name>?limit=&min_games=&exclude=a,b  (limit=0 for every champion)
+#  GET  /champions -> {"champions": [{"champion", "games", "wins"}, ...]}
+#moves are champion names in the order they were banned/picked. values the server has never seen (team
+#names, cells) are scored as filler rather than added to the shared vocab, so clients can't grow it
+class PredictionServer:
+    def __init__(self, cbm_path: str, npz_path: Optional[str] = None, csv_path: Optional[str] = None,
+                 champion_json: Optional[str] = None, max_wait_ms: float = 2.0, workers: int = 8):
+        self.model, self.model_path = load_model(cbm_path, npz_path)
+        self.encoder = DraftEncoder(self.model.feature_names_)
+        self.cache = PredictionCache(model_path=self.model_path)
+        self.batcher = MicroBatcher(self._predict_cached, max_wait_ms=max_wait_ms)
+        self.table = ChampionTable.from_json(champion_json) if champion_json else ChampionTable()
+        self.main_manager = MainManager(table=self.table)
+        if csv_path:
+            self.main_manager.load_data(csv_path, csv_path, csv_path)
+
+        # csv spellings first so the model sees names the way it was trained on them
+        names = list(self.main_manager.champion_manager.champions) + list(self.table.names)
+        self.engine = DraftEngine(names, table=self.table)
+        self.encoder.intern_many(self.engine.names.values())
+        self.encoder.intern_many(self.main_manager.team_manager.teams)
+        self.encoder.intern_many(DEFAULT_TEAMS)
+        self.explainer = ShapExplainer(cbm_path, self.encoder)
+
+        self._workers = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="request")
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.started = time.time()
+
+    def _predict_uncached(self, ids: np.ndarray) -> np.ndarray:
+        return self.model.predict_proba(self.encoder.to_model_input(ids))
+
+    def _predict_cached(self, ids: np.ndarray) -> Optional[np.ndarray]:
+        return self.cache.predict(ids, self._predict_uncached)
+
+    #blocking predict for worker threads, the rows still join the loop's micro-batches
+    def _predict_from_thread(self, ids: np.ndarray) -> np.ndarray:
+        return asyncio.run_coroutine_threadsafe(self.batcher.predict(ids), self._loop).result()
+
+    # -----------------------------
+    # request parsing
+    def _replay(self, moves) -> DraftEngine:
+        engine = self.engine.copy()
+        engine.reset()
+        for name in moves or []:
+            try:
+                engine.apply_name(str(name))
+            except ValueError as e:
+                raise RequestError(400, f"cannot apply {name!r}: {e}")
+        return engine
+
+    #the value itself if the encoder knows it, filler otherwise
+    def _known(self, value) -> str:
+        value = str(value)
+        return value if value in self.encoder.ids else FILLER
+
+    def _matchup(self, payload: dict) -> Tuple[str, str]:
+        return (self._known(payload.get("team") or "Red Team"),
+                self._known(payload.get("opponent") or "Blue Team"))
+
+    def _rows(self, payload: dict) -> np.ndarray:
+        rows = payload.get("rows")
+        if not isinstance(rows, list) or any(not isinstance(r, list) or len(r) != len(self.encoder.columns) for r in rows):
+            raise RequestError(400, f"rows must be lists of {len(self.encoder.columns)} cells")
+        return self.encoder.encode_records([[str(c) if c is not None else "" for c in r] for r in rows], intern=False)
+
+    # -----------------------------
+    # endpoints
+    async def health(self, payload, query) -> dict:
+        return {"ok": True}
+
+    async def info(self, payload, query) -> dict:
+        return {
+            "model": self.model_path,
+            "feature_names": list(self.model.feature_names_),
+            "champions": len(self.engine.names),
+            "teams": len(self.main_manager.team_manager.teams),
+            "vocab": len(self.encoder.vocab),
+            "uptime_s": round(time.time() - self.started, 1),
+            "batcher": self.batcher.stats(),
+            "cache": self.cache.stats(),
+        }
+
+    async def predict(self, payload, query) -> dict:
+        ids = self._rows(payload)
+        proba = await self.batcher.predict(ids) if len(ids) else np.empty((0, 2))
+        return {"proba": np.asarray(proba).tolist()}
+
+    async def explain(self, payload, query) -> dict:
+        ids = self._rows(payload)
+        if not len(ids):
+            return {"shap": []}
+        loop = asyncio.get_running_loop()
+        shap = await loop.run_in_executor(self._workers, self.explainer.explain, ids)
+        return {"shap": None if shap is None else np.asarray(shap).tolist()}
+
+    async def winprob(self, payload, query) -> dict:
+        team, opponent = self._matchup(payload)
+        if "moves" in payload:
+            lists = self._replay(payload["moves"]).draft_lists()
+        else:
+            lists = tuple([self._known(c) for c in payload.get(k) or []]
+                          for k in ("blue_bans", "red_bans", "blue_picks", "red_picks"))
+        proba = await self.batcher.predict(self.encoder.encode(team, opponent, *lists))
+        return {"blue": float(proba[0, 0]), "red": float(proba[0, 1])}
+
+    async def deltas(self, payload, query) -> dict:
+        team, opponent = self._matchup(payload)
+        engine = self._replay(payload.get("moves"))
+        ids = None
+        if payload.get("champions"):
+            ids = [engine.id_of(str(c)) for c in payload["champions"]]
+            ids = [c for c in ids if c is not None and engine.is_available(c)]
+        evaluator = DraftEvaluator(self.encoder, self._predict_from_thread, team, opponent)
+        loop = asyncio.get_running_loop()
+        table = await loop.run_in_executor(self._workers, evaluator.deltas, engine, ids)
+        return {
+            "turn": engine.current_turn,
+            "deltas": {engine.name_of(c): round(d, 6) for c, d in table.items()},
+        }
+
+    async def teams(self, payload, query) -> dict:
+        return {"teams": sorted(self.main_manager.team_manager.teams)}
+
+    async def champions(self, payload, query) -> dict:
+        return {"champions": [{"champion": c.name, "games": c.total_games, "wins": c.total_wins}
+                              for c in self.main_manager.champion_manager.champions.values()]}
+
+    async def team_stats(self, name: str, query) -> dict:
+        team = self.main_manager.get_team_data(name)
+        if team is None:
+            raise RequestError(404, f"unknown team {name!r}")
+        limit = int(query.get("limit", ["10"])[0])
+        min_games = int(query.get("min_games", ["1"])[0])
+        exclude = set()
+        for value in query.get("exclude", []):
+            exclude.update(self.table.id_of(n) for n in value.split(",") if n)
+
+        def rows(sort_by: str) -> List[dict]:
+            out = []
+            for cname, games, wr, kda in team.get_top_champions(limit=len(team.champion_stats), min_games=min_games, sort_by=sort_by):
+                if self.table.id_of(cname) in exclude:
+                    continue
+                out.append({"champion": cname, "games": games, "wins": team.champion_stats[cname].wins,
+                            "winrate": _finite(wr), "kda": _finite(kda)})
+            return out[:limit] if limit > 0 else out
+
+        return {
+            "team": team.name,
+            "total_games": team.total_games,
+            "total_wins": team.total_wins,
+            "kda": _finite(team.team_kda_ratio),
+            "players": [p.name for p in team.players],
+            "top_picks": rows("games"),
+            "top_winrate": rows("winrate"),
+        }
+
+    # -----------------------------
+    # http
+    async def dispatch(self, method: str, target: str, body: bytes) -> Tuple[int, dict]:
+        url = urlsplit(target)
+        path = url.path.rstrip("/") or "/"
+        query = parse_qs(url.query)
+        routes = {
+            ("GET", "/health"): self.health,
+            ("GET", "/info"): self.info,
+            ("GET", "/teams"): self.teams,
+            ("GET", "/champions"): self.champions,
+            ("POST", "/predict"): self.predict,
+            ("POST", "/explain"): self.explain,
+            ("POST", "/winprob"): self.winprob,
+            ("POST", "/deltas"): self.deltas,
+        }
+        try:
+            payload = json.loads(body) if body else {}
+            if not isinstance(payload, dict):
+                raise RequestError(400, "body must be a JSON object")
+            if method == "GET" and path.startswith("/teams/"):
+                return 200, await self.team_stats(unquote(path[len("/teams/"):]), query)
+            handler = routes.get((method, path))
+            if handler is None:
+                known = any(p == path for _, p in routes)
+                raise RequestError(405 if known else 404, f"{method} {path} is not supported")
+            return 200, await handler(payload, query)
+        except RequestError as e:
+            return e.status, {"error": str(e)}
+        except (ValueError, TypeError) as e:
+            return 400, {"error": str(e)}
+        except Exception as e:
+            print(f"Server error on {method} {path}: {e}")
+            return 500, {"error": str(e)}
+
+    async def handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                line = await reader.readline()
+                if not line.strip():
+                    break
+                parts = line.decode("latin-1").split()
+                if len(parts) < 2:
+                    break
+                method, target = parts[0].upper(), parts[1]
+                headers = {}
+                while True:
+                    header = await reader.readline()
+                    if header in (b"\r\n", b"\n", b""):
+                        break
+                    key, _, value = header.decode("latin-1").partition(":")
+                    headers[key.strip().lower()] = value.strip()
+
+                length = int(headers.get("content-length") or 0)
+                if length > MAX_BODY:
+                    status, payload = 413, {"error": f"body larger than {MAX_BODY} bytes"}
+                    keep_alive = False
+                else:
+                    body = await reader.readexactly(length) if length else b""
+                    status, payload = await self.dispatch(method, target, body)
+                    keep_alive = headers.get("connection", "").lower() != "close"
+
+                data = json.dumps(payload).encode("utf-8")
+                writer.write(
+                    f"HTTP/1.1 {status} {REASONS.get(status, '')}\r\n"
+                    f"Content-Type: application/json\r\n"
+                    f"Content-Length: {len(data)}\r\n"
+                    f"Connection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + data
+                )
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    async def serve(self, host: str = "127.0.0.1", port: int = 8765, unix_path: Optional[str] = None) -> None:
+        self._loop = asyncio.get_running_loop()
+        if unix_path:
+            if os.path.exists(unix_path):
+                os.remove(unix_path)
+            server = await asyncio.start_unix_server(self.handle, path=unix_path)
+            where = f"unix:{unix_path}"
+        else:
+            server = await asyncio.start_server(self.handle, host=host, port=port)
+            where = f"http://{host}:{port}"
+        print(f"Prediction server on {where} with {self.model_path}, "
+              f"{len(self.engine.names)} champions, {len(self.main_manager.team_manager.teams)} teams")
+        try:
+            async with server:
+                await server.serve_forever()
+        finally:
+            self.batcher.close()
+            self._workers.shutdown(wait=False)
+            if unix_path and os.path.exists(unix_path):
+                os.remove(unix_path)
+
+
+#the server never listens beyond this machine
+def is_loopback(host: str) -> bool:
+    if host == "localhost":
+        return True
+    try:
+        return ipaddress.ip_address(host).is_loopback
+    except ValueError:
+        return False
+
+
+if __name__ == "__main__":
+    import argparse
+    import sys
+
+    parser = argparse.ArgumentParser(description="Serve win probabilities, deltas and team stats to local clients")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--unix", default=None, help="listen on this unix socket instead of tcp")
+    parser.add_argument("--cbm", default="cbmodels/CatModel.cbm")
+    parser.add_argument("--npz", default="cbmodels/CatModel.npz")
+    parser.add_argument("--data", default="csvdata/lolplayerdata.csv")
+    parser.add_argument("--champions", default="csvdata/champion.json")
+    parser.add_argument("--max-wait-ms", type=float, default=2.0, help="how long a request waits to be batched")
+    args = parser.parse_args()
+
+    if not args.unix and not is_loopback(args.host):
+        print(f"Refusing to listen on {args.host}, the server is for localhost only")
+        sys.exit(1)
+    app = PredictionServer(args.cbm, args.npz, args.data, args.champions, max_wait_ms=args.max_wait_ms)
+    try:
+        asyncio.run(app.serve(args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,224 @@
+import os
+import time
+from multiprocessing import shared_memory
+from typing import Dict, List, Optional, Sequence, Tuple
+import numpy as np
+from ..engine.championset import ChampionTable
+from .encoder import DraftEncoder
+from .oblivious import ObliviousModel
+
+_ALIGN = 64
+
+# (shared memory block name, [(array name, dtype str, shape, byte offset), ...])
+Handle = Tuple[str, List[Tuple[str, str, Tuple[int, ...], int]]]
+
+
+#named numpy arrays packed into one shared memory block
+#the handle is a few hundred bytes and picklable, so a pool initializer gets the handle instead of the
+#arrays and attach() maps the same pages read-only; only the creating process should unlink()
+class SharedArrays:
+    def __init__(self, shm: shared_memory.SharedMemory, layout, owner: bool):
+        self.shm = shm
+        self.layout = layout
+        self.owner = owner
+        self.arrays: Dict[str, np.ndarray] = {}
+        for name, dtype, shape, offset in layout:
+            arr = np.ndarray(shape, dtype=np.dtype(dtype), buffer=shm.buf, offset=offset)
+            arr.flags.writeable = owner
+            self.arrays[name] = arr
+
+    @classmethod
+    def create(cls, arrays: Dict[str, np.ndarray]) -> "SharedArrays":
+        layout = []
+        size = 0
+        for name, arr in arrays.items():
+            arr = np.asarray(arr)
+            if arr.dtype.hasobject:
+                raise TypeError(f"{name}: object arrays cannot live in shared memory")
+            size = -(-size // _ALIGN) * _ALIGN
+            layout.append((name, arr.dtype.str, arr.shape, size))
+            size += arr.nbytes
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        shared = cls(shm, layout, owner=True)
+        for name, arr in arrays.items():
+            shared.arrays[name][...] = arr
+            shared.arrays[name].flags.writeable = False
+        return shared
+
+    @classmethod
+    def attach(cls, handle: Handle) -> "SharedArrays":
+        name, layout = handle
+        return cls(shared_memory.SharedMemory(name=name), layout, owner=False)
+
+    @property
+    def handle(self) -> Handle:
+        return self.shm.name, self.layout
+
+    @property
+    def nbytes(self) -> int:
+        return self.shm.size
+
+    def close(self) -> None:
+        self.arrays = {}
+        self.shm.close()
+
+    def unlink(self) -> None:
+        self.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+def _pack_strings(strings: Sequence[str]) -> Tuple[np.ndarray, np.ndarray]:
+    encoded = [s.encode("utf-8") for s in strings]
+    offsets = np.cumsum([0] + [len(b) for b in encoded]).astype(np.int64)
+    return np.frombuffer(b"".join(encoded), dtype=np.uint8).copy(), offsets
+
+
+def _unpack_strings(blob: np.ndarray, offsets: np.ndarray) -> List[str]:
+    raw = blob.tobytes()
+    return [raw[offsets[i]:offsets[i + 1]].decode("utf-8") for i in range(len(offsets) - 1)]
+
+
+#what a pool worker needs to evaluate drafts: the model arrays (exported and derived), the encoder's
+#columns and vocabulary, the champion table and optionally an encoded historical draft matrix
+#
+#publish() copies them into shared memory once in the parent; attach(handle) in a worker rebuilds the
+#model on top of the shared pages, so N workers cost one model's worth of memory and skip the load.
+#the model's arrays point into the block: keep the SharedModel alive for as long as the model is used
+class SharedModel:
+    def __init__(self, shared: SharedArrays):
+        self.shared = shared
+        arrays = shared.arrays
+        self.model = ObliviousModel.from_arrays({k[len("model/"):]: v for k, v in arrays.items() if k.startswith("model/")})
+
+        columns = _unpack_strings(arrays["encoder/columns"], arrays["encoder/column_offsets"])
+        cat_features = [columns[i] for i in arrays["encoder/cat_idx"]]
+        self.encoder = DraftEncoder(columns, cat_features)
+        # interning the vocabulary in order reproduces the parent's ids
+        self.encoder.intern_many(_unpack_strings(arrays["encoder/vocab"], arrays["encoder/vocab_offsets"]))
+
+        self.table = ChampionTable()
+        if "table/names" in arrays:
+            self.table.names = _unpack_strings(arrays["table/names"], arrays["table/name_offsets"])
+            keys = _unpack_strings(arrays["table/keys"], arrays["table/key_offsets"])
+            self.table.ids = dict(zip(keys, arrays["table/key_ids"].tolist()))
+
+        self.drafts: Optional[np.ndarray] = arrays.get("drafts")
+
+    @classmethod
+    def publish(cls, model: ObliviousModel, encoder: DraftEncoder, table: Optional[ChampionTable] = None,
+                drafts: Optional[np.ndarray] = None) -> "SharedModel":
+        arrays = {f"model/{k}": v for k, v in model.arrays().items()}
+        arrays["encoder/columns"], arrays["encoder/column_offsets"] = _pack_strings(encoder.columns)
+        arrays["encoder/cat_idx"] = np.array(encoder.cat_idx, dtype=np.int32)
+        arrays["encoder/vocab"], arrays["encoder/vocab_offsets"] = _pack_strings(list(encoder.vocab))
+        if table is not None:
+            arrays["table/names"], arrays["table/name_offsets"] = _pack_strings(table.names)
+            arrays["table/keys"], arrays["table/key_offsets"] = _pack_strings(list(table.ids))
+            arrays["table/key_ids"] = np.array(list(table.ids.values()), dtype=np.int32)
+        if drafts is not None:
+            arrays["drafts"] = np.ascontiguousarray(drafts, dtype=np.int32)
+        return cls(SharedArrays.create(arrays))
+
+    @classmethod
+    def attach(cls, handle: Handle) -> "SharedModel":
+        return cls(SharedArrays.attach(handle))
+
+    @property
+    def handle(self) -> Handle:
+        return self.shared.handle
+
+    @property
+    def nbytes(self) -> int:
+        return self.shared.nbytes
+
+    def predict_proba_ids(self, ids: np.ndarray) -> np.ndarray:
+        return self.model.predict_proba(self.encoder.to_model_input(ids))
+
+    #the block is unmapped right away, numpy does not pin it: drop the model before calling these
+    def close(self) -> None:
+        self.model = self.drafts = None
+        self.shared.close()
+
+    def unlink(self) -> None:
+        self.model = self.drafts = None
+        self.shared.unlink()
+
+
+#encoded draftdatalol.csv rows (model column order), the historical matrix SharedModel can carry
+def encode_draft_csv(encoder: DraftEncoder, csv_path: str) -> np.ndarray:
+    import csv
+
+    with open(csv_path, mode='r', encoding='utf-8', newline='') as file:
+        rows = [[row.get(c) or "" for c in encoder.columns] for row in csv.DictReader(file)]
+    return encoder.encode_records(rows)
+
+
+# -----------------------------
+# Pool startup benchmark
+# -----------------------------
+def _private_kb() -> Optional[int]:
+    # linux only: memory this process does not share with any other
+    try:
+        with open("/proc/self/smaps_rollup", "r") as f:
+            return sum(int(line.split()[1]) for line in f if line.startswith(("Private_Clean", "Private_Dirty")))
+    except OSError:
+        return None
+
+
+_BENCH: Dict[str, object] = {}
+
+
+def _bench_init_load(npz_path: str) -> None:
+    _BENCH["model"] = ObliviousModel.load(npz_path)
+
+
+def _bench_init_shared(handle: Handle) -> None:
+    _BENCH["shared"] = SharedModel.attach(handle)
+    _BENCH["model"] = _BENCH["shared"].model
+
+
+def _bench_probe(X) -> Tuple[int, Optional[int]]:
+    _BENCH["model"].predict_proba(X)
+    return os.getpid(), _private_kb()
+
+
+def benchmark_pool(npz_path: str, workers: int = 8) -> Dict[str, Dict[str, float]]:
+    from concurrent.futures import ProcessPoolExecutor
+
+    model = ObliviousModel.load(npz_path)
+    encoder = DraftEncoder(model.feature_names_)
+    X = encoder.to_model_input(encoder.template)
+    shared = SharedModel.publish(model, encoder)
+    results = {}
+    try:
+        for mode, init, arg in (("load", _bench_init_load, npz_path), ("shared", _bench_init_shared, shared.handle)):
+            start = time.perf_counter()
+            with ProcessPoolExecutor(max_workers=workers, initializer=init, initargs=(arg,)) as pool:
+                # enough probes that every worker has started and scored a row
+                probes = {}
+                while len(probes) < workers:
+                    for pid, kb in pool.map(_bench_probe, [X] * (workers * 4)):
+                        probes[pid] = kb
+                ready = time.perf_counter() - start
+            private = [kb for kb in probes.values() if kb is not None]
+            results[mode] = {
+                "startup_s": round(ready, 3),
+                "private_mb_per_worker": round(sum(private) / len(private) / 1024, 2) if private else None,
+            }
+        results["shared"]["block_mb"] = round(shared.nbytes / 1e6, 2)
+    finally:
+        shared.unlink()
+    return results
+
+
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Compare pool startup with per-worker model loads vs shared memory")
+    parser.add_argument("--npz", default="cbmodels/CatModel.npz")
+    parser.add_argument("--workers", type=int, default=8)
+    args = parser.parse_args()
+
+    for mode, stats in benchmark_pool(args.npz, args.workers).items():
+        print(mode, stats)
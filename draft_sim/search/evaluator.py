@@ -0,0 +1,115 @@
+from typing import Callable, Dict, Optional, Sequence, Tuple
+import numpy as np
+from ..engine.draftengine import BLUE, PICK, RED, DraftEngine
+from ..predict.encoder import SLOTS, DraftEncoder
+
+
+#scores draft states with the model for a fixed matchup
+#predict_fn takes an encoder id matrix and returns predict_proba output (or None on failure);
+#proba[:, 0] is blue's win chance and proba[:, 1] red's, so a side constant doubles as the column
+class DraftEvaluator:
+    def __init__(self, encoder: DraftEncoder, predict_fn: Callable[[np.ndarray], Optional[np.ndarray]],
+                 team: str, opponent: str):
+        self.encoder = encoder
+        self.predict_fn = predict_fn
+        self.team = team
+        self.opponent = opponent
+        self.rows = 0
+        self.calls = 0
+
+    def _predict(self, ids: np.ndarray) -> np.ndarray:
+        self.rows += len(ids)
+        self.calls += 1
+        proba = self.predict_fn(ids)
+        if proba is None:
+            raise RuntimeError("model prediction failed")
+        return np.asarray(proba)
+
+    #side's win chance for the engine's current state
+    def win_prob(self, engine: DraftEngine, side: int) -> float:
+        row = self.encoder.encode(self.team, self.opponent, *engine.draft_lists())
+        return float(self._predict(row[None, :])[0, side])
+
+    #one model row per champion id, each taken on the engine's current turn
+    def child_rows(self, engine: DraftEngine, champ_ids: Sequence[int]) -> np.ndarray:
+        mover, action = engine.phase()
+        return self.encoder.encode_candidates(
+            self.team, self.opponent, *engine.draft_lists(),
+            engine.names_for(champ_ids),
+            side="blue" if mover == BLUE else "red",
+            action="pick" if action == PICK else "ban",
+        )
+
+    #side's win chance for a stack of rows, in one model call
+    def probs(self, rows: np.ndarray, side: int) -> np.ndarray:
+        if not len(rows):
+            return np.empty(0)
+        return self._predict(rows)[:, side]
+
+    #side's win chance after each champion id is taken on the current turn, in one model call
+    def child_probs(self, engine: DraftEngine, champ_ids: Sequence[int], side: int) -> np.ndarray:
+        if not len(champ_ids):
+            return np.empty(0)
+        return self.probs(self.child_rows(engine, champ_ids), side)
+
+    #percentage-point change in the mover's win chance for each champion taken on the current turn
+    #base state and candidates share one model call; this is what the champion grid shows as delta
+    def deltas(self, engine: DraftEngine, champ_ids: Optional[Sequence[int]] = None) -> Dict[int, float]:
+        phase = engine.phase()
+        if phase is None:
+            return {}
+        side = phase[0]
+        champ_ids = list(engine.available_ids()) if champ_ids is None else list(champ_ids)
+        if not champ_ids:
+            return {}
+        base = self.encoder.encode(self.team, self.opponent, *engine.draft_lists())
+        proba = self._predict(np.vstack([base, self.child_rows(engine, champ_ids)]))
+        base_pct = float(proba[0, side]) * 100.0
+        return {c: float(proba[i + 1, side]) * 100.0 - base_pct for i, c in enumerate(champ_ids)}
+
+    #rows with each champion id taken as the opponent's next pick instead, None once they have no picks left
+    def deny_rows(self, engine: DraftEngine, champ_ids: Sequence[int]) -> Optional[np.ndarray]:
+        mover = engine.phase()[0]
+        opponent = RED if mover == BLUE else BLUE
+        if len(engine.picks(opponent)) >= SLOTS // 2:
+            return None
+        return self.encoder.encode_candidates(
+            self.team, self.opponent, *engine.draft_lists(),
+            engine.names_for(champ_ids),
+            side="blue" if opponent == BLUE else "red",
+            action="pick",
+        )
+
+    #(deltas, deny): deltas as in deltas(); deny is how many points each champion would add to the
+    #opponent's win chance if they picked it next, i.e. what taking or banning it keeps from them.
+    #base, mover rows and opponent rows are encoded off one draft and scored in one call, identical rows once.
+    #deny is empty when it can't be told apart from the delta: on B1 and R1 the slot encoding puts the
+    #mover's and the opponent's first pick in the same column, so deny would just be -delta
+    def dual_deltas(self, engine: DraftEngine,
+                    champ_ids: Optional[Sequence[int]] = None) -> Tuple[Dict[int, float], Dict[int, float]]:
+        phase = engine.phase()
+        if phase is None:
+            return {}, {}
+        side = phase[0]
+        champ_ids = list(engine.available_ids()) if champ_ids is None else list(champ_ids)
+        if not champ_ids:
+            return {}, {}
+        n = len(champ_ids)
+        base = self.encoder.encode(self.team, self.opponent, *engine.draft_lists())
+        parts = [base[None, :], self.child_rows(engine, champ_ids)]
+        deny_rows = self.deny_rows(engine, champ_ids)
+        if deny_rows is not None and np.array_equal(deny_rows, parts[1]):
+            deny_rows = None
+        if deny_rows is not None:
+            parts.append(deny_rows)
+        unique, inverse = np.unique(np.vstack(parts), axis=0, return_inverse=True)
+        proba = self._predict(unique)[inverse.reshape(-1)]
+
+        base_pct = float(proba[0, side]) * 100.0
+        deltas = {c: float(proba[i + 1, side]) * 100.0 - base_pct for i, c in enumerate(champ_ids)}
+        if deny_rows is None:
+            return deltas, {}
+        other = 1 - side
+        base_other = float(proba[0, other]) * 100.0
+        deny = {c: float(proba[n + i + 1, other]) * 100.0 - base_other for i, c in enumerate(champ_ids)}
+        return deltas, deny
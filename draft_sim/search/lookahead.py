@@ -0,0 +1,251 @@
+import math
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..engine.draftengine import BLUE, PHASES, PICK, RED, TOTAL_TURNS, DraftEngine
+from ..predict.encoder import SLOTS
+from .evaluator import DraftEvaluator
+from .topk import TopKRecommender
+
+
+#minimax deltas: each candidate is scored by the opponent's best reply instead of its immediate effect
+#
+#the last two plies are evaluated together: one model call scores the first chunk of replies under every
+#move, which bounds each move's value; moves are then expanded best-bound first and skipped once their
+#bound falls outside the alpha-beta window. deeper plies use plain alpha-beta on top of that.
+#moves are ordered from the point of view of the side that moves: picks by what the champion is worth
+#to the picker, bans by what it would be worth to the other side, both scored once at the root.
+#max_width keeps only the best-ordered moves at each node (None searches every available champion);
+#two-ply searches always use every reply, they are one batched call either way.
+#with a recommender that can prune (TopKRecommender over the ObliviousModel), interior nodes of deeper
+#searches keep the max_width moves that are actually best for the mover at that node instead of the
+#root's order; the replies under them still come from the root's order.
+class LookaheadSearch:
+    def __init__(self, evaluator: DraftEvaluator, max_width: Optional[int] = 24, chunk: int = 8,
+                 recommender: Optional[TopKRecommender] = None):
+        self.evaluator = evaluator
+        self.max_width = max_width
+        self.chunk = max(1, chunk)
+        self.recommender = recommender if recommender is not None and recommender.bounded else None
+        # champion ids by how much picking them is worth to each side, best first
+        self._orderings: Dict[int, List[int]] = {}
+        self.cutoffs = 0
+
+    #plies counts the candidate itself; with extend_double_picks the search keeps going while the
+    #side to move is still us, so R1/R2 and B4/B5 are answered by the opponent's next turn
+    def plies_for(self, engine: DraftEngine, depth: int, extend_double_picks: bool = True) -> int:
+        turn = engine.turn_counter
+        if turn >= TOTAL_TURNS:
+            return 0
+        side = PHASES[turn][0]
+        plies = max(1, depth)
+        if extend_double_picks and depth >= 2:
+            while turn + plies - 1 < TOTAL_TURNS and PHASES[turn + plies - 1][0] == side:
+                plies += 1
+        return min(plies, TOTAL_TURNS - turn)
+
+    def deltas(self, engine: DraftEngine, depth: int = 2,
+               extend_double_picks: bool = True) -> Tuple[Dict[int, float], Dict[str, float]]:
+        start = time.perf_counter()
+        evaluator = self.evaluator
+        rows_before, calls_before = evaluator.rows, evaluator.calls
+        self.cutoffs = 0
+
+        root = engine.copy()
+        plies = self.plies_for(root, depth, extend_double_picks)
+        stats = {"plies": plies, "nodes": 0, "calls": 0, "cutoffs": 0, "ms": 0.0}
+        if plies == 0:
+            return {}, stats
+
+        side = PHASES[root.turn_counter][0]
+        candidates = list(root.available_ids())
+        try:
+            base = evaluator.win_prob(root, side)
+            one_ply = evaluator.child_probs(root, candidates, side)
+            if plies > 2:
+                self._orderings = self._pick_orderings(root, candidates)
+
+            if plies == 1:
+                values = dict(zip(candidates, one_ply.tolist()))
+            elif plies == 2:
+                # every candidate needs an exact value, so all replies go into a single call
+                values = dict(zip(candidates, self._exact_leaf_values(root, candidates, side)))
+            else:
+                values = {}
+                for champ_id in candidates:
+                    root.apply(champ_id)
+                    values[champ_id] = self._value(root, plies - 1, -math.inf, math.inf, side)
+                    root.undo()
+        except RuntimeError as e:
+            print(f"Lookahead aborted: {e}")
+            values, base = {}, 0.0
+
+        stats.update(
+            nodes=evaluator.rows - rows_before,
+            calls=evaluator.calls - calls_before,
+            cutoffs=self.cutoffs,
+            ms=(time.perf_counter() - start) * 1000.0,
+        )
+        return {c: (v - base) * 100.0 for c, v in values.items()}, stats
+
+    #{side: champion ids, best pick for that side first}, from each side picking every candidate at the
+    #root in one model call; a side without picks left uses the other side's order
+    def _pick_orderings(self, engine: DraftEngine, candidates: List[int]) -> Dict[int, List[int]]:
+        evaluator = self.evaluator
+        names = engine.names_for(candidates)
+        sides = [s for s in (BLUE, RED) if len(engine.picks(s)) < SLOTS // 2]
+        if not sides:
+            return {BLUE: list(candidates), RED: list(candidates)}
+        rows = [evaluator.encoder.encode_candidates(
+                    evaluator.team, evaluator.opponent, *engine.draft_lists(), names,
+                    side="blue" if s == BLUE else "red", action="pick") for s in sides]
+        red = evaluator.probs(np.vstack(rows), RED)
+        orderings = {}
+        for k, s in enumerate(sides):
+            part = red[k * len(candidates):(k + 1) * len(candidates)]
+            scores = part if s == RED else 1.0 - part
+            orderings[s] = [c for _, c in sorted(zip(scores.tolist(), candidates), reverse=True)]
+        for s in (BLUE, RED):
+            orderings.setdefault(s, orderings[RED if s == BLUE else BLUE])
+        return orderings
+
+    #available moves for the side to move, most promising for that side first
+    def _moves(self, engine: DraftEngine, width: Optional[int]) -> List[int]:
+        if width is None:
+            return list(engine.available_ids())
+        mover, action = engine.phase()
+        # a pick is best when it is strong for the picker, a ban when it would be strong for the other side
+        owner = mover if action == PICK else (RED if mover == BLUE else BLUE)
+        moves = [c for c in self._orderings[owner] if engine.is_available(c)]
+        return moves[:width]
+
+    #rows for the replies under each move, stacked for one model call
+    #returns (rows, per-move reply lists, per-move row offsets); limit caps the replies scored per move,
+    #width is passed on to _moves
+    def _frontier(self, engine: DraftEngine, moves: List[int], limit: Optional[int], width: Optional[int]):
+        blocks, replies, offsets = [], [], [0]
+        for champ_id in moves:
+            engine.apply(champ_id)
+            move_replies = self._moves(engine, width)
+            scored = move_replies if limit is None else move_replies[:limit]
+            blocks.append(self.evaluator.child_rows(engine, scored) if scored else
+                          np.empty((0, len(self.evaluator.encoder.columns)), dtype=np.int32))
+            engine.undo()
+            replies.append(move_replies)
+            offsets.append(offsets[-1] + len(scored))
+        return np.vstack(blocks), replies, offsets
+
+    #exact value of each move when its replies are the last ply
+    def _exact_leaf_values(self, engine: DraftEngine, moves: List[int], side: int) -> List[float]:
+        rows, replies, offsets = self._frontier(engine, moves, None, width=None)
+        probs = self.evaluator.probs(rows, side)
+        values = []
+        for i, champ_id in enumerate(moves):
+            lo, hi = offsets[i], offsets[i + 1]
+            if lo == hi:
+                engine.apply(champ_id)
+                values.append(self.evaluator.win_prob(engine, side))
+                engine.undo()
+                continue
+            # replies are made by whoever moves after champ_id
+            reply_max = PHASES[engine.turn_counter + 1][0] == side
+            values.append(float(probs[lo:hi].max() if reply_max else probs[lo:hi].min()))
+        return values
+
+    #value of the position for side, searching plies more turns
+    def _value(self, engine: DraftEngine, plies: int, alpha: float, beta: float, side: int) -> float:
+        if engine.is_complete:
+            return self.evaluator.win_prob(engine, side)
+
+        maximizing = PHASES[engine.turn_counter][0] == side
+        if self.recommender is not None and self.max_width is not None:
+            moves = [c for c, _ in self.recommender.top_k(engine, self.max_width)[0]]
+        else:
+            moves = self._moves(engine, self.max_width)
+        if not moves:
+            return self.evaluator.win_prob(engine, side)
+
+        if plies == 1:
+            return self._leaf(engine, moves, alpha, beta, side, maximizing)
+        if plies == 2 and engine.turn_counter + 1 < TOTAL_TURNS:
+            return self._bounded(engine, moves, alpha, beta, side, maximizing)
+
+        best = -math.inf if maximizing else math.inf
+        for champ_id in moves:
+            engine.apply(champ_id)
+            value = self._value(engine, plies - 1, alpha, beta, side)
+            engine.undo()
+            if maximizing:
+                best = max(best, value)
+                alpha = max(alpha, best)
+            else:
+                best = min(best, value)
+                beta = min(beta, best)
+            if alpha >= beta:
+                self.cutoffs += 1
+                break
+        return best
+
+    #node whose children are leaves: bound every child from one batched call, then expand in bound order
+    def _bounded(self, engine: DraftEngine, moves: List[int], alpha: float, beta: float,
+                 side: int, maximizing: bool) -> float:
+        rows, replies, offsets = self._frontier(engine, moves, self.chunk, self.max_width)
+        probs = self.evaluator.probs(rows, side)
+        reply_max = PHASES[engine.turn_counter + 1][0] == side
+
+        # a partial min over replies is an upper bound on the child, a partial max a lower bound
+        children = []
+        for i, champ_id in enumerate(moves):
+            lo, hi = offsets[i], offsets[i + 1]
+            if lo == hi:
+                continue
+            bound = float(probs[lo:hi].max() if reply_max else probs[lo:hi].min())
+            children.append((bound, champ_id, replies[i]))
+        children.sort(key=lambda c: c[0], reverse=maximizing)
+
+        # the bound only prunes when it is on the far side of the window (replies by the opponent)
+        can_prune = reply_max != maximizing
+        best = -math.inf if maximizing else math.inf
+        for bound, champ_id, move_replies in children:
+            if can_prune and ((maximizing and bound <= alpha) or (not maximizing and bound >= beta)):
+                # children are sorted by bound, none of the rest can move the window either
+                self.cutoffs += 1
+                break
+            value = bound
+            if len(move_replies) > self.chunk:
+                engine.apply(champ_id)
+                value = self._leaf(engine, move_replies[self.chunk:], alpha, beta, side, reply_max, value)
+                engine.undo()
+            if maximizing:
+                best = max(best, value)
+                alpha = max(alpha, best)
+            else:
+                best = min(best, value)
+                beta = min(beta, best)
+            if alpha >= beta:
+                self.cutoffs += 1
+                break
+        if best in (math.inf, -math.inf):
+            return self.evaluator.win_prob(engine, side)
+        return best
+
+    #scores every reply in one call, or chunk by chunk when the window allows a cutoff
+    #best carries a value already known for this node (e.g. from an earlier batch)
+    def _leaf(self, engine: DraftEngine, moves: List[int], alpha: float, beta: float,
+              side: int, maximizing: bool, best: Optional[float] = None) -> float:
+        step = len(moves) if alpha == -math.inf and beta == math.inf else self.chunk
+        if best is None:
+            best = -math.inf if maximizing else math.inf
+        for i in range(0, len(moves), step):
+            probs = self.evaluator.child_probs(engine, moves[i:i + step], side)
+            if maximizing:
+                best = max(best, float(probs.max()))
+                if best >= beta:
+                    self.cutoffs += 1
+                    break
+            else:
+                best = min(best, float(probs.min()))
+                if best <= alpha:
+                    self.cutoffs += 1
+                    break
+        return best
@@ -0,0 +1,292 @@
+import math
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, Dict, List, Optional
+import numpy as np
+from ..engine.draftengine import BLUE, PHASES, TOTAL_TURNS, DraftEngine, DraftSnapshot, DraftState
+from ..predict.encoder import DraftEncoder
+from ..predict.oblivious import ObliviousModel, load_model
+from ..predict.shared import SharedModel
+
+# key: the ordered ban/pick lists (same key DeltaSpeculator uses). the encoder fills Ban1..10/Pick1..10
+# positionally, so drafts that only differ in the order a side took its champions are scored
+# differently by the model and must not share statistics
+StateKey = DraftSnapshot
+
+
+def state_key(state: DraftState) -> StateKey:
+    return state.snapshot()
+
+
+#random playouts from a snapshot to the end of the draft (or rollout_depth turns),
+#all scored with one model call; returns blue's mean win chance
+def rollout_value(engine: DraftEngine, snap: DraftSnapshot, encoder: DraftEncoder,
+                  predict_fn: Callable[[np.ndarray], Optional[np.ndarray]], team: str, opponent: str,
+                  rollouts: int, seed: int, rollout_depth: Optional[int] = None) -> float:
+    rng = random.Random(seed)
+    engine = engine.copy()
+    end = TOTAL_TURNS if rollout_depth is None else min(TOTAL_TURNS, snap.turn + rollout_depth)
+    if snap.turn >= end:
+        rollouts = 1  # nothing left to randomize
+    # rejection sampling over the whole pool: most champions stay available, so this beats
+    # listing the available bits on every turn
+    pool = [c for c in range(engine.full_mask.bit_length()) if engine.full_mask >> c & 1]
+    rows = np.empty((rollouts, len(encoder.columns)), dtype=np.int32)
+    for r in range(rollouts):
+        engine.restore(snap)
+        while engine.turn_counter < end and engine.state.available:
+            champ_id = rng.choice(pool)
+            if engine.is_available(champ_id):
+                engine.apply(champ_id)
+        encoder.encode(team, opponent, *engine.draft_lists(), out=rows[r])
+    proba = predict_fn(rows)
+    if proba is None:
+        raise RuntimeError("model prediction failed")
+    return float(np.mean(np.asarray(proba)[:, BLUE]))
+
+
+# per-process state for pooled rollouts, filled once by _init_worker
+_WORKER: Dict[str, object] = {}
+
+
+def _init_worker(engine: DraftEngine, encoder: DraftEncoder, cbm_path: str, npz_path: Optional[str]) -> None:
+    model, _ = load_model(cbm_path, npz_path)
+    _WORKER["engine"] = engine
+    _WORKER["encoder"] = encoder
+    _WORKER["predict"] = lambda ids: model.predict_proba(encoder.to_model_input(ids))
+
+
+def _init_shared_worker(engine: DraftEngine, handle) -> None:
+    shared = SharedModel.attach(handle)
+    _WORKER["shared"] = shared
+    _WORKER["engine"] = engine
+    _WORKER["encoder"] = shared.encoder
+    _WORKER["predict"] = shared.predict_proba_ids
+
+
+def _worker_rollouts(task) -> float:
+    snap, team, opponent, rollouts, seed, rollout_depth = task
+    return rollout_value(_WORKER["engine"], snap, _WORKER["encoder"], _WORKER["predict"],
+                         team, opponent, rollouts, seed, rollout_depth)
+
+
+#one search-table entry; edge stats live on the parent so each node keeps per-move counts
+class MCTSNode:
+    __slots__ = ("visits", "untried", "edges")
+
+    def __init__(self, untried: List[int]):
+        self.visits = 0
+        self.untried = untried
+        # move -> [visits, blue value sum]
+        self.edges: Dict[int, List[float]] = {}
+
+
+#time-budgeted MCTS over the 20-turn draft, values are blue win chances from the model at rollout ends
+#
+#with workers > 0 each batch of leaves is rolled out in a process pool; with the exported .npz the workers
+#attach to one shared-memory copy of the model, otherwise every worker loads its own;
+#otherwise rollouts run in-process through predict_fn, e.g. MainWindow's cached predictor.
+#the node table persists between searches, so asking again after a move reuses the subtree.
+class MCTSSearch:
+    def __init__(self, engine: DraftEngine, encoder: DraftEncoder, team: str, opponent: str,
+                 predict_fn: Optional[Callable[[np.ndarray], Optional[np.ndarray]]] = None,
+                 cbm_path: Optional[str] = None, npz_path: Optional[str] = None,
+                 workers: int = 0, batch_size: int = 8, rollouts: int = 16,
+                 rollout_depth: Optional[int] = None, exploration: float = 1.4, seed: int = 0):
+        if workers <= 0 and predict_fn is None:
+            raise ValueError("predict_fn is required when workers is 0")
+        if workers > 0 and cbm_path is None:
+            raise ValueError("cbm_path is required for pooled rollouts")
+        self.engine = engine.copy()
+        self.encoder = encoder
+        self.team = team
+        self.opponent = opponent
+        self.predict_fn = predict_fn
+        self.batch_size = max(1, batch_size) if workers > 0 else 1
+        self.rollouts = rollouts
+        self.rollout_depth = rollout_depth
+        self.exploration = exploration
+        self.rng = random.Random(seed)
+        self.table: Dict[StateKey, MCTSNode] = {}
+        self.pool = None
+        self.shared: Optional[SharedModel] = None
+        if workers > 0:
+            model, _ = load_model(cbm_path, npz_path)
+            if isinstance(model, ObliviousModel):
+                self.shared = SharedModel.publish(model, encoder)
+                initializer, initargs = _init_shared_worker, (self.engine.copy(), self.shared.handle)
+            else:
+                initializer, initargs = _init_worker, (self.engine.copy(), encoder, cbm_path, npz_path)
+            self.pool = ProcessPoolExecutor(max_workers=workers, initializer=initializer, initargs=initargs)
+
+    def close(self) -> None:
+        if self.pool is not None:
+            self.pool.shutdown(wait=True, cancel_futures=True)
+            self.pool = None
+        if self.shared is not None:
+            self.shared.unlink()
+            self.shared = None
+
+    def clear(self) -> None:
+        self.table.clear()
+
+    def _node(self, engine: DraftEngine) -> MCTSNode:
+        key = state_key(engine.state)
+        node = self.table.get(key)
+        if node is None:
+            untried = list(engine.available_ids()) if not engine.is_complete else []
+            self.rng.shuffle(untried)
+            node = MCTSNode(untried)
+            self.table[key] = node
+        return node
+
+    def _select_move(self, node: MCTSNode, mover: int) -> int:
+        log_n = math.log(max(1, node.visits))
+        best, best_score = -1, -math.inf
+        for move, (n, w) in node.edges.items():
+            q = w / n if n else 0.5
+            if mover != BLUE:
+                q = 1.0 - q
+            score = q + self.exploration * math.sqrt(log_n / n) if n else math.inf
+            if score > best_score:
+                best, best_score = move, score
+        return best
+
+    #walks down from the root, expanding one untried move; returns (leaf snapshot, path of (node, move, mover))
+    def _descend(self, engine: DraftEngine):
+        path = []
+        while not engine.is_complete:
+            node = self._node(engine)
+            mover = PHASES[engine.turn_counter][0]
+            if node.untried:
+                move = node.untried.pop()
+                node.edges[move] = [0, 0.0]
+                path.append((node, move, mover))
+                engine.apply(move)
+                break
+            if not node.edges:
+                break
+            move = self._select_move(node, mover)
+            path.append((node, move, mover))
+            engine.apply(move)
+        return engine.snapshot(), path
+
+    #virtual loss keeps the other leaves of a batch from walking the same path:
+    #a pending visit counts as a loss for whoever made the move
+    def _apply_virtual_loss(self, path, sign: int) -> None:
+        for node, move, mover in path:
+            edge = node.edges[move]
+            edge[0] += sign
+            if mover != BLUE:
+                edge[1] += sign
+            node.visits += sign
+
+    def _backup(self, path, value: float) -> None:
+        for node, move, _ in path:
+            edge = node.edges[move]
+            edge[0] += 1
+            edge[1] += value
+            node.visits += 1
+
+    def _evaluate(self, snaps: List[DraftSnapshot]) -> List[float]:
+        seeds = [self.rng.randrange(1 << 30) for _ in snaps]
+        if self.pool is not None:
+            tasks = [(s, self.team, self.opponent, self.rollouts, seed, self.rollout_depth)
+                     for s, seed in zip(snaps, seeds)]
+            return list(self.pool.map(_worker_rollouts, tasks))
+        return [rollout_value(self.engine, s, self.encoder, self.predict_fn, self.team, self.opponent,
+                              self.rollouts, seed, self.rollout_depth) for s, seed in zip(snaps, seeds)]
+
+    #runs until budget_ms has passed; candidates are the root's moves with visit counts and the
+    #mover's estimated win chance, best (most visited) first
+    def search(self, state: DraftSnapshot, budget_ms: float) -> Dict[str, object]:
+        start = time.perf_counter()
+        deadline = start + budget_ms / 1000.0
+        self.engine.restore(state)
+        if self.engine.is_complete:
+            return {"candidates": [], "iterations": 0, "rollouts": 0, "tt_size": len(self.table), "ms": 0.0}
+        root_mover = PHASES[state.turn][0]
+
+        iterations = 0
+        while True:
+            batch = []
+            for _ in range(self.batch_size):
+                self.engine.restore(state)
+                snap, path = self._descend(self.engine)
+                if not path:
+                    break
+                self._apply_virtual_loss(path, 1)
+                batch.append((snap, path))
+            if not batch:
+                break
+            try:
+                values = self._evaluate([snap for snap, _ in batch])
+            except RuntimeError as e:
+                print(f"MCTS aborted: {e}")
+                for _, path in batch:
+                    self._apply_virtual_loss(path, -1)
+                break
+            for (_, path), value in zip(batch, values):
+                self._apply_virtual_loss(path, -1)
+                self._backup(path, value)
+            iterations += len(batch)
+            if time.perf_counter() >= deadline:
+                break
+
+        self.engine.restore(state)
+        root = self._node(self.engine)
+        candidates = []
+        for move, (n, w) in root.edges.items():
+            if n <= 0:
+                continue
+            value = w / n if root_mover == BLUE else 1.0 - w / n
+            candidates.append({"champion_id": move, "name": self.engine.name_of(move),
+                               "visits": int(n), "value": value})
+        candidates.sort(key=lambda c: (c["visits"], c["value"]), reverse=True)
+        return {
+            "candidates": candidates,
+            "iterations": iterations,
+            "rollouts": iterations * self.rollouts,
+            "tt_size": len(self.table),
+            "ms": (time.perf_counter() - start) * 1000.0,
+        }
+
+
+if __name__ == "__main__":
+    import argparse
+    import os
+
+    parser = argparse.ArgumentParser(description="Ask MCTS for the best move in a draft")
+    parser.add_argument("--cbm", default="cbmodels/CatModel.cbm")
+    parser.add_argument("--npz", default="cbmodels/CatModel.npz")
+    parser.add_argument("--champions", default="csvdata/champion.json")
+    parser.add_argument("--team", default="Red Team Players", help="red side team name")
+    parser.add_argument("--opponent", default="Blue Team Players", help="blue side team name")
+    parser.add_argument("--moves", default="", help="comma separated champions taken so far, in turn order")
+    parser.add_argument("--budget-ms", type=float, default=2000.0)
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--top", type=int, default=10)
+    args = parser.parse_args()
+
+    from ..engine.championset import ChampionTable
+
+    table = ChampionTable.from_json(args.champions)
+    engine = DraftEngine(table.names, table=table)
+    for name in filter(None, (m.strip() for m in args.moves.split(","))):
+        engine.apply_name(name)
+
+    model, _ = load_model(args.cbm, args.npz)
+    encoder = DraftEncoder(model.feature_names_)
+    predict = lambda ids: model.predict_proba(encoder.to_model_input(ids))
+
+    mcts = MCTSSearch(engine, encoder, args.team, args.opponent, predict_fn=predict,
+                      cbm_path=args.cbm, npz_path=args.npz, workers=args.workers)
+    try:
+        result = mcts.search(engine.snapshot(), args.budget_ms)
+    finally:
+        mcts.close()
+    print(f"{engine.current_turn}: {result['iterations']} iterations, {result['rollouts']} rollouts, "
+          f"{result['tt_size']} states in {result['ms']:.0f} ms")
+    for c in result["candidates"][:args.top]:
+        print(f"  {c['name']:<16} visits {c['visits']:>5}  win {c['value'] * 100:.1f}%")
@@ -0,0 +1,99 @@
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+import numpy as np
+from ..engine.draftengine import BLUE, PHASES, PICK, TOTAL_TURNS, DraftEngine
+from .evaluator import DraftEvaluator
+
+
+#one scored double pick; first is the champion to lock in now, second the one right after it
+class PairPick(NamedTuple):
+    first: int
+    second: int
+    delta: float      # change in the mover's win chance with both locked in in this order, percentage points
+    synergy: float    # delta minus the two champions' single-pick deltas
+
+
+#true on the first turn of R1/R2, B2/B3 and B4/B5: the side to move also owns the next pick
+def is_double_pick(engine: DraftEngine) -> bool:
+    turn = engine.turn_counter
+    if turn + 1 >= TOTAL_TURNS:
+        return False
+    side, action, _ = PHASES[turn]
+    next_side, next_action, _ = PHASES[turn + 1]
+    return action == PICK and next_action == PICK and side == next_side
+
+
+#scores both champions of a double pick together instead of one at a time
+#
+#every pair of available champions is scored in both orders: the encoder fills Pick1..10 positionally, so
+#locking in a then b is a different model input from b then a. a pair is ranked by its better order, which
+#is also the order it is shown to be locked in. rows are built in one go and scored in batches of
+#batch_size, ~28k rows for a full pool.
+class PairOptimizer:
+    def __init__(self, evaluator: DraftEvaluator, batch_size: int = 4096):
+        self.evaluator = evaluator
+        self.batch_size = max(1, batch_size)
+
+    #top k pairs for the side to move, best joint delta first, plus search stats
+    def top_pairs(self, engine: DraftEngine, k: int = 10,
+                  candidates: Optional[List[int]] = None) -> Tuple[List[PairPick], Dict[str, float]]:
+        start = time.perf_counter()
+        evaluator = self.evaluator
+        rows_before, calls_before = evaluator.rows, evaluator.calls
+        stats = {"candidates": 0, "pairs": 0, "calls": 0, "rows": 0, "ms": 0.0}
+        if not is_double_pick(engine):
+            stats["ms"] = (time.perf_counter() - start) * 1000.0
+            return [], stats
+
+        side = engine.phase()[0]
+        ids = list(engine.available_ids()) if candidates is None else list(candidates)
+        n = len(ids)
+        stats["candidates"] = n
+        if n < 2 or k <= 0:
+            stats["ms"] = (time.perf_counter() - start) * 1000.0
+            return [], stats
+
+        # single-pick deltas (base row in the same call), only used for the synergy figure
+        singles = evaluator.deltas(engine, ids)
+        single = np.array([singles[c] for c in ids])
+        i, j = np.triu_indices(n, k=1)
+        # (i, j) orders first, then the same pairs as (j, i)
+        first, second = np.concatenate([i, j]), np.concatenate([j, i])
+
+        names = engine.names_for(ids)
+        team, opponent = evaluator.team, evaluator.opponent
+        rows = evaluator.encoder.encode_pairs(
+            team, opponent, *engine.draft_lists(),
+            [names[x] for x in first], [names[x] for x in second],
+            side="blue" if side == BLUE else "red", action="pick",
+        )
+        base = evaluator.encoder.encode(team, opponent, *engine.draft_lists())
+        probs = np.empty(len(rows))
+        base_prob = None
+        for lo in range(0, len(rows), self.batch_size):
+            chunk = rows[lo:lo + self.batch_size]
+            if base_prob is None:
+                # the base state rides along with the first batch
+                out = evaluator.probs(np.vstack([base, chunk]), side)
+                base_prob, probs[lo:lo + len(chunk)] = out[0], out[1:]
+            else:
+                probs[lo:lo + len(chunk)] = evaluator.probs(chunk, side)
+
+        gains = probs * 100.0 - base_prob * 100.0
+        # better order of each pair, as an index into first/second
+        m = len(i)
+        better = np.arange(m) + np.where(gains[m:] > gains[:m], m, 0)
+        pair_gains = gains[better]
+        k = min(k, m)
+        top = np.argpartition(-pair_gains, k - 1)[:k]
+        top = better[top[np.argsort(-pair_gains[top], kind="stable")]]
+        pairs = [PairPick(ids[first[t]], ids[second[t]], float(gains[t]),
+                          float(gains[t] - single[first[t]] - single[second[t]])) for t in top]
+
+        stats.update(
+            pairs=m,
+            calls=evaluator.calls - calls_before,
+            rows=evaluator.rows - rows_before,
+            ms=(time.perf_counter() - start) * 1000.0,
+        )
+        return pairs, stats
@@ -0,0 +1,120 @@
+import time
+from collections import OrderedDict
+from typing import Hashable, List, NamedTuple, Optional, Tuple
+import numpy as np
+from ..engine.draftengine import BAN, BLUE, PHASES, TURN_SEQUENCE, DraftEngine
+from ..predict.encoder import SLOTS
+from .evaluator import DraftEvaluator
+
+
+#counterfactual table for one draft: values[t, j] is how many points the side that made turn t would
+#have gained had it taken champions[j] instead of moves[t]; NaN where champions[j] is used elsewhere
+#in the draft, 0 for the champion actually taken
+class SlotSensitivity(NamedTuple):
+    turns: List[str]          # TURN_SEQUENCE entries for the turns played
+    moves: List[int]          # champion id taken on each turn
+    champions: List[int]      # column ids, in engine pool order
+    values: np.ndarray        # (turns, champions) percentage points, mover's perspective
+    win_prob: Tuple[float, float]  # (blue, red) win chance of the actual draft
+    ms: float
+
+
+#model column each played turn wrote to: ban/pick slots are filled blue first, then red
+def _turn_columns(evaluator: DraftEvaluator, engine: DraftEngine) -> List[int]:
+    encoder = evaluator.encoder
+    lists = engine.state.lists
+    seen = [0, 0, 0, 0]
+    cols = []
+    for turn in range(engine.turn_counter):
+        side, action, index = PHASES[turn]
+        k = seen[index]
+        seen[index] += 1
+        slot = k if side == BLUE else len(lists[index - 2]) + k
+        slot_cols = encoder.ban_cols if action == BAN else encoder.pick_cols
+        cols.append(slot_cols[slot] if slot < SLOTS else -1)
+    return cols
+
+
+#every turn of a draft re-played with every other legal champion, scored in one model call
+#results are kept per (teams, draft) so reopening the same review is a dictionary lookup
+class SensitivityAnalyzer:
+    def __init__(self, evaluator: DraftEvaluator, max_cached: int = 32):
+        self.evaluator = evaluator
+        self.max_cached = max_cached
+        self._cache: "OrderedDict[Hashable, SlotSensitivity]" = OrderedDict()
+
+    def key(self, engine: DraftEngine) -> Hashable:
+        return (self.evaluator.team, self.evaluator.opponent, engine.snapshot())
+
+    def cached(self, engine: DraftEngine) -> Optional[SlotSensitivity]:
+        return self._cache.get(self.key(engine))
+
+    #drop every table, e.g. after the model was replaced
+    def clear(self) -> None:
+        self._cache.clear()
+
+    def analyze(self, engine: DraftEngine) -> SlotSensitivity:
+        key = self.key(engine)
+        result = self._cache.get(key)
+        if result is not None:
+            self._cache.move_to_end(key)
+            return result
+
+        start = time.perf_counter()
+        evaluator = self.evaluator
+        encoder = evaluator.encoder
+        moves = list(engine.state.history)
+        champions = list(engine.names)
+        turns = len(moves)
+        n = len(champions)
+
+        base = encoder.encode(evaluator.team, evaluator.opponent, *engine.draft_lists())
+        champ_codes = np.array(encoder.intern_many(engine.names_for(champions)), dtype=base.dtype)
+        cols = np.array(_turn_columns(evaluator, engine), dtype=np.int64)
+
+        # a replacement is legal if no other turn of the draft took that champion
+        used = np.isin(np.array(champions), np.array(moves))
+        legal = np.repeat(~used[None, :], turns, axis=0)
+        position = {c: j for j, c in enumerate(champions)}
+        for t, c in enumerate(moves):
+            legal[t, position[c]] = False
+        legal &= (cols >= 0)[:, None]
+
+        # one row per legal (turn, champion): the final draft with that turn's slot overwritten
+        t_idx, j_idx = np.nonzero(legal)
+        rows = np.repeat(base[None, :], len(t_idx) + 1, axis=0)
+        rows[1 + np.arange(len(t_idx)), cols[t_idx]] = champ_codes[j_idx]
+
+        red = evaluator.probs(rows, 1)
+        movers = np.array([PHASES[t][0] for t in range(turns)], dtype=np.int64)
+        # proba[:, 1] is red's chance; flip it for turns blue made
+        sign = np.where(movers == BLUE, -1.0, 1.0)
+        values = np.full((turns, n), np.nan)
+        values[t_idx, j_idx] = (red[1:] - red[0]) * 100.0 * sign[t_idx]
+        for t, c in enumerate(moves):
+            values[t, position[c]] = 0.0
+
+        result = SlotSensitivity(
+            turns=list(TURN_SEQUENCE[:turns]),
+            moves=moves,
+            champions=champions,
+            values=values,
+            win_prob=(1.0 - float(red[0]), float(red[0])),
+            ms=(time.perf_counter() - start) * 1000.0,
+        )
+        self._cache[key] = result
+        while len(self._cache) > self.max_cached:
+            self._cache.popitem(last=False)
+        return result
+
+    #best alternative per turn: (turn index, champion id, points gained), largest gain first
+    @staticmethod
+    def regrets(result: SlotSensitivity) -> List[Tuple[int, int, float]]:
+        out = []
+        for t in range(len(result.moves)):
+            row = result.values[t]
+            if np.all(np.isnan(row)):
+                continue
+            j = int(np.nanargmax(row))
+            out.append((t, result.champions[j], float(row[j])))
+        return sorted(out, key=lambda r: r[2], reverse=True)
@@ -0,0 +1,127 @@
+import queue
+import threading
+from collections import OrderedDict
+from typing import Dict, Hashable, Iterable, List, Optional, Tuple
+from ..engine.draftengine import DraftEngine
+from .evaluator import DraftEvaluator
+
+
+#precomputes delta tables for the states a click is most likely to lead to, on a background thread
+#
+#every schedule() bumps the generation; queued work from an older generation is dropped without running,
+#so speculation for a position stops as soon as the real draft moves somewhere else.
+#the evaluator's predict_fn should go through the shared PredictionCache so the rows are warm there too.
+#tables are (deltas, deny) pairs as returned by DraftEvaluator.dual_deltas
+class DeltaSpeculator:
+    def __init__(self, max_tables: int = 64):
+        self.max_tables = max_tables
+        self.tables: "OrderedDict[Hashable, Tuple[Dict[int, float], Dict[int, float]]]" = OrderedDict()
+        self.generation = 0
+        self.computed = 0
+        self.cancelled = 0
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._queue: "queue.Queue[tuple]" = queue.Queue()
+        self._thread: Optional[threading.Thread] = None
+
+    @staticmethod
+    def key(evaluator: DraftEvaluator, engine: DraftEngine) -> Hashable:
+        return (evaluator.team, evaluator.opponent, engine.snapshot())
+
+    #(deltas, deny) for the engine's current state if it was precomputed, else None
+    def lookup(self, evaluator: DraftEvaluator, engine: DraftEngine) -> Optional[Tuple[Dict[int, float], Dict[int, float]]]:
+        key = self.key(evaluator, engine)
+        with self._lock:
+            table = self.tables.get(key)
+            if table is None:
+                self.misses += 1
+                return None
+            self.tables.move_to_end(key)
+            self.hits += 1
+            return table
+
+    #drops queued work and starts speculating on candidates taken from the engine's current state
+    def schedule(self, evaluator: DraftEvaluator, engine: DraftEngine, candidates: Iterable[int]) -> int:
+        base = engine.copy()
+        with self._lock:
+            self.generation += 1
+            generation = self.generation
+        for champ_id in candidates:
+            self._queue.put((generation, evaluator, base, champ_id))
+        self._ensure_thread()
+        return generation
+
+    def cancel(self) -> None:
+        with self._lock:
+            self.generation += 1
+
+    def clear(self) -> None:
+        self.cancel()
+        with self._lock:
+            self.tables.clear()
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                "tables": len(self.tables),
+                "computed": self.computed,
+                "cancelled": self.cancelled,
+                "hits": self.hits,
+                "misses": self.misses,
+                "generation": self.generation,
+            }
+
+    def _ensure_thread(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name="delta-speculation", daemon=True)
+            self._thread.start()
+
+    def _current(self, generation: int) -> bool:
+        with self._lock:
+            return generation == self.generation
+
+    def _run(self) -> None:
+        while True:
+            generation, evaluator, base, champ_id = self._queue.get()
+            if not self._current(generation):
+                self.cancelled += 1
+                continue
+
+            child = base.copy()
+            if not child.is_available(champ_id) or child.is_complete:
+                continue
+            child.apply(champ_id)
+            key = self.key(evaluator, child)
+            with self._lock:
+                if key in self.tables:
+                    continue
+            try:
+                table = evaluator.dual_deltas(child)
+            except Exception as e:
+                print(f"Speculative delta failed: {e}")
+                continue
+
+            with self._lock:
+                # a table finished after the draft moved on is still correct, keep it
+                self.tables[key] = table
+                self.tables.move_to_end(key)
+                while len(self.tables) > self.max_tables:
+                    self.tables.popitem(last=False)
+                self.computed += 1
+
+
+#likely next actions: the top_delta best champions by current delta, then the side's most played
+#champions from history (team_counts: champion id -> games), without duplicates
+def likely_moves(deltas: Dict[int, float], team_counts: Optional[Dict[int, int]] = None,
+                 top_delta: int = 6, top_history: int = 4) -> List[int]:
+    moves: List[int] = [c for c, _ in sorted(deltas.items(), key=lambda kv: kv[1], reverse=True)[:top_delta]]
+    if team_counts:
+        added = 0
+        for champ_id, _ in sorted(team_counts.items(), key=lambda kv: kv[1], reverse=True):
+            if added >= top_history:
+                break
+            if champ_id in deltas and champ_id not in moves:
+                moves.append(champ_id)
+                added += 1
+    return moves
@@ -0,0 +1,136 @@
+import time
+from typing import Dict, List, Optional, Tuple
+import numpy as np
+from ..engine.draftengine import RED, DraftEngine
+from ..predict.oblivious import ObliviousModel
+from .evaluator import DraftEvaluator
+
+# bounds and exact scores sum the same leaves in a different order
+_EPS = 1e-9
+
+
+def _sigmoid(x: np.ndarray) -> np.ndarray:
+    return 1.0 / (1.0 + np.exp(-x))
+
+
+#best K champions for the side to move without sending every available one through the model
+#
+#a candidate only changes the slot column it is placed in, so every tree that never reads that column
+#lands in the same leaf for all of them. ObliviousModel.predict_raw_column works those trees out once
+#for the draft and, per candidate, only the ctrs (single-column and combination) that read the column,
+#with the other slots of each combination taken from the draft as it stands. that resolves every split,
+#so the bounds are the candidates' scores padded by rounding; anything whose bound can't reach the K-th
+#best is dropped, and only the survivors are scored through the evaluator, best bound first, chunk by
+#chunk, until the rest can at most tie the K-th. the returned deltas are the evaluator's, the same
+#numbers DraftEvaluator.deltas gives; among exact ties any of them may be returned.
+#when ties leave too many survivors (loose_ratio), or the model isn't an ObliviousModel with the
+#encoder's columns, everything is scored in one call instead. on the shipped model the column pass
+#takes about half as long as scoring every candidate, and top_k prunes all but K (plus ties).
+class TopKRecommender:
+    def __init__(self, evaluator: DraftEvaluator, model: Optional[ObliviousModel] = None,
+                 chunk: int = 16, loose_ratio: float = 0.6):
+        self.evaluator = evaluator
+        self.chunk = max(1, chunk)
+        self.loose_ratio = loose_ratio
+        # bounds need the tree arrays; catboost models (or a mismatched column order) always score everything
+        usable = isinstance(model, ObliviousModel) and list(model.feature_names_) == list(evaluator.encoder.columns)
+        self.model = model if usable else None
+        if self.model is not None:
+            self._cat_index = {int(col): i for i, col in enumerate(self.model.cat_cols)}
+
+    #True when top_k can prune, False when it always scores every candidate
+    @property
+    def bounded(self) -> bool:
+        return self.model is not None
+
+    #mover's win chance bounds for each candidate row; None when the candidates differ from each other in
+    #more than one column. the rest of each row may differ from the current draft: a blue candidate
+    #shifts red's entries one slot along, but the same way for every candidate, so the first candidate
+    #row stands in for the draft
+    def bounds(self, rows: np.ndarray, side: int) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        if self.model is None or not len(rows):
+            return None
+        changed = np.nonzero((rows != rows[0][None, :]).any(axis=0))[0]
+        if len(changed) > 1:
+            return None
+        col = int(changed[0]) if len(changed) else int(self.model.cat_cols[0])
+        cat = self._cat_index.get(col)
+        if cat is None:
+            return None
+        encoder = self.evaluator.encoder
+        raw = self.model.predict_raw_column(encoder.to_model_input(rows[:1]), cat, encoder.values[rows[:, col]])
+        # proba[:, 1] is red's chance
+        probs = _sigmoid(raw) if side == RED else 1.0 - _sigmoid(raw)
+        return probs - _EPS, probs + _EPS
+
+    #top k (champion id, delta in percentage points) for the side to move, best first, plus search stats
+    def top_k(self, engine: DraftEngine, k: int) -> Tuple[List[Tuple[int, float]], Dict[str, float]]:
+        start = time.perf_counter()
+        evaluator = self.evaluator
+        rows_before, calls_before = evaluator.rows, evaluator.calls
+        stats = {"candidates": 0, "evaluated": 0, "pruned": 0, "bounded_out": 0, "exhaustive": False,
+                 "calls": 0, "rows": 0, "ms": 0.0}
+        phase = engine.phase()
+        ids = list(engine.available_ids())
+        if phase is None or not ids or k <= 0:
+            stats["ms"] = (time.perf_counter() - start) * 1000.0
+            return [], stats
+        side = phase[0]
+        n = len(ids)
+        stats["candidates"] = n
+
+        base_row = evaluator.encoder.encode(evaluator.team, evaluator.opponent, *engine.draft_lists())
+        rows = evaluator.child_rows(engine, ids)
+        bounds = self.bounds(rows, side) if k < n else None
+
+        exact: Dict[int, float] = {}
+        base: List[float] = []
+
+        # the base state rides along with the first scored chunk, as in DraftEvaluator.deltas
+        def score(chunk):
+            stack = rows[chunk] if base else np.vstack([base_row, rows[chunk]])
+            probs = evaluator.probs(stack, side).tolist()
+            if not base:
+                base.append(probs.pop(0))
+            for i, p in zip(chunk, probs):
+                exact[i] = p
+
+        if bounds is None:
+            order = list(range(n))
+        else:
+            lower, upper = bounds
+            # anything whose best case is below the K-th best worst case can never make it
+            kth_lower = np.partition(lower, n - k)[n - k]
+            alive = np.nonzero(upper >= kth_lower - _EPS)[0]
+            stats["bounded_out"] = n - len(alive)
+            order = alive[np.argsort(-upper[alive], kind="stable")].tolist()
+            # loose bounds leave many candidates that could still beat the K-th best worst case, scoring
+            # them chunk by chunk would cost more than one call
+            if np.count_nonzero(upper > kth_lower + 2 * _EPS) > self.loose_ratio * n:
+                bounds = None
+
+        if bounds is None:
+            stats["exhaustive"] = True
+            score(order)
+        else:
+            upper = bounds[1]
+            pos = 0
+            while pos < len(order):
+                if len(exact) >= k:
+                    # the rest can at best tie the K-th, to rounding
+                    kth = sorted(exact.values(), reverse=True)[k - 1]
+                    if upper[order[pos]] <= kth + 2 * _EPS:
+                        break
+                # the first chunk is the k best bounds, which settles it unless there are ties
+                chunk = order[pos:pos + (k if pos == 0 else self.chunk)]
+                score(chunk)
+                pos += len(chunk)
+
+        best = sorted(exact.items(), key=lambda kv: kv[1], reverse=True)[:k]
+        stats["evaluated"] = len(exact)
+        stats["pruned"] = n - len(exact)
+        stats["calls"] = evaluator.calls - calls_before
+        stats["rows"] = evaluator.rows - rows_before
+        stats["ms"] = (time.perf_counter() - start) * 1000.0
+        base_pct = base[0] * 100.0
+        return [(ids[i], p * 100.0 - base_pct) for i, p in best], stats
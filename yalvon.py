@@ -4,12 +4,26 @@ import os
 import util
 import traceback
 import random
-import pandas as pd
-from catboost import CatBoostClassifier, Pool
+import numpy as np
+from types import SimpleNamespace
 from PyQt5.QtGui import QPixmap, QFont, QColor, QPainter
-from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QObject, QThread
+from PyQt5.QtCore import Qt, pyqtSignal, QTimer, QObject, QThread, QRunnable, QThreadPool
 from PyQt5.QtWidgets import *
 from draft_sim.manager.mainmanager import MainManager
+from draft_sim.manager.remote import RemoteManager
+from draft_sim.engine.championset import ChampionTable
+from draft_sim.engine.draftengine import DraftEngine
+from draft_sim.predict.encoder import DraftEncoder
+from draft_sim.predict.cache import PredictionCache
+from draft_sim.predict.oblivious import load_model
+from draft_sim.predict.client import PredictionClient
+from draft_sim.predict.explain import ShapExplainer
+from draft_sim.search.evaluator import DraftEvaluator
+from draft_sim.search.lookahead import LookaheadSearch
+from draft_sim.search.pairs import PairOptimizer, is_double_pick
+from draft_sim.search.sensitivity import SensitivityAnalyzer
+from draft_sim.search.speculate import DeltaSpeculator, likely_moves
+from draft_sim.search.topk import TopKRecommender
 from google import genai
 from dotenv import load_dotenv
 from AI.GeminiManager import GeminiManager
@@ -23,8 +37,10 @@ def resource_path(relative_path:str) -> str:
     return os.path.join(base, relative_path)
 
 model_path = resource_path("cbmodels/CatModel.cbm")
+npz_model_path = resource_path("cbmodels/CatModel.npz")
 csv_path = resource_path("csvdata/lolplayerdata.csv")
 draftdata_path = resource_path("csvdata/draftdatalol.csv")
+champion_json_path = resource_path("csvdata/champion.json")
 images_path = resource_path("images")
 
 load_dotenv()
@@ -45,6 +61,10 @@ class ChampionTile(QWidget):
         self.banned = False
         self.picked = False
         self.delta_winrate = 0.0
+        # how much the opponent would gain by picking this champion next; None when it can't apply
+        self.deny_winrate = None
+        # True while the shown delta belongs to an earlier draft state and a fresh one is being computed
+        self.delta_stale = False
 
         # Allow a bit of horizontal flexibility
         self.setMinimumWidth(size + 8)
@@ -132,6 +152,15 @@ class ChampionTile(QWidget):
         """)
         card_layout.addWidget(self.delta_label, 0, Qt.AlignHCenter)
 
+        # Deny value (opponent's gain if left open)
+        self.deny_label = QLabel("")
+        self.deny_label.setAlignment(Qt.AlignCenter)
+        self.deny_label.setFixedHeight(18)
+        self.deny_label.setMinimumWidth(48)
+        self.deny_label.setToolTip("Deny value: how much the opponent's win chance would rise if they picked this champion next\n"
+                                   "(not shown on the first pick of each side, where the model can't tell it apart from the delta)")
+        card_layout.addWidget(self.deny_label, 0, Qt.AlignHCenter)
+
         root.addWidget(card, 0, Qt.AlignHCenter)
 
         self.load_image()
@@ -180,6 +209,8 @@ class ChampionTile(QWidget):
         else:
             text = f"{self.delta_winrate:+.1f}%"
             color = "#4EDF4E" if self.delta_winrate > 0 else "#CE4242"
+            if self.delta_stale:
+                color = "#7a7a7a"
             self.delta_label.setText(text)
             self.delta_label.setStyleSheet(f"""
                 QLabel {{
@@ -194,11 +225,40 @@ class ChampionTile(QWidget):
             """)
             self.delta_label.show()
 
-    def set_delta_winrate(self, delta: float):
+        deny = self.deny_winrate
+        if self.banned or self.picked or deny is None or abs(deny) < 0.01:
+            text, color = "deny -", "#9a9a9a"
+        else:
+            text = f"deny {deny:+.1f}%"
+            # a champion that helps the opponent a lot is worth taking away from them
+            color = "#e0a030" if deny > 0 else "#9a9a9a"
+        if self.delta_stale:
+            color = "#7a7a7a"
+        self.deny_label.setText(text)
+        self.deny_label.setStyleSheet(f"""
+            QLabel {{
+                background-color: rgba(0, 0, 0, 0.65);
+                color: {color};
+                font-size: 9px;
+                font-weight: 600;
+                border-radius: 6px;
+                padding: 1px 6px;
+                border: 1px solid rgba(255, 255, 255, 0.10);
+            }}
+        """)
+
+    def set_delta_winrate(self, delta: float, deny=None):
         self.delta_winrate = delta
+        self.deny_winrate = deny
+        self.delta_stale = False
         self.update_delta_display()
         self.update_style()
 
+    def set_delta_stale(self, stale: bool):
+        if self.delta_stale != stale:
+            self.delta_stale = stale
+            self.update_style()
+
     def set_general_wr_colored(self, wr_text: str):
         color = "#f7f7f7"
         try:
@@ -250,7 +310,9 @@ class ChampionTile(QWidget):
             """)
         else:
             border_color = "#3a3a3a"
-            if self.delta_winrate > 0.0:
+            if self.delta_stale:
+                border_color = "#4a4a4a"
+            elif self.delta_winrate > 0.0:
                 border_color = "#3fae52"
             elif self.delta_winrate < 0.0:
                 border_color = "#c24545"
@@ -349,6 +411,45 @@ class AIWorker(QObject):
             self.error.emit(str(e))
 
 
+# -----------------------------
+# Delta worker (runs on the delta thread pool)
+# -----------------------------
+class DeltaCancelled(Exception):
+    pass
+
+
+class DeltaSignals(QObject):
+    progress = pyqtSignal(int, object)
+    finished = pyqtSignal(int, object, object)
+    error = pyqtSignal(int, str)
+
+
+class DeltaTask(QRunnable):
+    # job(publish) returns (result, stats) and may publish partial results on the way;
+    # it should raise DeltaCancelled once the generation is stale
+    def __init__(self, generation, job, is_current):
+        super().__init__()
+        self.generation = generation
+        self.job = job
+        self.is_current = is_current
+        self.signals = DeltaSignals()
+
+    def run(self):
+        if not self.is_current(self.generation):
+            return
+        try:
+            result, stats = self.job(self._publish)
+        except DeltaCancelled:
+            return
+        except Exception as e:
+            self.signals.error.emit(self.generation, str(e))
+            return
+        self.signals.finished.emit(self.generation, result, stats)
+
+    def _publish(self, partial):
+        self.signals.progress.emit(self.generation, partial)
+
+
 # -----------------------------
 # PlayerCard (Pick box without player name)
 # -----------------------------
@@ -415,6 +516,10 @@ class ProbabilityBar(QWidget):
         self.setMinimumHeight(32)
         self.setMinimumWidth(600)
 
+    # contributions arrive from the explanation pool after the bar was set, shown on hover
+    def set_explanation(self, text: str):
+        self.setToolTip(text)
+
     def set_values(self, blue_prob, red_prob):
         total = blue_prob + red_prob
         if total != 100:
@@ -448,6 +553,103 @@ class ProbabilityBar(QWidget):
         painter.drawText(blue_w, 0, red_w, h, Qt.AlignCenter, f"Red {self.red_prob:.1f}%")
 
 
+# -----------------------------
+# Draft review heatmap
+# -----------------------------
+class SensitivityHeatmap(QWidget):
+    # One row per played turn, one column per champion; green where swapping that turn's champion for the
+    # column's champion would have helped the side that made the turn, red where it would have hurt
+    ROW_H = 22
+    COL_W = 7
+    LABEL_W = 170
+
+    def __init__(self, result, names, parent=None):
+        super().__init__(parent)
+        self.result = result
+        self.names = names
+        # columns sorted by name so the same champion sits in the same place across reviews
+        self.order = sorted(range(len(result.champions)), key=lambda j: names[result.champions[j]].lower())
+        finite = np.abs(result.values[np.isfinite(result.values)])
+        self.scale = max(1.0, float(finite.max()) if finite.size else 1.0)
+        self.setMouseTracking(True)
+        self.setMinimumSize(self.LABEL_W + self.COL_W * len(self.order), self.ROW_H * len(result.moves))
+
+    def _cell_at(self, x, y):
+        row = y // self.ROW_H
+        col = (x - self.LABEL_W) // self.COL_W
+        if x < self.LABEL_W or not (0 <= row < len(self.result.moves)) or not (0 <= col < len(self.order)):
+            return None
+        return row, self.order[col]
+
+    def mouseMoveEvent(self, event):
+        cell = self._cell_at(event.x(), event.y())
+        if cell is None:
+            self.setToolTip("")
+            return
+        t, j = cell
+        value = self.result.values[t, j]
+        champ = self.names[self.result.champions[j]]
+        taken = self.names[self.result.moves[t]]
+        if np.isnan(value):
+            text = f"{champ}: already in this draft"
+        else:
+            text = f"Turn {t + 1} ({self.result.turns[t]}): {champ} instead of {taken} → {value:+.2f}%"
+        self.setToolTip(text)
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setFont(QFont('Segoe UI', 8))
+        result = self.result
+        for t, turn in enumerate(result.turns):
+            y = t * self.ROW_H
+            painter.setPen(QColor(220, 220, 220))
+            label = f"{t + 1:>2}. {turn.replace('_', ' ')}: {self.names[result.moves[t]]}"
+            painter.drawText(4, y, self.LABEL_W - 8, self.ROW_H, Qt.AlignVCenter | Qt.AlignLeft, label)
+            painter.setPen(Qt.NoPen)
+            for c, j in enumerate(self.order):
+                value = result.values[t, j]
+                if np.isnan(value):
+                    color = QColor(30, 30, 30)
+                else:
+                    strength = min(1.0, abs(value) / self.scale)
+                    shade = int(40 + 200 * strength)
+                    color = QColor(40, shade, 50) if value > 0 else QColor(shade, 40, 40)
+                    if result.champions[j] == result.moves[t]:
+                        color = QColor(90, 125, 255)
+                painter.setBrush(color)
+                painter.drawRect(self.LABEL_W + c * self.COL_W, y + 1, self.COL_W - 1, self.ROW_H - 2)
+
+
+class ReviewDialog(QDialog):
+    def __init__(self, result, names, parent=None):
+        super().__init__(parent)
+        self.setWindowTitle("Draft Review")
+        self.resize(1200, 620)
+        self.setStyleSheet("background-color: #1e1e1e; color: #eaeaea;")
+
+        layout = QVBoxLayout(self)
+        blue, red = result.win_prob
+        header = QLabel(f"Blue {blue * 100:.1f}% – Red {red * 100:.1f}%   ·   "
+                        f"each cell: win chance change for the side that made the turn had it taken that champion "
+                        f"(hover for details; blue marks the actual pick)")
+        header.setWordWrap(True)
+        layout.addWidget(header)
+
+        scroll = QScrollArea()
+        scroll.setWidget(SensitivityHeatmap(result, names))
+        layout.addWidget(scroll, 1)
+
+        lines = []
+        for t, champ_id, gain in SensitivityAnalyzer.regrets(result)[:5]:
+            if gain <= 0:
+                break
+            lines.append(f"Turn {t + 1} ({result.turns[t].replace('_', ' ')}): "
+                         f"{names[champ_id]} instead of {names[result.moves[t]]} would have added {gain:+.2f}%")
+        summary = QLabel("\n".join(lines) or "No single change would have improved the draft.")
+        summary.setStyleSheet("color: #cfcfcf; font-size: 11px;")
+        layout.addWidget(summary)
+
+
 # -----------------------------
 # Suggestions Panel
 # -----------------------------
@@ -1135,12 +1337,11 @@ class ChatBox(QWidget):
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
-        self.cb_model = CatBoostClassifier()
-        self.cb_model.load_model(model_path)
+        self.cb_model, self.cb_model_path = self._load_model()
 
-        self.dm = DataManager(draftdata_path)
-        #self.dm.limit_games(5)
-        self.context_csv_data = self.dm.get_context()
+        # the draft csv is only context for the AI assistant, read the first time it is asked for
+        self.dm = None
+        self._context_csv_data = None
         
         
         self.genai_manager = None #GeminiManager(api_key=os.getenv("GEMINI_API_KEY", ""))
@@ -1166,12 +1367,44 @@ class MainWindow(QMainWindow):
         ]
 
         self.cb_cat_idx = [self.cb_expected.index(c) for c in self.cb_cat_cols if c in self.cb_expected]
-
-        self.main_manager = MainManager()
+        self.encoder = DraftEncoder(self.cb_expected, self.cb_cat_cols)
+        self.prediction_cache = PredictionCache(model_path=self.cb_model_path)
+        # precomputes delta tables for the likeliest next clicks while the user is deciding
+        self.speculator = DeltaSpeculator()
+        # SHAP contributions behind the win bar and the best delta candidates, computed off the UI thread;
+        # needs catboost and the .cbm, the app works the same without it
+        self.explainer = ShapExplainer(model_path, self.encoder, client=self._server_client())
+        self._explain_pool = QThreadPool(self)
+        self._explain_pool.setMaxThreadCount(1)
+        # catboost holds the GIL while it works, so explanations also wait for the UI to go idle
+        self._explain_timer = QTimer(self)
+        self._explain_timer.setSingleShot(True)
+        self._explain_timer.setInterval(300)
+        self._explain_timer.timeout.connect(lambda: self._queue_explanations(self._delta_generation, self._last_deltas))
+        # counterfactual tables for the draft review, cached per (teams, draft)
+        self.sensitivity = SensitivityAnalyzer(None)
+        self._last_deltas = {}
+        self._last_deny = {}
+        # grid deltas are computed off the UI thread; every draft change bumps the generation and
+        # results stamped with an older one are dropped
+        self._delta_pool = QThreadPool(self)
+        self._delta_pool.setMaxThreadCount(1)
+        self._delta_generation = 0
+        self._delta_dropped = 0
+        # the suggestions panel shows model-scored pairs during double picks until the turn moves on
+        self._pair_suggestions_shown = False
+        # start speculating only once the UI has been idle briefly, so it never competes with a render
+        self._speculation_timer = QTimer(self)
+        self._speculation_timer.setSingleShot(True)
+        self._speculation_timer.setInterval(150)
+        self._speculation_timer.timeout.connect(self._speculate_next_turn)
+
+        self.champion_table = ChampionTable.from_json(champion_json_path)
         self.path_to_csv = csv_path
-        self.main_manager.load_data(self.path_to_csv, self.path_to_csv, self.path_to_csv)
+        self.main_manager = self._load_registries()
 
         self.team_master_list = self.build_team_master_list()
+        self.encoder.intern_many(self.team_master_list)
 
         self.setWindowTitle("Champion Draft Tool")
         self.setGeometry(100, 100, 1400, 900)
@@ -1184,14 +1417,9 @@ class MainWindow(QMainWindow):
         self.home_side = None
 
         self.all_champions = {}
-        self.available_champions = []
-        self.blue_bans = []
-        self.red_bans = []
-        self.blue_picks = []
-        self.red_picks = []
-        self.current_turn = "blue_ban"
+        # draft state (turn, bans, picks, availability) lives in the engine; the window only renders it
+        self.draft_engine = DraftEngine(table=self.champion_table)
         self.current_cols = 8
-        self.turn_counter = 0
 
         self.players = {
             "blue": [PlayerCard("Player1", "blue"), PlayerCard("Player2", "blue"),
@@ -1206,6 +1434,8 @@ class MainWindow(QMainWindow):
         self.sort_mode = ("name", True)
 
         self._grid_scroll_viewport = None
+        # tiles in the order the grid currently shows them, so delta batches can follow the viewport
+        self._grid_order = []
 
         # API key UI state
         self.api_key_edit = None
@@ -1259,10 +1489,14 @@ class MainWindow(QMainWindow):
         random_ban_btn.clicked.connect(self.random_ban)
         random_pick_btn = btn("Random Pick")
         random_pick_btn.clicked.connect(self.random_pick)
+        review_btn = btn("Review Draft")
+        review_btn.setToolTip("Show how every ban and pick so far would have changed the win chance with any other champion")
+        review_btn.clicked.connect(self.open_draft_review)
 
         controls_layout.addWidget(reset_btn)
         controls_layout.addWidget(random_ban_btn)
         controls_layout.addWidget(random_pick_btn)
+        controls_layout.addWidget(review_btn)
         controls_layout.addStretch()
 
         # --- API Key controls (top-right) ---
@@ -1611,9 +1845,28 @@ class MainWindow(QMainWindow):
         self.sort_combo.currentIndexChanged.connect(on_sort_changed)
         self.sort_dir_btn.toggled.connect(lambda _: on_sort_dir_toggle())
 
+        # Lookahead toggle: deltas account for the opponent's best reply
+        self.lookahead_btn = QPushButton("Lookahead")
+        self.lookahead_btn.setCheckable(True)
+        self.lookahead_btn.setToolTip("Score each champion after the opponent's best reply")
+        self.lookahead_btn.setCursor(Qt.PointingHandCursor)
+        self.lookahead_btn.setStyleSheet("""
+            QPushButton {
+                background-color: #2e2e2e;
+                color: #eaeaea;
+                padding: 6px 8px;
+                border: 1px solid #3a3a3a;
+                border-radius: 6px;
+                font-weight: 700;
+            }
+            QPushButton:checked { background-color: #373737; color: #93c5fd; }
+        """)
+        self.lookahead_btn.toggled.connect(lambda _: self.update_all_deltas())
+
         search_layout.addWidget(self.search_bar, 1)
         search_layout.addWidget(self.sort_combo, 0)
         search_layout.addWidget(self.sort_dir_btn, 0)
+        search_layout.addWidget(self.lookahead_btn, 0)
 
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
@@ -1972,6 +2225,7 @@ class MainWindow(QMainWindow):
             # Fill Suggestions
             self.chat_box.append_message("Assistant", f"Summary: {summary}")
             self.suggestions_panel.clear_suggestions()
+            self._pair_suggestions_shown = False
             lines = []
             for pick in result.recommendations:
                 self.suggestions_panel.add_suggestion(pick)
@@ -2131,13 +2385,8 @@ class MainWindow(QMainWindow):
         cm = getattr(self.main_manager, "champion_manager", None)
 
         try:
-            team_obj = None
-            if tm and hasattr(tm, "teams"):
-                # Direct name match
-                for _, t in tm.teams.items():
-                    if getattr(t, "name", "") == team_name:
-                        team_obj = t
-                        break
+            # teams are keyed by name; a server-backed registry fetches the team's stats here
+            team_obj = tm.get_team(team_name) if tm else None
             if team_obj:
                 # Support either object attributes or dict form (from to_dict)
                 champ_stats = getattr(team_obj, "champion_stats", None)
@@ -2184,9 +2433,10 @@ class MainWindow(QMainWindow):
 
         # Filter out currently banned/picked to reduce noise
         filtered = []
-        banpick = set([x.lower() for x in (self.blue_bans + self.red_bans + self.blue_picks + self.red_picks)])
+        banpick = self.draft_engine.taken_set()
+        id_of = self.champion_table.id_of
         for name, wr, games in picks:
-            if name.lower() not in banpick:
+            if id_of(name) not in banpick:
                 filtered.append((name, wr, games))
         return filtered
 
@@ -2201,12 +2451,8 @@ class MainWindow(QMainWindow):
         cm = getattr(self.main_manager, "champion_manager", None)
 
         try:
-            team_obj = None
-            if tm and hasattr(tm, "teams"):
-                for _, t in tm.teams.items():
-                    if getattr(t, "name", "") == team_name:
-                        team_obj = t
-                        break
+            # teams are keyed by name; a server-backed registry fetches the team's stats here
+            team_obj = tm.get_team(team_name) if tm else None
             if team_obj:
                 champ_stats = getattr(team_obj, "champion_stats", None)
 
@@ -2249,9 +2495,10 @@ class MainWindow(QMainWindow):
 
         # Filter out currently banned/picked and optionally require a minimum sample size
         filtered = []
-        banpick = set([x.lower() for x in (self.blue_bans + self.red_bans + self.blue_picks + self.red_picks)])
+        banpick = self.draft_engine.taken_set()
+        id_of = self.champion_table.id_of
         for name, wr, games in picks:
-            if name.lower() in banpick:
+            if id_of(name) in banpick:
                 continue
             if games < min_games:
                 continue
@@ -2485,58 +2732,333 @@ class MainWindow(QMainWindow):
         combo.setCurrentIndex(idx if idx >= 0 else 0)
         combo.blockSignals(False)
 
-    def calculate_delta_wr(self):
-        for champion_name, tile in self.champion_tiles_dict.items():
-            if champion_name in self.available_champions:
-                delta = self.calculate_champion_delta(champion_name)
-                tile.set_delta_winrate(delta)
+    def _delta_inputs(self):
+        # Everything a delta job reads, captured on the UI thread so the worker never touches live state:
+        # (engine copy, team, opponent, candidate ids, lookahead), or None when there is nothing to score
+        if not ("pick" in self.current_turn or "ban" in self.current_turn):
+            return None
+        available = self.draft_engine.available_set()
+        ids = [tile.champion_id for tile in self.champion_tiles_dict.values() if tile.champion_id in available]
+        if not ids:
+            return None
+        team, opponent = self._current_team_and_opponent()
+        # intern here so the worker only ever reads the encoder's vocabulary
+        self.encoder.intern_many([team, opponent])
+        lookahead = getattr(self, "lookahead_btn", None) is not None and self.lookahead_btn.isChecked()
+        return self.draft_engine.copy(), team, opponent, ids, lookahead
+
+    def _run_delta_job(self, engine, team, opponent, ids, lookahead, predict, depth: int = 2,
+                       batches=None, publish=None):
+        # Returns (({champion id: delta}, {champion id: deny}), lookahead stats or None); safe to call
+        # from the delta pool. Deny values come out of the same model call as the deltas.
+        # With batches (id lists covering ids) each batch is scored and published in order, so the
+        # first batch can be shown while the rest are still being scored
+        evaluator = DraftEvaluator(self.encoder, predict, team, opponent)
+        if lookahead:
+            # deeper searches take each interior node's best moves from the model's column bounds
+            # (a no-op unless cb_model is a local ObliviousModel)
+            recommender = TopKRecommender(evaluator, self.cb_model)
+            deltas, stats = LookaheadSearch(evaluator, recommender=recommender).deltas(engine, depth=depth)
+            # the search already scored (and cached) the one-ply rows, only the deny rows are new
+            try:
+                deny = evaluator.dual_deltas(engine, ids)[1]
+            except RuntimeError:
+                deny = {}
+            return (deltas, deny), stats
+        # a speculated table covers every available champion, so it can be used as is
+        table = self.speculator.lookup(evaluator, engine)
+        if table is not None:
+            return table, None
+
+        deltas, deny = {}, {}
+        for batch in (batches or [ids]):
+            try:
+                part, deny_part = evaluator.dual_deltas(engine, batch)
+            except RuntimeError:
+                part, deny_part = {c: 0.0 for c in batch}, {}
+            deltas.update(part)
+            deny.update(deny_part)
+            if publish is not None and len(deltas) < len(ids):
+                publish((part, deny_part))
+        return (deltas, deny), None
+
+    def _delta_batches(self, ids, batch_size: int = 48):
+        # Visible tiles first, then the rest of the grid in display order, then champions the search
+        # bar is hiding; everything after the first batch goes in chunks of batch_size
+        wanted = set(ids)
+        order = [t.champion_id for t in self._grid_order if t.champion_id in wanted]
+        first, last = self._visible_grid_range()
+        head = order[first:last]
+        seen = set(head)
+        rest = [c for c in order if c not in seen]
+        seen.update(rest)
+        rest += [c for c in ids if c not in seen]
+        batches = [head] if head else []
+        batches += [rest[i:i + batch_size] for i in range(0, len(rest), batch_size)]
+        return batches
+
+    def _visible_grid_range(self):
+        # [first, last) indices into _grid_order of the rows currently inside the scroll viewport
+        vp = getattr(self, "_grid_scroll_viewport", None)
+        if vp is None or not self._grid_order:
+            return 0, len(self._grid_order)
+        cols = max(1, self.current_cols)
+        tile = self._grid_order[0]
+        row_height = max(1, (tile.height() or tile.sizeHint().height()) + self.grid_layout.spacing())
+        offset = vp.parentWidget().verticalScrollBar().value() if vp.parentWidget() is not None else 0
+        first_row = offset // row_height
+        last_row = (offset + vp.height()) // row_height + 1
+        return first_row * cols, min(len(self._grid_order), last_row * cols)
+
+    def _deltas_by_key(self, deltas: dict) -> dict:
+        available = self.draft_engine.available_set()
+        return {
+            k: deltas.get(tile.champion_id, 0.0)
+            for k, tile in self.champion_tiles_dict.items()
+            if tile.champion_id in available
+        }
 
-    def calculate_champion_delta(self):
-        base_blue, base_red = self._current_blue_red_probs()
+    def _report_lookahead(self, stats: dict):
+        print(f"Lookahead: {stats['plies']} plies, {stats['nodes']} nodes in {stats['calls']} calls, "
+              f"{stats['cutoffs']} cutoffs, {stats['ms']:.0f} ms")
+        self.lookahead_btn.setToolTip(
+            f"Score each champion after the opponent's best reply\n"
+            f"Last search: {stats['nodes']} nodes, {stats['ms']:.0f} ms"
+        )
 
-        is_blue_turn = "blue" in self.current_turn
-        is_pick = "pick" in self.current_turn
-        is_ban = "ban" in self.current_turn
+    def update_all_deltas(self):
+        # Starts a new delta generation: the grid keeps the previous deltas greyed out while the
+        # delta pool computes fresh ones, and anything still queued or running for an older state is dropped
+        self._delta_generation += 1
+        generation = self._delta_generation
+        self._last_deltas = {}
+        self._last_deny = {}
+        self.speculator.cancel()
+        self._speculation_timer.stop()
+        self._explain_timer.stop()
+        self._delta_pool.clear()
+        self._reload_model_if_changed()
+        # the draft or the matchup changed: restyle and refilter the grid right away, the new deltas
+        # fill in as they arrive
+        for tile in self.champion_tiles_dict.values():
+            tile.update_style()
+        self.filter_champions(self.search_bar.text())
 
-        for champ_key, tile in self.champion_tiles_dict.items():
-            if champ_key not in self.available_champions:
-                tile.set_delta_winrate(0.0)
-                continue
+        inputs = self._delta_inputs()
+        if inputs is None:
+            self._on_deltas_ready(generation, ({}, {}), None)
+            return
 
-            blue_bans = list(self.blue_bans)
-            red_bans = list(self.red_bans)
-            blue_picks = list(self.blue_picks)
-            red_picks = list(self.red_picks)
+        engine, team, opponent, ids, lookahead = inputs
+        if not lookahead:
+            # a speculated table is just a lookup, no need for a round trip through the pool
+            table = self.speculator.lookup(DraftEvaluator(self.encoder, None, team, opponent), engine)
+            if table is not None:
+                self._on_deltas_ready(generation, table, None)
+                self._queue_pair_search(generation, inputs)
+                return
 
-            if is_pick:
-                if is_blue_turn:
-                    blue_picks.append(tile.champion_name)
-                else:
-                    red_picks.append(tile.champion_name)
-            elif is_ban:
-                if is_blue_turn:
-                    blue_bans.append(tile.champion_name)
-                else:
-                    red_bans.append(tile.champion_name)
+        def predict(rows):
+            # bails out between model calls once a newer draft state has been requested
+            if generation != self._delta_generation:
+                raise DeltaCancelled()
+            return self.prediction_cache.predict(rows, self._predict_proba_uncached)
 
-            hyp_blue, hyp_red = self._predict_draft_probs(blue_bans, red_bans, blue_picks, red_picks)
-            delta = (hyp_blue - base_blue) if is_blue_turn else (hyp_red - base_red)
-            tile.set_delta_winrate(delta)
+        for tile in self.champion_tiles_dict.values():
+            tile.set_delta_stale(True)
+        batches = None if lookahead else self._delta_batches(ids)
+        task = DeltaTask(generation,
+                         lambda publish: self._run_delta_job(*inputs, predict=predict, batches=batches, publish=publish),
+                         lambda g: g == self._delta_generation)
+        task.signals.progress.connect(self._on_deltas_partial)
+        task.signals.finished.connect(self._on_deltas_ready)
+        task.signals.error.connect(self._on_deltas_error)
+        self._delta_pool.start(task)
+        self._queue_pair_search(generation, inputs)
+
+    def _queue_pair_search(self, generation: int, inputs):
+        # On the first turn of a double pick, score every pair of champions for the two picks together;
+        # queued behind the grid deltas on the same pool, results go to the suggestions panel
+        engine, team, opponent, ids, _ = inputs
+        if not is_double_pick(engine):
+            if self._pair_suggestions_shown:
+                self.suggestions_panel.clear_suggestions()
+                self._pair_suggestions_shown = False
+            return
 
-    def _predict_draft_probs(self, blue_bans, red_bans, blue_picks, red_picks):
-        proba = self._predict_proba_from_lists(blue_bans, red_bans, blue_picks, red_picks)
-        if proba is None:
-            return 50.0, 50.0
-        p_other, p_team = float(proba[0][0]), float(proba[0][1])
-        blue_pct = p_other * 100.0
-        red_pct = p_team * 100.0
-        return blue_pct, red_pct
+        def predict(rows):
+            if generation != self._delta_generation:
+                raise DeltaCancelled()
+            # ~28k one-off rows, kept out of the prediction cache so they don't evict the grid's entries
+            return self._predict_proba_uncached(rows)
 
-    def update_all_deltas(self):
-        self.calculate_champion_delta()
+        def job(publish):
+            return PairOptimizer(DraftEvaluator(self.encoder, predict, team, opponent)).top_pairs(engine, 5, ids)
+
+        task = DeltaTask(generation, job, lambda g: g == self._delta_generation)
+        task.signals.finished.connect(self._on_pairs_ready)
+        task.signals.error.connect(self._on_pairs_error)
+        self._delta_pool.start(task, -1)
+
+    def _on_pairs_ready(self, generation: int, pairs, stats):
+        if generation != self._delta_generation:
+            self._delta_dropped += 1
+            return
+        print(f"Pair search: {stats['pairs']} pairs ({stats['rows']} rows) in {stats['calls']} calls, "
+              f"{stats['ms']:.0f} ms")
+        self.suggestions_panel.clear_suggestions()
+        for pair in pairs:
+            first = self.draft_engine.name_of(pair.first)
+            second = self.draft_engine.name_of(pair.second)
+            self.suggestions_panel.add_suggestion(SimpleNamespace(
+                champion_name=first,
+                reasoning=(f"Double pick with {second}: {pair.delta:+.2f}% together "
+                           f"({pair.synergy:+.2f}% over picking each alone). Lock in {first} first."),
+                possible_synergies=[second],
+                possible_counters=[],
+            ))
+        self._pair_suggestions_shown = bool(pairs)
+
+    def _on_pairs_error(self, generation: int, err: str):
+        if generation == self._delta_generation:
+            print(f"Pair search failed: {err}")
+
+    def _on_deltas_ready(self, generation: int, result, stats):
+        if generation != self._delta_generation:
+            self._delta_dropped += 1
+            return
+        if stats is not None:
+            self._report_lookahead(stats)
+        deltas, deny = result
+        self._last_deltas = deltas
+        self._last_deny = deny
+        by_key = self._deltas_by_key(deltas)
+        deny_by_key = self._deltas_by_key(deny) if deny else {}
+        for champ_key, tile in self.champion_tiles_dict.items():
+            delta = by_key.get(champ_key, 0.0)
+            deny_value = deny_by_key.get(champ_key)
+            # tiles filled in by an earlier batch are already up to date
+            if tile.delta_stale or tile.delta_winrate != delta or tile.deny_winrate != deny_value:
+                tile.set_delta_winrate(delta, deny_value)
+        # the grid was already rebuilt for the new draft state; only a delta sort changes its order
+        if self.sort_mode[0] == "delta":
+            self.filter_champions(self.search_bar.text())
+        self._speculation_timer.start()
+        self._explain_timer.start()
+
+    def _queue_explanations(self, generation: int, deltas: dict, top: int = 5):
+        # SHAP for the current draft plus the top delta candidates, all in one ShapValues call
+        for tile in self.champion_tiles:
+            tile.delta_label.setToolTip("")
+        if self.explainer.disabled:
+            return
+        team, opponent = self._current_team_and_opponent()
+        engine = self.draft_engine.copy()
+        evaluator = DraftEvaluator(self.encoder, None, team, opponent)
+        base = self.encoder.encode(team, opponent, *engine.draft_lists())
+        candidates = sorted(deltas, key=deltas.get, reverse=True)[:top] if engine.phase() is not None else []
+
+        def job(publish):
+            rows = base[None, :]
+            if candidates:
+                rows = np.vstack([rows, evaluator.child_rows(engine, candidates)])
+            return (rows, self.explainer.explain(rows)), None
+
+        task = DeltaTask(generation, job, lambda g: g == self._delta_generation)
+        task.signals.finished.connect(
+            lambda g, result, _stats: self._on_explanations_ready(g, result, candidates, team, opponent))
+        task.signals.error.connect(lambda g, err: print(f"Explanation failed: {err}"))
+        # only the newest draft state is worth explaining
+        self._explain_pool.clear()
+        self._explain_pool.start(task)
+
+    def _format_contributions(self, contributions, red_team: str, blue_team: str, limit: int = 8) -> list:
+        # log-odds contributions toward red; Teams/Opponent get the team names shown instead of the columns
+        labels = {"Teams": f"Red team ({red_team})", "Opponent": f"Blue team ({blue_team})"}
+        lines = []
+        for column, value, shap in contributions[:limit]:
+            label = labels.get(column) or (f"{column} {value}" if value else column)
+            lines.append(f"{label}: {abs(shap):.2f} toward {'Red' if shap > 0 else 'Blue'}")
+        return lines
+
+    def _on_explanations_ready(self, generation: int, result, candidates, red_team: str, blue_team: str):
+        if generation != self._delta_generation:
+            return
+        rows, shap = result
+        if shap is None:
+            return
+        lines = self._format_contributions(self.explainer.contributions(rows[0], shap[0]), red_team, blue_team)
+        self.prob_bar.set_explanation("What moves the prediction (log-odds):\n" + "\n".join(lines))
+
+        # for each candidate, the columns whose contribution changes most if it is taken
+        for i, champ_id in enumerate(candidates, start=1):
+            tile = self.champion_tiles_dict.get(self.draft_engine.name_of(champ_id).lower())
+            if tile is None:
+                continue
+            diff = shap[i] - shap[0]
+            shifts = [(self.encoder.columns[c],
+                       "(empty)" if rows[i][c] == self.encoder.filler_id else self.encoder.vocab[rows[i][c]],
+                       float(diff[c]))
+                      for c in np.argsort(-np.abs(diff[:-1]))[:4] if abs(diff[c]) >= 1e-3]
+            tile.delta_label.setToolTip("If taken, biggest shifts (log-odds):\n" + "\n".join(
+                self._format_contributions(shifts, red_team, blue_team)))
+
+    def _on_deltas_partial(self, generation: int, partial):
+        # a batch of fresh deltas (visible tiles first); the rest stay greyed until their batch lands
+        if generation != self._delta_generation:
+            return
+        deltas, deny = partial
+        for champ_id, delta in deltas.items():
+            tile = self.champion_tiles_dict.get(self.draft_engine.name_of(champ_id).lower())
+            if tile is not None:
+                tile.set_delta_winrate(delta, deny.get(champ_id))
+
+    def _on_deltas_error(self, generation: int, err: str):
+        if generation != self._delta_generation:
+            return
+        print(f"Delta computation failed: {err}")
         for tile in self.champion_tiles_dict.values():
-            tile.update_style()
-        self.filter_champions(self.search_bar.text())
+            tile.set_delta_stale(False)
+
+    def open_draft_review(self):
+        # Every played turn × every other legal champion (~3k rows for a full draft) in one model call,
+        # kept out of the prediction cache; reopening the same draft is served from the analyzer's cache
+        if self.draft_engine.turn_counter == 0:
+            QMessageBox.information(self, "Draft Review", "Make at least one ban or pick first.")
+            return
+        self._reload_model_if_changed()
+        team, opponent = self._current_team_and_opponent()
+        self.sensitivity.evaluator = DraftEvaluator(self.encoder, self._predict_proba_uncached, team, opponent)
+        cached = self.sensitivity.cached(self.draft_engine) is not None
+        try:
+            result = self.sensitivity.analyze(self.draft_engine)
+        except RuntimeError as e:
+            QMessageBox.warning(self, "Draft Review", f"Could not score the draft: {e}")
+            return
+        if not cached:
+            print(f"Draft review: {len(result.moves)} turns x {len(result.champions)} champions in {result.ms:.0f} ms")
+        ReviewDialog(result, self.draft_engine.names, self).exec_()
+
+    def _speculate_next_turn(self):
+        # Queue delta tables for the likeliest next clicks; scheduling also drops any older speculation
+        if self.draft_engine.is_complete or not self._last_deltas:
+            self.speculator.cancel()
+            return
+        team, opponent = self._current_team_and_opponent()
+        # skips the model file check so the reload only ever happens on the UI thread
+        predict = lambda ids: self.prediction_cache.predict(ids, self._predict_proba_uncached)
+        evaluator = DraftEvaluator(self.encoder, predict, team, opponent)
+
+        mover_team = self.selected_blue_team if "blue" in self.current_turn else self.selected_red_team
+        team_counts = {}
+        team_obj = self.main_manager.team_manager.get_team(mover_team) if mover_team else None
+        if team_obj is not None:
+            for cname, perf in team_obj.champion_stats.items():
+                champ_id = self.champion_table.id_of(util.name_cleanup(cname))
+                if champ_id is not None:
+                    team_counts[champ_id] = team_counts.get(champ_id, 0) + int(getattr(perf, "games", 0))
+
+        self.speculator.schedule(evaluator, self.draft_engine, likely_moves(self._last_deltas, team_counts))
 
     def on_window_resize(self, event):
         super().resizeEvent(event)
@@ -2586,10 +3108,10 @@ class MainWindow(QMainWindow):
         search_text = (search_text or "").lower().strip()
         self.clear_grid()
         visible_tiles = []
+        available = self.draft_engine.available_set()
         for tile in self.champion_tiles:
             champ_name = tile.champion_name
-            champ_key = champ_name.lower()
-            is_visible = champ_key in self.available_champions
+            is_visible = tile.champion_id in available
             if search_text:
                 is_visible = is_visible and (search_text in champ_name.lower())
             if is_visible:
@@ -2598,6 +3120,7 @@ class MainWindow(QMainWindow):
         key, asc = self.sort_mode
         visible_tiles.sort(key=self._tile_sort_key, reverse=not asc)
 
+        self._grid_order = visible_tiles
         self.arrange_grid(visible_tiles, self.current_cols)
 
     def clear_grid(self):
@@ -2638,6 +3161,7 @@ class MainWindow(QMainWindow):
                 champ_key = champion_name.lower()
 
                 tile = ChampionTile(champion_name, path, size=82)
+                tile.champion_id = self.champion_table.intern(champion_name)
                 tile.clicked.connect(lambda name=champion_name: self.champion_clicked(name))
 
                 gp_text = "--"
@@ -2670,35 +3194,37 @@ class MainWindow(QMainWindow):
                 traceback.print_exc()
                 continue
 
-        self.available_champions = list(self.all_champions.keys())
+        self.draft_engine.set_champions(data["name"] for data in self.all_champions.values())
+        self.encoder.intern_many(data["name"] for data in self.all_champions.values())
         QTimer.singleShot(0, self.update_grid_columns)
         print(f"Loaded {len(self.all_champions)} champions")
 
     def champion_clicked(self, champion_name):
-        champ_key = champion_name.lower()
-        if champ_key not in self.available_champions:
+        if not self.draft_engine.is_available_name(champion_name):
             return
         if "ban" in self.current_turn:
             self.ban_champion(champion_name)
         else:
             self.pick_champion(champion_name)
-        self.filter_champions(self.search_bar.text())
         self.update_all_deltas()
         self.refresh_team_stats()
 
     def ban_champion(self, champion_name):
         champ_key = champion_name.lower()
         champ_data = self.all_champions[champ_key]
+        is_blue_turn = "blue" in self.current_turn
+        try:
+            self.draft_engine.apply_name(champion_name)
+        except ValueError as e:
+            print(f"Cannot ban {champion_name}: {e}")
+            return
         champ_data["tile"].set_banned(True)
-        self.available_champions.remove(champ_key)
 
-        if "blue" in self.current_turn:
-            self.blue_bans.append(champion_name)
+        if is_blue_turn:
             slot_index = len(self.blue_bans) - 1
             if slot_index < len(self.blue_ban_slots):
                 self.blue_ban_slots[slot_index].set_champion(champion_name, champ_data["path"])
         else:
-            self.red_bans.append(champion_name)
             slot_index = len(self.red_bans) - 1
             if slot_index < len(self.red_ban_slots):
                 self.red_ban_slots[slot_index].set_champion(champion_name, champ_data["path"])
@@ -2710,18 +3236,20 @@ class MainWindow(QMainWindow):
     def pick_champion(self, champion_name):
         champ_key = champion_name.lower()
         champ_data = self.all_champions[champ_key]
+        is_blue_turn = "blue" in self.current_turn
+        try:
+            self.draft_engine.apply_name(champion_name)
+        except ValueError as e:
+            print(f"Cannot pick {champion_name}: {e}")
+            return
         champ_data["tile"].set_picked(True)
-        if champ_key in self.available_champions:
-            self.available_champions.remove(champ_key)
 
-        if "blue" in self.current_turn:
-            self.blue_picks.append(champion_name)
+        if is_blue_turn:
             for player in self.players["blue"]:
                 if player.champion is None:
                     player.set_champion(champion_name, champ_data["path"])
                     break
         else:
-            self.red_picks.append(champion_name)
             for player in self.players["red"]:
                 if player.champion is None:
                     player.set_champion(champion_name, champ_data["path"])
@@ -2752,27 +3280,8 @@ class MainWindow(QMainWindow):
             print("update_winrate_bar error:", e)
 
     def update_turn(self, first=False):
-        turn_seq = [
-            "blue_ban", "red_ban", "blue_ban", "red_ban", "blue_ban",
-            "red_ban", "blue_pick", "red_pick", "red_pick", "blue_pick",
-            "blue_pick", "red_pick", "red_ban", "blue_ban",
-            "red_ban", "blue_ban", "red_pick", "blue_pick",
-            "blue_pick", "red_pick"
-        ]
-
-        if first:
-            self.current_turn = turn_seq[0]
-            self.turn_counter = 0
-        else:
-            self.turn_counter += 1
-            if self.turn_counter < len(turn_seq):
-                self.current_turn = turn_seq[self.turn_counter]
-            else:
-                self.current_turn = "draft_complete"
-                self.turn_counter = 20
-
+        # the engine already advanced the turn; this only refreshes the turn label and tiles
         if self.current_turn == "draft_complete":
-            self.turn_counter = 20
             self.turn_label.setText("Draft Complete!")
             self.turn_label.setStyleSheet("font-size: 18px; font-weight: 700; color: #eaeaea;")
             for tile in self.champion_tiles:
@@ -2793,21 +3302,39 @@ class MainWindow(QMainWindow):
                 tile.set_interactive(True)
 
     def _compute_next_turn(self) -> str:
-        # Mirror turn sequence to compute next turn string that DraftService expects
-        turn_seq = [
-            "blue_ban", "red_ban", "blue_ban", "red_ban", "blue_ban",
-            "red_ban", "blue_pick", "red_pick", "red_pick", "blue_pick",
-            "blue_pick", "red_pick", "red_ban", "blue_ban",
-            "red_ban", "blue_ban", "red_pick", "blue_pick",
-            "blue_pick", "red_pick"
-        ]
-        try:
-            idx = turn_seq.index(self.current_turn)
-            if idx + 1 < len(turn_seq):
-                return turn_seq[idx + 1]
-            return "draft_complete"
-        except ValueError:
-            return "draft_complete"
+        # Next turn string that DraftService expects
+        return self.draft_engine.next_turn
+
+    # -----------------------------
+    # Draft state, read from the engine
+    @property
+    def current_turn(self) -> str:
+        return self.draft_engine.current_turn
+
+    @property
+    def turn_counter(self) -> int:
+        return self.draft_engine.turn_counter
+
+    @property
+    def available_champions(self):
+        engine = self.draft_engine
+        return [engine.names[i].lower() for i in engine.available_ids()]
+
+    @property
+    def blue_bans(self):
+        return self.draft_engine.draft_lists()[0]
+
+    @property
+    def red_bans(self):
+        return self.draft_engine.draft_lists()[1]
+
+    @property
+    def blue_picks(self):
+        return self.draft_engine.draft_lists()[2]
+
+    @property
+    def red_picks(self):
+        return self.draft_engine.draft_lists()[3]
 
     def refresh_general_winrates(self):
         cm = getattr(self.main_manager, "champion_manager", None)
@@ -2835,11 +3362,7 @@ class MainWindow(QMainWindow):
                 tile.set_interactive(True)
         
         
-        self.available_champions = list(self.all_champions.keys())
-        self.red_bans = []
-        self.blue_bans = []
-        self.red_picks = []
-        self.blue_picks = []
+        self.draft_engine.reset()
         self.update_turn(first=True)
 
         for slot in self.blue_ban_slots + self.red_ban_slots:
@@ -2881,15 +3404,6 @@ class MainWindow(QMainWindow):
             champ_data = self.all_champions[random_champ]
             self.pick_champion(champ_data["name"])
 
-    def _current_blue_red_probs(self):
-        proba = self._predict_proba_from_lists(self.blue_bans, self.red_bans, self.blue_picks, self.red_picks)
-        if proba is None:
-            return 50.0, 50.0
-        p_other, p_team = float(proba[0][0]), float(proba[0][1])
-        blue_pct = p_other * 100.0
-        red_pct = p_team * 100.0
-        return blue_pct, red_pct
-
     def _current_team_names(self):
         blue_team = self.selected_blue_team or "Blue Team"
         red_team = self.selected_red_team or "Red Team"
@@ -2901,89 +3415,81 @@ class MainWindow(QMainWindow):
         red_team = red_team or "Red Team"
         return red_team, blue_team
 
-    def _collect_bans_picks(self):
-        bans = (self.blue_bans + self.red_bans)[:10]
-        picks = (self.blue_picks + self.red_picks)[:10]
-        bans += ["a"] * (10 - len(bans))
-        picks += ["a"] * (10 - len(picks))
-        return bans, picks
-
-    def _collect_bans_picks_from_lists(self, blue_bans, red_bans, blue_picks, red_picks):
-        bans = (blue_bans + red_bans)[:10]
-        picks = (blue_picks + red_picks)[:10]
-        bans += ["a"] * (10 - len(bans))
-        picks += ["a"] * (10 - len(picks))
-        return bans, picks
-
-    def _build_row_from_lists(self, blue_bans, red_bans, blue_picks, red_picks):
+    def _encode_from_lists(self, blue_bans, red_bans, blue_picks, red_picks):
         team, opponent = self._current_team_and_opponent()
-        bans, picks = self._collect_bans_picks_from_lists(blue_bans, red_bans, blue_picks, red_picks)
-
-        row = {col: 0 for col in self.cb_expected}
-        for c in self.cb_cat_cols:
-            if c in row:
-                row[c] = "a"
-
-        if "Teams" in row: row["Teams"] = team
-        if "Opponent" in row: row["Opponent"] = opponent
-
-        for i in range(10):
-            key = f"Ban{i+1}"
-            if key in row:
-                row[key] = bans[i] if i < len(bans) else ""
-
-        for i in range(10):
-            key = f"Pick{i+1}"
-            if key in row:
-                row[key] = picks[i] if i < len(picks) else ""
+        return self.encoder.encode(team, opponent, blue_bans, red_bans, blue_picks, red_picks)
 
-        return row
-
-    def _build_row_for_side(self):
-        team, opponent = self._current_team_and_opponent()
-        bans, picks = self._collect_bans_picks()
-
-        row = {col: 0 for col in self.cb_expected}
-        for c in self.cb_cat_cols:
-            if c in row:
-                row[c] = "a"
-
-        if "Teams" in row: row["Teams"] = team
-        if "Opponent" in row: row["Opponent"] = opponent
-
-        for i in range(10):
-            key = f"Ban{i+1}"
-            if key in row:
-                row[key] = bans[i] if i < len(bans) else ""
+    def _predict_proba_from_lists(self, blue_bans, red_bans, blue_picks, red_picks):
+        ids = self._encode_from_lists(blue_bans, red_bans, blue_picks, red_picks)
+        return self._predict_proba_batch(ids)
+
+    def _predict_proba_batch(self, ids):
+        # Every prediction goes through the cache; only unseen draft states reach the model
+        self._reload_model_if_changed()
+        return self.prediction_cache.predict(ids, self._predict_proba_uncached)
+
+    def _reload_model_if_changed(self):
+        # UI thread only; a delta job still in flight finishes against the old model before the swap
+        if self.prediction_cache.model_changed():
+            print("Model file changed, reloading and clearing prediction cache")
+            self._delta_pool.waitForDone()
+            self.cb_model, self.cb_model_path = self._load_model()
+            self.prediction_cache.clear()
+            self.speculator.clear()
+            self.sensitivity.clear()
+            self._explain_pool.waitForDone()
+            self.explainer.clear()
+            self.explainer.client = self._server_client()
+
+    def _load_model(self):
+        # With YALVON_SERVER set (http://127.0.0.1:8765 or unix:/path/to.sock) the model is the shared local
+        # prediction server; otherwise the exported .npz is evaluated with NumPy alone and catboost is
+        # only needed when it is missing
+        server = os.getenv("YALVON_SERVER", "").strip()
+        if server:
+            try:
+                return PredictionClient(server), server
+            except Exception as e:
+                print(f"Prediction server at {server} is unavailable ({e}), loading the model locally")
+        return load_model(model_path, npz_model_path)
 
-        for i in range(10):
-            key = f"Pick{i+1}"
-            if key in row:
-                row[key] = picks[i] if i < len(picks) else ""
+    def _server_client(self):
+        return self.cb_model if isinstance(self.cb_model, PredictionClient) else None
 
-        return row
-
-    def _predict_proba_from_lists(self, blue_bans, red_bans, blue_picks, red_picks):
-        row = self._build_row_from_lists(blue_bans, red_bans, blue_picks, red_picks)
-        df = pd.DataFrame([row])[self.cb_expected]
-        pool = Pool(df, cat_features=self.cb_cat_idx)
+    def _load_registries(self):
+        # Against a prediction server the team and champion registries come from it too, so this copy
+        # never parses the player csv; without one (or if that fails) the csv is loaded here
+        client = self._server_client()
+        if client is not None:
+            try:
+                manager = RemoteManager(client, table=self.champion_table)
+                manager.load_data()
+                return manager
+            except Exception as e:
+                print(f"Could not load teams and champions from the server ({e}), reading the csv")
+        manager = MainManager(table=self.champion_table)
+        manager.load_data(self.path_to_csv, self.path_to_csv, self.path_to_csv)
+        return manager
+
+    @property
+    def context_csv_data(self) -> str:
+        if self._context_csv_data is None:
+            self.dm = DataManager(draftdata_path)
+            #self.dm.limit_games(5)
+            self._context_csv_data = self.dm.get_context()
+        return self._context_csv_data
+
+    def _predict_proba_uncached(self, ids):
+        # ids is an encoder id matrix; CatBoost takes the object matrix directly, no DataFrame/Pool
         try:
-            proba = self.cb_model.predict_proba(pool)
+            proba = self.cb_model.predict_proba(self.encoder.to_model_input(ids))
         except Exception as e:
             print(f"Error predicting: {e}")
             return
         return proba
 
     def _predict_for_side(self):
-        row = self._build_row_for_side()
-        df = pd.DataFrame([row])[self.cb_expected]
-        pool = Pool(df, cat_features=self.cb_cat_idx)
-        try:
-            proba = self.cb_model.predict_proba(pool)
-        except Exception as e:
-            print(f"Error predicting: {e}")
-            return
-        return proba
+        return self._predict_proba_from_lists(self.blue_bans, self.red_bans, self.blue_picks, self.red_picks)
 
 
 # -----------------------------